@@ -0,0 +1,117 @@
+"""
+Management command: backtest_predictor
+
+Replays ~/.claude/usage-counts/events.jsonl day by day and scores the end-of-day
+projection at a few checkpoint hours, comparing the old flat-velocity model with
+the hourly-profile model. The profile and trailing mean used for each day are
+built only from the days before it, so the score reflects what the dashboard
+would have shown at the time.
+
+Reports mean absolute percentage error (MAPE) per week and overall.
+"""
+import json
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+
+from claude_usage.management.commands.sync_local_counts import EVENTS_FILE
+from claude_usage.predictor import HourlyProfile, project_today
+
+CHECKPOINT_HOURS = (3, 6, 9, 12, 15, 18, 21)
+
+# Days of history needed before a day is scored (one full week of trailing mean)
+WARMUP_DAYS = 7
+
+
+class Command(BaseCommand):
+    help = "Score the burn predictor's daily projections against past events"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--weeks",
+            type=int,
+            default=8,
+            help="Number of most recent weeks to score (default: 8)",
+        )
+
+    def handle(self, *args, **options):
+        if not EVENTS_FILE.exists():
+            self.stderr.write(self.style.ERROR(f"Events file not found: {EVENTS_FILE}"))
+            return
+
+        by_day_hour = _load_events()
+        if not by_day_hour:
+            self.stdout.write("No events to score.")
+            return
+
+        days = sorted(by_day_hour)
+        last = days[-1]
+        cutoff = last - timedelta(days=last.weekday()) - timedelta(weeks=options["weeks"] - 1)
+
+        counts: dict[tuple[int, int], int] = defaultdict(int)
+        totals: dict = {}
+        errors: dict = defaultdict(lambda: {"flat": [], "profile": []})
+
+        day = days[0]
+        while day <= last:
+            hourly = by_day_hour.get(day, [0] * 24)
+            actual = sum(hourly)
+
+            history = [totals.get(day - timedelta(days=d), 0) for d in range(1, 7)]
+            if day >= cutoff and len(totals) >= WARMUP_DAYS and actual > 0:
+                profile = HourlyProfile(counts)
+                week = day - timedelta(days=day.weekday())
+                for hour in CHECKPOINT_HOURS:
+                    so_far = sum(hourly[:hour])
+                    now = datetime(day.year, day.month, day.day, hour, tzinfo=timezone.utc)
+                    flat = so_far / (hour + 1) * 24  # previous model, +1 avoids /0
+                    modeled = project_today(so_far, sum(history) / len(history), now, profile)
+                    errors[week]["flat"].append(abs(flat - actual) / actual)
+                    errors[week]["profile"].append(abs(modeled - actual) / actual)
+
+            for hour, n in enumerate(hourly):
+                if n:
+                    counts[(day.weekday(), hour)] += n
+            totals[day] = actual
+            day += timedelta(days=1)
+
+        if not errors:
+            self.stdout.write(f"Not enough history to score (need {WARMUP_DAYS} days before the window).")
+            return
+
+        self.stdout.write(f"{'Week of':<12} {'Points':>6} {'Flat MAPE':>10} {'Profile MAPE':>13}")
+        all_flat, all_profile = [], []
+        for week in sorted(errors):
+            flat, modeled = errors[week]["flat"], errors[week]["profile"]
+            all_flat += flat
+            all_profile += modeled
+            self.stdout.write(
+                f"{week.isoformat():<12} {len(flat):>6} {_mape(flat):>9.1f}% {_mape(modeled):>12.1f}%"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Overall: {len(all_flat)} points, flat {_mape(all_flat):.1f}%, "
+                f"profile {_mape(all_profile):.1f}%"
+            )
+        )
+
+
+def _load_events() -> dict:
+    """Return {date: [count per UTC hour]} for every event in the file."""
+    by_day_hour: dict = defaultdict(lambda: [0] * 24)
+    with open(EVENTS_FILE, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            try:
+                ts_ms = json.loads(line).get("ts", 0)
+            except (json.JSONDecodeError, AttributeError):
+                continue
+            if not ts_ms:
+                continue
+            ts = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc)
+            by_day_hour[ts.date()][ts.hour] += 1
+    return by_day_hour
+
+
+def _mape(errors: list[float]) -> float:
+    return sum(errors) / len(errors) * 100 if errors else 0.0
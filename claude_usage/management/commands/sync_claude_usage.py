@@ -13,10 +13,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
-from django.utils import timezone as dj_timezone
 
 from claude_usage.models import ClaudeDailyUsage, ClaudeSession
-from claude_usage.pricing import compute_blended_rates, cost_for_tokens
+from claude_usage.pricing import compute_blended_rates, cost_for_rows
+from claude_usage.services import refresh_weekly_rollup
+from config.utils import bulk_upsert
 
 
 STATS_CACHE = Path.home() / ".claude" / "stats-cache.json"
@@ -79,41 +80,53 @@ class Command(BaseCommand):
         all_dates = set(daily_activity) | set(daily_tokens)
         created = updated = 0
 
+        # Flatten to one row per (date, model) so the whole batch is priced in one pass
+        batch = []
         for date_str in sorted(all_dates):
             activity = daily_activity.get(date_str, {})
             tokens_by_model = daily_tokens.get(date_str, {})
 
-            tool_count = activity.get("toolCallCount", 0)
-            sess_count = activity.get("sessionCount", 0)
-
             if not tokens_by_model:
                 # No model data for this date — insert a placeholder row under "unknown"
                 tokens_by_model = {"unknown": 0}
 
             for model_id, total_tokens in tokens_by_model.items():
-                cost = cost_for_tokens(model_id, total_tokens, blended_rates)
-
-                if dry_run:
-                    self.stdout.write(
-                        f"  [dry-run] {date_str} {model_id}: "
-                        f"{total_tokens} tokens, ${cost}, {tool_count} tool calls"
-                    )
-                    continue
-
-                obj, was_created = ClaudeDailyUsage.objects.update_or_create(
-                    date=date_str,
-                    model=model_id,
-                    defaults={
-                        "total_tokens": total_tokens,
-                        "api_equiv_cost_usd": cost,
-                        "tool_call_count": tool_count,
-                        "session_count": sess_count,
-                    },
+                batch.append((date_str, model_id, total_tokens, activity))
+
+        costs = cost_for_rows(
+            [(model_id, total_tokens) for _, model_id, total_tokens, _ in batch],
+            blended_rates,
+        )
+
+        rows = []
+        for (date_str, model_id, total_tokens, activity), cost in zip(batch, costs):
+            tool_count = activity.get("toolCallCount", 0)
+            sess_count = activity.get("sessionCount", 0)
+
+            if dry_run:
+                self.stdout.write(
+                    f"  [dry-run] {date_str} {model_id}: "
+                    f"{total_tokens} tokens, ${cost}, {tool_count} tool calls"
                 )
-                if was_created:
-                    created += 1
-                else:
-                    updated += 1
+                continue
+
+            rows.append({
+                "date": date_str,
+                "model": model_id,
+                "total_tokens": total_tokens,
+                "api_equiv_cost_usd": cost,
+                "tool_call_count": tool_count,
+                "session_count": sess_count,
+            })
+
+        if rows:
+            created, updated = bulk_upsert(
+                ClaudeDailyUsage, rows,
+                unique_fields=["date", "model"],
+                update_fields=["total_tokens", "api_equiv_cost_usd", "tool_call_count",
+                               "session_count", "synced_at"],
+            )
+            refresh_weekly_rollup({row["date"] for row in rows})
 
         return created, updated
 
@@ -124,6 +137,7 @@ class Command(BaseCommand):
             self.stdout.write(f"Sessions directory not found: {sessions_dir}")
             return created, updated
 
+        rows = []
         for session_file in sessions_dir.glob("*.json"):
             try:
                 with open(session_file) as f:
@@ -147,17 +161,18 @@ class Command(BaseCommand):
                 )
                 continue
 
-            obj, was_created = ClaudeSession.objects.update_or_create(
-                session_id=session_id,
-                defaults={
-                    "project_path": cwd,
-                    "project_name": project_name,
-                    "started_at": started_at,
-                },
+            rows.append({
+                "session_id": session_id,
+                "project_path": cwd,
+                "project_name": project_name,
+                "started_at": started_at,
+            })
+
+        if rows:
+            created, updated = bulk_upsert(
+                ClaudeSession, rows,
+                unique_fields=["session_id"],
+                update_fields=["project_path", "project_name", "started_at"],
             )
-            if was_created:
-                created += 1
-            else:
-                updated += 1
 
         return created, updated
@@ -3,9 +3,15 @@ Management command: sync_local_counts
 
 Reads ~/.claude/usage-counts/sessions.jsonl and events.jsonl produced by the
 PostToolUse + Stop hooks, and upserts ClaudeSession and ClaudeDailyUsage records.
+New events are also added to the ClaudeHourlyProfile histogram for the predictor.
 
 This is the forward-looking data source that replaces stats-cache.json for
 sessions after the stats-cache stopped being updated.
+
+Both files are append-only, so each run resumes from a per-file checkpoint
+(byte offset + inode + size) stored in HubConfig and only parses new lines.
+A changed inode or a shrunken file means the file was rotated or truncated,
+and triggers a full re-read. Pass --full to ignore the checkpoints.
 """
 import json
 from collections import defaultdict
@@ -14,7 +20,10 @@ from pathlib import Path
 
 from django.core.management.base import BaseCommand
 
+from config.models import HubConfig
+from config.utils import bulk_upsert
 from claude_usage.models import ClaudeDailyUsage, ClaudeSession, ClaudeToolCount
+from claude_usage.services import refresh_weekly_rollup, update_hourly_profile
 
 SESSIONS_FILE = Path.home() / ".claude/usage-counts/sessions.jsonl"
 EVENTS_FILE = Path.home() / ".claude/usage-counts/events.jsonl"
@@ -22,6 +31,10 @@ EVENTS_FILE = Path.home() / ".claude/usage-counts/events.jsonl"
 # Model key used for hook-derived daily rows (no token data available)
 HOOK_MODEL = "(local)"
 
+# HubConfig keys for the per-file read checkpoints
+SESSIONS_CHECKPOINT_KEY = "claude_usage_counts_checkpoint_sessions"
+EVENTS_CHECKPOINT_KEY = "claude_usage_counts_checkpoint_events"
+
 
 class Command(BaseCommand):
     help = "Sync local hook-based session and tool call counts into the database"
@@ -32,12 +45,18 @@ class Command(BaseCommand):
             action="store_true",
             help="Print what would be synced without writing to the database",
         )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Ignore saved checkpoints and re-read both files from the start",
+        )
 
     def handle(self, *args, **options):
         dry_run = options["dry_run"]
+        full = options["full"]
 
-        sess_created, sess_updated = self._sync_sessions(dry_run)
-        day_created, day_updated, tool_created, tool_updated = self._sync_daily_from_events(dry_run)
+        sess_created, sess_updated = self._sync_sessions(dry_run, full)
+        day_created, day_updated, tool_created, tool_updated = self._sync_daily_from_events(dry_run, full)
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -47,13 +66,25 @@ class Command(BaseCommand):
             )
         )
 
-    def _sync_sessions(self, dry_run: bool):
+    def _sync_sessions(self, dry_run: bool, full: bool):
         created = updated = 0
 
         if not SESSIONS_FILE.exists():
             return created, updated
 
-        for line in SESSIONS_FILE.read_text().splitlines():
+        stat = SESSIONS_FILE.stat()
+        checkpoint = None if full else _load_checkpoint(SESSIONS_CHECKPOINT_KEY)
+        if _checkpoint_valid(checkpoint, stat):
+            if stat.st_size == checkpoint["size"]:
+                return created, updated
+            start = checkpoint["offset"]
+        else:
+            start = 0
+
+        lines, end = _read_complete_lines(SESSIONS_FILE, start)
+
+        rows = []
+        for _, line in lines:
             try:
                 rec = json.loads(line)
             except json.JSONDecodeError:
@@ -75,52 +106,58 @@ class Command(BaseCommand):
                 )
                 continue
 
-            obj, was_created = ClaudeSession.objects.update_or_create(
-                session_id=session_id,
-                defaults={
-                    "project_path": rec.get("project_path", ""),
-                    "project_name": rec.get("project_name", ""),
-                    "started_at": started_at or _now(),
-                    "ended_at": ended_at,
-                    "duration_min": rec.get("duration_min"),
-                    "tool_call_count": rec.get("tool_calls", 0),
-                },
+            rows.append({
+                "session_id": session_id,
+                "project_path": rec.get("project_path", ""),
+                "project_name": rec.get("project_name", ""),
+                "started_at": started_at or _now(),
+                "ended_at": ended_at,
+                "duration_min": rec.get("duration_min"),
+                "tool_call_count": rec.get("tool_calls", 0),
+            })
+
+        if rows:
+            created, updated = bulk_upsert(
+                ClaudeSession, rows,
+                unique_fields=["session_id"],
+                update_fields=["project_path", "project_name", "started_at", "ended_at",
+                               "duration_min", "tool_call_count"],
             )
-            if was_created:
-                created += 1
-            else:
-                updated += 1
+
+        if not dry_run:
+            _save_checkpoint(SESSIONS_CHECKPOINT_KEY, {
+                "inode": stat.st_ino, "size": stat.st_size, "offset": end,
+            })
 
         return created, updated
 
-    def _sync_daily_from_events(self, dry_run: bool):
+    def _sync_daily_from_events(self, dry_run: bool, full: bool):
         created = updated = tool_created = tool_updated = 0
 
         if not EVENTS_FILE.exists():
             return created, updated, tool_created, tool_updated
 
-        by_date: dict[str, dict] = defaultdict(lambda: {"tool_calls": 0, "sessions": set()})
-        by_date_tool: dict[tuple, int] = {}  # (date_str, tool_name) → count
-
-        for line in EVENTS_FILE.read_text().splitlines():
-            try:
-                event = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-            ts_ms = event.get("ts", 0)
-            if not ts_ms:
-                continue
+        # Daily rows need every event for a date (distinct sessions can't be
+        # summed), so resume from the first line of the last date seen rather
+        # than from the end offset, and re-aggregate only the dates read.
+        stat = EVENTS_FILE.stat()
+        checkpoint = None if full else _load_checkpoint(EVENTS_CHECKPOINT_KEY)
+        parsed = None
+        if _checkpoint_valid(checkpoint, stat):
+            if stat.st_size == checkpoint["size"]:
+                return created, updated, tool_created, tool_updated
+            # None means an event older than the resume window was appended late;
+            # the partial window would under-count its date, so re-read everything.
+            parsed = _parse_events(
+                EVENTS_FILE, checkpoint["day_offset"], checkpoint["day"], checkpoint["offset"]
+            )
+        rebuild_profile = parsed is None
+        if parsed is None:
+            parsed = _parse_events(EVENTS_FILE, 0, None, 0)
 
-            day = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).date().isoformat()
-            tool = event.get("tool", "unknown")
-            by_date[day]["tool_calls"] += 1
-            sid = event.get("session_id", "")
-            if sid:
-                by_date[day]["sessions"].add(sid)
-            key = (day, tool)
-            by_date_tool[key] = by_date_tool.get(key, 0) + 1
+        by_date, by_date_tool, by_hour, last_day, last_day_offset, end = parsed
 
+        day_rows = []
         for date_str, agg in sorted(by_date.items()):
             tool_calls = agg["tool_calls"]
             session_count = len(agg["sessions"])
@@ -132,38 +169,133 @@ class Command(BaseCommand):
                 )
                 continue
 
-            obj, was_created = ClaudeDailyUsage.objects.update_or_create(
-                date=date_str,
-                model=HOOK_MODEL,
-                defaults={
-                    "total_tokens": 0,
-                    "api_equiv_cost_usd": 0,
-                    "tool_call_count": tool_calls,
-                    "session_count": session_count,
-                },
-            )
-            if was_created:
-                created += 1
-            else:
-                updated += 1
+            day_rows.append({
+                "date": date_str,
+                "model": HOOK_MODEL,
+                "total_tokens": 0,
+                "api_equiv_cost_usd": 0,
+                "tool_call_count": tool_calls,
+                "session_count": session_count,
+            })
 
+        tool_rows = []
         for (date_str, tool_name), count in sorted(by_date_tool.items()):
             if dry_run:
                 self.stdout.write(f"  [dry-run] {date_str} {tool_name}: {count}")
                 continue
-            obj, was_created = ClaudeToolCount.objects.update_or_create(
-                date=date_str,
-                tool_name=tool_name,
-                defaults={"count": count},
+            tool_rows.append({"date": date_str, "tool_name": tool_name, "count": count})
+
+        if day_rows:
+            created, updated = bulk_upsert(
+                ClaudeDailyUsage, day_rows,
+                unique_fields=["date", "model"],
+                update_fields=["total_tokens", "api_equiv_cost_usd", "tool_call_count",
+                               "session_count", "synced_at"],
+            )
+        if tool_rows:
+            tool_created, tool_updated = bulk_upsert(
+                ClaudeToolCount, tool_rows,
+                unique_fields=["date", "tool_name"],
+                update_fields=["count"],
             )
-            if was_created:
-                tool_created += 1
-            else:
-                tool_updated += 1
+        if day_rows or tool_rows:
+            refresh_weekly_rollup(by_date.keys())
+        if not dry_run and (by_hour or rebuild_profile):
+            update_hourly_profile(by_hour, replace=rebuild_profile)
+
+        if not dry_run:
+            _save_checkpoint(EVENTS_CHECKPOINT_KEY, {
+                "inode": stat.st_ino, "size": stat.st_size, "offset": end,
+                "day": last_day, "day_offset": last_day_offset,
+            })
 
         return created, updated, tool_created, tool_updated
 
 
+def _parse_events(path: Path, start: int, window_day: str | None, new_from: int):
+    """
+    Aggregate events from byte offset `start` to the last complete line.
+
+    Returns (by_date, by_date_tool, by_hour, last_day, last_day_offset, end_offset),
+    or None if an event dated before `window_day` is found. last_day/last_day_offset
+    locate the first line of the newest date and become the next resume window.
+    by_hour only counts lines at or past `new_from` (the previous end offset), so
+    the re-read part of the window isn't added to the hourly profile twice.
+    """
+    by_date: dict[str, dict] = defaultdict(lambda: {"tool_calls": 0, "sessions": set()})
+    by_date_tool: dict[tuple, int] = {}  # (date_str, tool_name) → count
+    by_hour: dict[tuple, int] = {}  # (weekday, hour) → count, UTC
+    last_day = window_day
+    last_day_offset = start
+
+    lines, end = _read_complete_lines(path, start)
+    for offset, line in lines:
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+
+        ts_ms = event.get("ts", 0)
+        if not ts_ms:
+            continue
+
+        ts = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc)
+        day = ts.date().isoformat()
+        if window_day and day < window_day:
+            return None
+        if last_day is None or day > last_day:
+            last_day, last_day_offset = day, offset
+
+        tool = event.get("tool", "unknown")
+        by_date[day]["tool_calls"] += 1
+        sid = event.get("session_id", "")
+        if sid:
+            by_date[day]["sessions"].add(sid)
+        key = (day, tool)
+        by_date_tool[key] = by_date_tool.get(key, 0) + 1
+        if offset >= new_from:
+            slot = (ts.weekday(), ts.hour)
+            by_hour[slot] = by_hour.get(slot, 0) + 1
+
+    return by_date, by_date_tool, by_hour, last_day, last_day_offset, end
+
+
+def _read_complete_lines(path: Path, start: int) -> tuple[list[tuple[int, str]], int]:
+    """
+    Return [(byte_offset, line)] for every newline-terminated line from `start`,
+    plus the offset just past the last one. A trailing partial line (a hook
+    mid-write) is left for the next run.
+    """
+    lines = []
+    pos = start
+    with open(path, "rb") as f:
+        f.seek(start)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            lines.append((pos, raw.decode("utf-8", errors="replace").strip()))
+            pos += len(raw)
+    return lines, pos
+
+
+def _checkpoint_valid(checkpoint: dict | None, stat) -> bool:
+    """A checkpoint is usable only for the same inode and a file that hasn't shrunk."""
+    if not checkpoint:
+        return False
+    return checkpoint.get("inode") == stat.st_ino and stat.st_size >= checkpoint.get("size", 0)
+
+
+def _load_checkpoint(key: str) -> dict | None:
+    try:
+        return json.loads(HubConfig.objects.get(key=key).value)
+    except (HubConfig.DoesNotExist, json.JSONDecodeError, TypeError):
+        return None
+
+
+def _save_checkpoint(key: str, data: dict):
+    HubConfig.objects.update_or_create(key=key, defaults={"value": json.dumps(data)})
+
+
 def _parse_dt(value: str | None) -> datetime | None:
     if not value:
         return None
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:49
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def backfill_weekly_rollup(apps, schema_editor):
+    ClaudeDailyUsage = apps.get_model('claude_usage', 'ClaudeDailyUsage')
+    ClaudeToolCount = apps.get_model('claude_usage', 'ClaudeToolCount')
+    ClaudeWeeklyRollup = apps.get_model('claude_usage', 'ClaudeWeeklyRollup')
+
+    totals = {}
+    per_day = ClaudeDailyUsage.objects.values('date').annotate(
+        tools=models.Max('tool_call_count'), cost=models.Sum('api_equiv_cost_usd'),
+    )
+    for row in per_day:
+        ws = row['date'] - timedelta(days=row['date'].weekday())
+        t = totals.setdefault(ws, {'count': 0, 'peak': 0, 'cost': Decimal('0')})
+        t['count'] += row['tools']
+        t['peak'] = max(t['peak'], row['tools'])
+        t['cost'] += row['cost'] or 0
+
+    per_tool = {}
+    for row in ClaudeToolCount.objects.values('date', 'tool_name', 'count'):
+        ws = row['date'] - timedelta(days=row['date'].weekday())
+        t = per_tool.setdefault((ws, row['tool_name']), {'count': 0, 'peak': 0})
+        t['count'] += row['count']
+        t['peak'] = max(t['peak'], row['count'])
+
+    rows = [
+        ClaudeWeeklyRollup(week_start=ws, tool_name='(all)', count=t['count'],
+                           max_daily_tool_calls=t['peak'], api_equiv_cost_usd=t['cost'])
+        for ws, t in totals.items()
+    ] + [
+        ClaudeWeeklyRollup(week_start=ws, tool_name=tool, count=t['count'],
+                           max_daily_tool_calls=t['peak'])
+        for (ws, tool), t in per_tool.items()
+    ]
+    ClaudeWeeklyRollup.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('claude_usage', '0005_remove_unused'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaudeWeeklyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_start', models.DateField()),
+                ('tool_name', models.CharField(max_length=64)),
+                ('count', models.IntegerField(default=0)),
+                ('max_daily_tool_calls', models.IntegerField(default=0)),
+                ('api_equiv_cost_usd', models.DecimalField(decimal_places=6, default=0, max_digits=12)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-week_start', 'tool_name'],
+                'unique_together': {('week_start', 'tool_name')},
+            },
+        ),
+        migrations.RunPython(backfill_weekly_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('claude_usage', '0006_claudeweeklyrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaudeHourlyProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField()),
+                ('hour', models.PositiveSmallIntegerField()),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['weekday', 'hour'],
+                'unique_together': {('weekday', 'hour')},
+            },
+        ),
+    ]
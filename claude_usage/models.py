@@ -65,3 +65,42 @@ class ClaudeToolCount(models.Model):
         return f"{self.date} {self.tool_name}: {self.count}"
 
 
+class ClaudeWeeklyRollup(models.Model):
+    """
+    Per-week totals maintained by the sync commands so history views don't
+    re-aggregate daily rows. One row per tool, plus a TOTAL row carrying the
+    week's tool calls (max across model rows per day), peak day and cost.
+    """
+    TOTAL = "(all)"
+
+    week_start = models.DateField()
+    tool_name = models.CharField(max_length=64)
+    count = models.IntegerField(default=0)
+    max_daily_tool_calls = models.IntegerField(default=0)
+    api_equiv_cost_usd = models.DecimalField(max_digits=12, decimal_places=6, default=0)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [("week_start", "tool_name")]
+        ordering = ["-week_start", "tool_name"]
+
+    def __str__(self):
+        return f"week of {self.week_start} {self.tool_name}: {self.count}"
+
+
+class ClaudeHourlyProfile(models.Model):
+    """
+    7×24 histogram of tool calls by UTC weekday (0=Mon) and hour, learned from
+    events.jsonl by sync_local_counts. Used by the predictor to estimate how
+    much of a day's usage is still to come.
+    """
+    weekday = models.PositiveSmallIntegerField()
+    hour = models.PositiveSmallIntegerField()
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = [("weekday", "hour")]
+        ordering = ["weekday", "hour"]
+
+    def __str__(self):
+        return f"weekday {self.weekday} {self.hour:02d}h: {self.count}"
@@ -3,6 +3,10 @@ Weekly burn rate predictor for Claude Pro plan usage.
 
 Primary metric: tool call count (tracked via PostToolUse hook).
 Alert levels: green / yellow / red based on % of personal_weekly_peak consumed.
+
+Today's total is projected from the learned hourly profile (ClaudeHourlyProfile):
+the share of a typical day already elapsed at this UTC hour decides how far to
+trust today's pace versus the trailing daily average.
 """
 
 from dataclasses import dataclass
@@ -18,6 +22,10 @@ DEFAULT_PEAK = 3000
 DEFAULT_YELLOW = 60
 DEFAULT_RED = 80
 
+# A weekday's own histogram is used once it has this many events behind it;
+# below that the all-weekday histogram is used, then a flat 1/24 per hour.
+MIN_PROFILE_EVENTS = 200
+
 
 @dataclass
 class UsagePrediction:
@@ -49,32 +57,99 @@ def _get_threshold(key: str, default: int) -> int:
         return default
 
 
-def predict(daily_rows) -> UsagePrediction:
+class HourlyProfile:
+    """
+    Read-only view of the 7×24 histogram with the cumulative sums the
+    projection needs precomputed, so each lookup is O(1).
+    """
+
+    def __init__(self, counts: dict[tuple[int, int], int]):
+        grid = [[counts.get((w, h), 0) for h in range(24)] for w in range(7)]
+        pooled = [sum(grid[w][h] for w in range(7)) for h in range(24)]
+        self._day_totals = [sum(row) for row in grid]
+        self._cumulative = [_cumulative(row) for row in grid]
+        self._pooled_cumulative = _cumulative(pooled)
+        self._total = sum(pooled)
+
+    def fraction_elapsed(self, weekday: int, hour: int, minute: int = 0) -> float:
+        """Share of a typical `weekday`'s tool calls made before hour:minute."""
+        if self._day_totals[weekday] >= MIN_PROFILE_EVENTS:
+            cumulative = self._cumulative[weekday]
+        elif self._total >= MIN_PROFILE_EVENTS:
+            cumulative = self._pooled_cumulative
+        else:
+            return (hour + minute / 60) / 24
+        day_total = cumulative[24]
+        done = cumulative[hour] + (cumulative[hour + 1] - cumulative[hour]) * minute / 60
+        return done / day_total
+
+    def weekday_weight(self, weekday: int) -> float:
+        """How busy `weekday` is relative to the average day (1.0 = average)."""
+        if min(self._day_totals) * 7 < MIN_PROFILE_EVENTS:
+            return 1.0
+        return self._day_totals[weekday] * 7 / self._total
+
+
+def _cumulative(hourly: list[int]) -> list[int]:
+    out = [0]
+    for n in hourly:
+        out.append(out[-1] + n)
+    return out
+
+
+def load_profile() -> HourlyProfile:
+    from .models import ClaudeHourlyProfile
+
+    return HourlyProfile({
+        (weekday, hour): count
+        for weekday, hour, count in ClaudeHourlyProfile.objects.values_list("weekday", "hour", "count")
+    })
+
+
+def project_today(
+    today_tools: int,
+    typical_day: float,
+    now_utc: datetime,
+    profile: HourlyProfile,
+) -> float:
+    """
+    Expected end-of-day total given `today_tools` so far.
+
+    The remaining share of the day is filled in with a blend of today's pace and
+    `typical_day` (the trailing daily mean), weighted by how much of the day has
+    elapsed — early on the trailing mean dominates, late in the day the pace does.
     """
-    Compute a usage prediction from a queryset/list of ClaudeDailyUsage rows.
+    weekday = now_utc.weekday()
+    frac = profile.fraction_elapsed(weekday, now_utc.hour, now_utc.minute)
+    typical = typical_day * profile.weekday_weight(weekday)
+    pace = today_tools / frac if frac > 0 else typical
+    blended = frac * pace + (1 - frac) * typical
+    return today_tools + (1 - frac) * blended
+
 
-    `daily_rows` should cover at minimum the trailing 7 days. Multiple rows per
-    date (one per model) are deduplicated by taking the max tool_call_count per date.
+def predict(by_date: dict[date, int], profile: HourlyProfile | None = None) -> UsagePrediction:
     """
+    Compute a usage prediction from per-date tool call counts.
+
+    `by_date` should cover at minimum the trailing 7 days, already deduplicated
+    across model rows (max tool_call_count per date), as produced by
+    claude_usage.services.collect_trailing_usage. `profile` defaults to the
+    stored ClaudeHourlyProfile.
+    """
+    if profile is None:
+        profile = load_profile()
+
     today = date.today()
     week_start = today - timedelta(days=today.weekday())  # Monday
 
-    by_date: dict[date, int] = {}
-    for row in daily_rows:
-        d = row.date
-        by_date[d] = max(by_date.get(d, 0), row.tool_call_count)
-
-    tools_past = sum(
-        by_date.get(today - timedelta(days=delta), 0)
-        for delta in range(1, 7)
-    )
+    past = [by_date.get(today - timedelta(days=delta), 0) for delta in range(1, 7)]
+    tools_past = sum(past)
+    typical_day = tools_past / len(past)
 
     today_tools = by_date.get(today, 0)
 
     now_utc = datetime.now(timezone.utc)
-    hours_elapsed = now_utc.hour + now_utc.minute / 60 + 1  # +1 to avoid /0 at midnight
-    velocity = today_tools / hours_elapsed
-    projected_today = int(velocity * 24)
+    projected_today = int(project_today(today_tools, typical_day, now_utc, profile))
 
     tool_calls_this_week = tools_past + today_tools
     projected_week = tools_past + projected_today
@@ -93,8 +168,11 @@ def predict(daily_rows) -> UsagePrediction:
         alert_level = "green"
 
     remaining = peak - projected_week
-    if velocity > 0 and remaining > 0:
-        projected_days = round(remaining / (velocity * 24), 1)
+    # Today's projection, normalised to an average weekday, is the daily level
+    # carried forward; each future day is scaled by its weekday weight.
+    daily_level = projected_today / profile.weekday_weight(now_utc.weekday())
+    if daily_level > 0 and remaining > 0:
+        projected_days = _days_to_cover(remaining, daily_level, now_utc.weekday(), profile)
     elif remaining <= 0:
         projected_days = 0.0
     else:
@@ -114,3 +192,18 @@ def predict(daily_rows) -> UsagePrediction:
         projected_days_until_limit=projected_days,
         days_until_week_reset=days_until_reset,
     )
+
+
+def _days_to_cover(remaining: float, daily_level: float, weekday: int, profile: HourlyProfile) -> float:
+    """Days from tomorrow until `remaining` calls are used at `daily_level` per average day."""
+    week_total = daily_level * 7  # weekday weights average to 1
+    full_weeks, remaining = divmod(remaining, week_total)
+    days = full_weeks * 7
+    for step in range(1, 8):
+        need = daily_level * profile.weekday_weight((weekday + step) % 7)
+        if need >= remaining:
+            days += remaining / need
+            break
+        remaining -= need
+        days += 1
+    return round(days, 1)
@@ -6,6 +6,7 @@ All costs are reference-only — not actual billing (Pro plan, costUSD is always
 
 import json
 from decimal import Decimal
+from functools import lru_cache
 from config.utils import get_config
 
 # HubConfig key for the pricing table JSON blob
@@ -33,16 +34,85 @@ DEFAULT_PRICING = {
 }
 
 
-def get_pricing_table() -> dict:
+PRICE_FIELDS = ("input", "output", "cache_read", "cache_write")
+FALLBACK_FAMILY = "claude-sonnet"
+
+_PER_MILLION = Decimal(1_000_000)
+_COST_QUANTUM = Decimal("0.000001")
+
+
+class PricingRegistry:
+    """
+    Parsed and validated pricing table plus precomputed per-token Decimal rates.
+
+    Built once per distinct raw config value; see get_registry().
+    """
+
+    def __init__(self, table: dict):
+        self.table = table
+        self.per_token: dict[str, dict[str, Decimal]] = {
+            family: {
+                field: Decimal(str(prices[field])) / _PER_MILLION
+                for field in PRICE_FIELDS
+            }
+            for family, prices in table.items()
+        }
+
+    def prices_for(self, model_id: str) -> dict:
+        return self.table.get(_model_family(model_id), self.table[FALLBACK_FAMILY])
+
+    def input_rate(self, model_id: str) -> Decimal:
+        family = _model_family(model_id)
+        rates = self.per_token.get(family, self.per_token[FALLBACK_FAMILY])
+        return rates["input"]
+
+
+def _validate_table(parsed) -> dict:
+    """
+    Keep only well-formed family entries (all four prices numeric). Missing or
+    malformed families fall back to DEFAULT_PRICING so lookups never KeyError.
+    """
+    table = {family: dict(prices) for family, prices in DEFAULT_PRICING.items()}
+    if not isinstance(parsed, dict):
+        return table
+    for family, prices in parsed.items():
+        if not isinstance(prices, dict):
+            continue
+        try:
+            table[family] = {field: float(prices[field]) for field in PRICE_FIELDS}
+        except (KeyError, TypeError, ValueError):
+            continue
+    return table
+
+
+_registry: PricingRegistry | None = None
+_registry_raw: str | None = None
+
+
+def get_registry() -> PricingRegistry:
+    """Return the pricing registry, re-parsing only when the stored JSON changes."""
+    global _registry, _registry_raw
     raw = get_config(PRICING_KEY)
+    if _registry is not None and raw == _registry_raw:
+        return _registry
+
+    parsed = None
     if raw:
         try:
-            return json.loads(raw)
+            parsed = json.loads(raw)
         except (json.JSONDecodeError, TypeError):
-            pass
-    return DEFAULT_PRICING
+            parsed = None
+
+    _registry = PricingRegistry(_validate_table(parsed))
+    _registry_raw = raw
+    return _registry
 
 
+def get_pricing_table() -> dict:
+    return get_registry().table
+
+
+@lru_cache(maxsize=256)
 def _model_family(model_id: str) -> str:
     """Map a full model ID like 'claude-sonnet-4-5-20250929' to a pricing family key."""
     lower = model_id.lower()
@@ -62,7 +132,7 @@ def compute_blended_rates(model_usage: dict) -> dict[str, Decimal]:
 
     Used to estimate daily costs from dailyModelTokens (which only has totals, not split).
     """
-    pricing = get_pricing_table()
+    registry = get_registry()
     rates: dict[str, Decimal] = {}
 
     for model_id, usage in model_usage.items():
@@ -76,8 +146,7 @@ def compute_blended_rates(model_usage: dict) -> dict[str, Decimal]:
             rates[model_id] = Decimal("0")
             continue
 
-        family = _model_family(model_id)
-        p = pricing.get(family, pricing["claude-sonnet"])
+        p = registry.prices_for(model_id)
 
         # USD per million tokens -> USD per token
         cost = (
@@ -92,13 +161,25 @@ def compute_blended_rates(model_usage: dict) -> dict[str, Decimal]:
     return rates
 
 
-def cost_for_tokens(model_id: str, total_tokens: int, blended_rates: dict[str, Decimal]) -> Decimal:
+def cost_for_tokens(model_id: str, total_tokens: int, blended_rates: dict[str, Decimal],
+                    registry: PricingRegistry | None = None) -> Decimal:
     """Return estimated USD cost for `total_tokens` of a given model."""
     rate = blended_rates.get(model_id)
     if rate is None:
-        pricing = get_pricing_table()
-        family = _model_family(model_id)
-        p = pricing.get(family, pricing["claude-sonnet"])
         # No lifetime data — use input price as conservative estimate
-        rate = Decimal(str(p["input"] / 1_000_000))
-    return (rate * total_tokens).quantize(Decimal("0.000001"))
+        rate = (registry or get_registry()).input_rate(model_id)
+    return (rate * total_tokens).quantize(_COST_QUANTUM)
+
+
+def cost_for_rows(rows, blended_rates: dict[str, Decimal]) -> list[Decimal]:
+    """
+    Price a whole batch of (model_id, total_tokens) pairs in one pass.
+
+    The registry is resolved once for the batch, so pricing N rows costs one
+    config lookup instead of one per unknown model per row.
+    """
+    registry = get_registry()
+    return [
+        cost_for_tokens(model_id, total_tokens, blended_rates, registry)
+        for model_id, total_tokens in rows
+    ]
@@ -1,35 +1,115 @@
 import json
 from datetime import date, timedelta
+from decimal import Decimal
 
-from .models import ClaudeDailyUsage, ClaudeToolCount, ClaudeUsageSnapshot
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import DateField, Max, Q, Sum
+from django.db.models.functions import TruncWeek
 
+from config.utils import bulk_upsert
+from .models import (
+    ClaudeDailyUsage, ClaudeHourlyProfile, ClaudeToolCount, ClaudeUsageSnapshot, ClaudeWeeklyRollup,
+)
+
+TRAILING_DAYS = 14
+CARD_DAYS = 7
+
+_TRAILING_CACHE_KEY = "claude_usage:trailing_usage:{}"
+_TRAILING_CACHE_TTL = 60  # seconds
+_REQUEST_ATTR = "_claude_trailing_usage"
+
+
+def collect_trailing_usage(request=None) -> dict:
+    """
+    Trailing 14-day Claude usage shared by the overview page, the dashboard card
+    and the status check: per-date tool calls (max across model rows) and cost,
+    per-tool totals for the 14-day window, the 7-day card window and today, and
+    the latest usage snapshot.
+
+    Memoized on `request` when given, and in the cache for a short TTL so the
+    home page's concurrent card loads share one set of queries.
+    """
+    if request is not None and hasattr(request, _REQUEST_ATTR):
+        return getattr(request, _REQUEST_ATTR)
 
-def collect_claude_dashboard_summary():
     today = date.today()
-    trailing_7_start = today - timedelta(days=6)
+    key = _TRAILING_CACHE_KEY.format(today.isoformat())
+    data = cache.get(key)
+    if data is None:
+        data = _aggregate_trailing_usage(today)
+        cache.set(key, data, _TRAILING_CACHE_TTL)
 
-    rows = list(ClaudeDailyUsage.objects.filter(date__gte=trailing_7_start))
-    by_date: dict[str, int] = {}
-    for r in rows:
-        ds = str(r.date)
-        by_date[ds] = max(by_date.get(ds, 0), r.tool_call_count)
+    if request is not None:
+        setattr(request, _REQUEST_ATTR, data)
+    return data
 
-    labels = []
-    counts = []
-    for i in range(7):
-        d = trailing_7_start + timedelta(days=i)
-        labels.append(d.strftime("%m/%d"))
-        counts.append(by_date.get(str(d), 0))
 
-    tool_rows = ClaudeToolCount.objects.filter(
-        date__gte=trailing_7_start, date__lte=today
-    ).values("tool_name", "count")
+def _aggregate_trailing_usage(today: date) -> dict:
+    start = today - timedelta(days=TRAILING_DAYS - 1)
+    card_start = today - timedelta(days=CARD_DAYS - 1)
+
+    by_date: dict[date, int] = {}
+    cost_by_date: dict[date, Decimal] = {}
+    per_day = (
+        ClaudeDailyUsage.objects.filter(date__gte=start)
+        .values("date")
+        .annotate(tools=Max("tool_call_count"), cost=Sum("api_equiv_cost_usd"))
+    )
+    for row in per_day:
+        by_date[row["date"]] = row["tools"]
+        cost_by_date[row["date"]] = row["cost"] or Decimal("0")
+
     by_tool: dict[str, int] = {}
-    for tc in tool_rows:
-        by_tool[tc["tool_name"]] = by_tool.get(tc["tool_name"], 0) + tc["count"]
+    by_tool_card: dict[str, int] = {}
+    today_by_tool: dict[str, int] = {}
+    per_tool = (
+        ClaudeToolCount.objects.filter(date__gte=start, date__lte=today)
+        .values("tool_name")
+        .annotate(
+            total=Sum("count"),
+            card_total=Sum("count", filter=Q(date__gte=card_start)),
+            today_total=Sum("count", filter=Q(date=today)),
+        )
+    )
+    for row in per_tool:
+        by_tool[row["tool_name"]] = row["total"]
+        if row["card_total"] is not None:
+            by_tool_card[row["tool_name"]] = row["card_total"]
+        if row["today_total"] is not None:
+            today_by_tool[row["tool_name"]] = row["today_total"]
 
     try:
         snapshot = ClaudeUsageSnapshot.objects.latest()
+    except ClaudeUsageSnapshot.DoesNotExist:
+        snapshot = None
+
+    return {
+        "today": today,
+        "start": start,
+        "by_date": by_date,
+        "cost_by_date": cost_by_date,
+        "by_tool": by_tool,
+        "by_tool_7d": by_tool_card,
+        "today_by_tool": today_by_tool,
+        "snapshot": snapshot,
+    }
+
+
+def collect_claude_dashboard_summary(request=None):
+    usage = collect_trailing_usage(request)
+    today = usage["today"]
+    trailing_7_start = today - timedelta(days=CARD_DAYS - 1)
+
+    labels = []
+    counts = []
+    for i in range(CARD_DAYS):
+        d = trailing_7_start + timedelta(days=i)
+        labels.append(d.strftime("%m/%d"))
+        counts.append(usage["by_date"].get(d, 0))
+
+    snapshot = usage["snapshot"]
+    if snapshot is not None:
         weekly_pct = snapshot.weekly_pct
         weekly_resets_at = snapshot.weekly_resets_at
         session_pct = snapshot.session_pct
@@ -38,7 +118,7 @@ def collect_claude_dashboard_summary():
             days_until_reset = (weekly_resets_at.date() - today).days
         else:
             days_until_reset = None
-    except ClaudeUsageSnapshot.DoesNotExist:
+    else:
         weekly_pct = None
         weekly_resets_at = None
         session_pct = None
@@ -48,7 +128,7 @@ def collect_claude_dashboard_summary():
     return {
         "labels_json": json.dumps(labels),
         "counts_json": json.dumps(counts),
-        "by_tool_json": json.dumps(by_tool),
+        "by_tool_json": json.dumps(usage["by_tool_7d"]),
         "weekly_pct": weekly_pct,
         "weekly_resets_at": weekly_resets_at,
         "session_pct": session_pct,
@@ -56,3 +136,91 @@ def collect_claude_dashboard_summary():
         "days_until_reset": days_until_reset,
         "total_7d": sum(counts),
     }
+
+
+def _week_start(d: date) -> date:
+    return d - timedelta(days=d.weekday())
+
+
+def refresh_weekly_rollup(dates=None):
+    """
+    Recompute ClaudeWeeklyRollup for the weeks containing `dates` (date objects
+    or ISO strings), or for all history when `dates` is None. Called by the sync
+    commands after they write daily rows.
+    """
+    daily = ClaudeDailyUsage.objects.all()
+    tools = ClaudeToolCount.objects.all()
+    rollups = ClaudeWeeklyRollup.objects.all()
+
+    if dates is not None:
+        weeks = {
+            _week_start(d if isinstance(d, date) else date.fromisoformat(d))
+            for d in dates
+        }
+        if not weeks:
+            return 0
+        start, end = min(weeks), max(weeks) + timedelta(days=7)
+        daily = daily.filter(date__gte=start, date__lt=end)
+        tools = tools.filter(date__gte=start, date__lt=end)
+        rollups = rollups.filter(week_start__gte=start, week_start__lt=end)
+
+    # Weekly totals: per-day max across model rows first, then fold into weeks
+    totals: dict[date, dict] = {}
+    per_day = daily.values("date").annotate(tools=Max("tool_call_count"), cost=Sum("api_equiv_cost_usd"))
+    for row in per_day:
+        t = totals.setdefault(_week_start(row["date"]), {"count": 0, "peak": 0, "cost": Decimal("0")})
+        t["count"] += row["tools"]
+        t["peak"] = max(t["peak"], row["tools"])
+        t["cost"] += row["cost"] or 0
+
+    new_rows = [
+        ClaudeWeeklyRollup(
+            week_start=ws,
+            tool_name=ClaudeWeeklyRollup.TOTAL,
+            count=t["count"],
+            max_daily_tool_calls=t["peak"],
+            api_equiv_cost_usd=t["cost"],
+        )
+        for ws, t in totals.items()
+    ]
+
+    per_tool = (
+        tools.annotate(week=TruncWeek("date", output_field=DateField()))
+        .values("week", "tool_name")
+        .annotate(total=Sum("count"), peak=Max("count"))
+    )
+    for row in per_tool:
+        new_rows.append(ClaudeWeeklyRollup(
+            week_start=row["week"],
+            tool_name=row["tool_name"],
+            count=row["total"],
+            max_daily_tool_calls=row["peak"],
+        ))
+
+    with transaction.atomic():
+        rollups.delete()
+        ClaudeWeeklyRollup.objects.bulk_create(new_rows)
+    return len(new_rows)
+
+
+def update_hourly_profile(counts: dict[tuple[int, int], int], replace: bool = False):
+    """
+    Add `counts` ({(weekday, hour): n}) to ClaudeHourlyProfile, or overwrite the
+    whole 7×24 table with them when `replace` is set (full re-read of events).
+    """
+    if replace:
+        totals = {(w, h): 0 for w in range(7) for h in range(24)}
+    else:
+        totals = {
+            (row.weekday, row.hour): row.count
+            for row in ClaudeHourlyProfile.objects.all()
+        }
+    for key, n in counts.items():
+        totals[key] = totals.get(key, 0) + n
+
+    bulk_upsert(
+        ClaudeHourlyProfile,
+        [{"weekday": w, "hour": h, "count": n} for (w, h), n in totals.items()],
+        unique_fields=["weekday", "hour"],
+        update_fields=["count"],
+    )
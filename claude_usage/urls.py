@@ -4,5 +4,6 @@ from . import views
 urlpatterns = [
     path("", views.overview, name="claude_usage_overview"),
     path("history/", views.history, name="claude_usage_history"),
+    path("history/day/<str:day>/", views.history_day, name="claude_usage_history_day"),
     path("by-project/", views.by_project, name="claude_usage_by_project"),
 ]
@@ -3,66 +3,51 @@ from calendar import monthrange
 from datetime import date, timedelta
 
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count, Max, Min, Sum
+from django.db.models import Count, Max, Min
+from django.http import Http404, JsonResponse
 from django.shortcuts import render
 
-from .models import ClaudeDailyUsage, ClaudeSession, ClaudeToolCount, ClaudeUsageSnapshot
+from .models import (
+    ClaudeDailyUsage, ClaudeSession, ClaudeToolCount, ClaudeWeeklyRollup,
+)
 from .predictor import predict
+from .services import TRAILING_DAYS, collect_trailing_usage
 
+HISTORY_WEEKS = 8
+MAX_HISTORY_WEEKS = 156
 
 
 @login_required
 def overview(request):
-    today = date.today()
+    usage = collect_trailing_usage(request)
+    today = usage["today"]
     week_start = today - timedelta(days=today.weekday())
-    trailing_14_start = today - timedelta(days=13)
-
-    rows_14 = list(ClaudeDailyUsage.objects.filter(date__gte=trailing_14_start))
+    trailing_14_start = usage["start"]
+    by_date = usage["by_date"]
 
-    prediction = predict(rows_14)
+    prediction = predict(by_date)
 
     weekly_cost = sum(
-        float(r.api_equiv_cost_usd) for r in rows_14 if r.date >= week_start
+        float(cost) for d, cost in usage["cost_by_date"].items() if d >= week_start
     )
 
-    # Rolling 14-day — by-day counts (deduplicated)
-    trailing_by_day: dict[str, int] = {}
-    for r in rows_14:
-        ds = str(r.date)
-        trailing_by_day[ds] = max(trailing_by_day.get(ds, 0), r.tool_call_count)
-
-    # Rolling 14-day — by-tool counts
-    week_tool_rows = ClaudeToolCount.objects.filter(
-        date__gte=trailing_14_start, date__lte=today
-    ).values("tool_name", "count")
-    week_by_tool: dict[str, int] = {}
-    for tc in week_tool_rows:
-        week_by_tool[tc["tool_name"]] = week_by_tool.get(tc["tool_name"], 0) + tc["count"]
-
     # Day labels and per-day counts for the 14-day chart
     week_day_labels = []
     week_day_counts = []
-    for i in range(14):
+    for i in range(TRAILING_DAYS):
         d = trailing_14_start + timedelta(days=i)
         week_day_labels.append(d.strftime("%m/%d"))
-        week_day_counts.append(trailing_by_day.get(str(d), 0))
+        week_day_counts.append(by_date.get(d, 0))
 
     # Today — per-tool breakdown
-    today_tool_rows = ClaudeToolCount.objects.filter(date=today).values("tool_name", "count")
-    today_by_tool: dict[str, int] = {tc["tool_name"]: tc["count"] for tc in today_tool_rows}
-    today_count = sum(today_by_tool.values()) if today_by_tool else max(
-        (r.tool_call_count for r in rows_14 if r.date == today), default=0
-    )
+    today_by_tool = usage["today_by_tool"]
+    today_count = sum(today_by_tool.values()) if today_by_tool else by_date.get(today, 0)
 
-    try:
-        latest_snapshot = ClaudeUsageSnapshot.objects.latest()
-        days_until_reset = (
-            (latest_snapshot.weekly_resets_at.date() - today).days
-            if latest_snapshot and latest_snapshot.weekly_resets_at else None
-        )
-    except ClaudeUsageSnapshot.DoesNotExist:
-        latest_snapshot = None
-        days_until_reset = None
+    latest_snapshot = usage["snapshot"]
+    days_until_reset = (
+        (latest_snapshot.weekly_resets_at.date() - today).days
+        if latest_snapshot and latest_snapshot.weekly_resets_at else None
+    )
 
     return render(request, "claude_usage/overview.html", {
         "prediction": prediction,
@@ -71,7 +56,7 @@ def overview(request):
         "trailing_end_str": today.strftime("%b %d"),
         "week_day_labels_json": json.dumps(week_day_labels),
         "week_day_counts_json": json.dumps(week_day_counts),
-        "week_by_tool_json": json.dumps(week_by_tool),
+        "week_by_tool_json": json.dumps(usage["by_tool"]),
         "today_by_tool_json": json.dumps(today_by_tool),
         "today_count": today_count,
         "today_str": str(today),
@@ -84,57 +69,47 @@ def overview(request):
 def history(request):
     today = date.today()
     week_start_current = today - timedelta(days=today.weekday())
-    history_start = week_start_current - timedelta(weeks=7)
-
-    # Per-date tool call counts (max across model rows to avoid duplication)
-    rows = list(ClaudeDailyUsage.objects.filter(date__gte=history_start))
-    by_date_tools: dict[date, int] = {}
-    for r in rows:
-        by_date_tools[r.date] = max(by_date_tools.get(r.date, 0), r.tool_call_count)
+    try:
+        weeks = int(request.GET.get("weeks", HISTORY_WEEKS))
+    except ValueError:
+        weeks = HISTORY_WEEKS
+    weeks = max(1, min(weeks, MAX_HISTORY_WEEKS))
+    history_start = week_start_current - timedelta(weeks=weeks - 1)
 
-    # 8 week labels and totals
-    week_starts = [week_start_current - timedelta(weeks=i) for i in range(7, -1, -1)]
+    week_starts = [history_start + timedelta(weeks=i) for i in range(weeks)]
     week_labels = [ws.strftime("%b %d") for ws in week_starts]
-    week_totals = [
-        sum(by_date_tools.get(ws + timedelta(days=d), 0) for d in range(7))
-        for ws in week_starts
-    ]
+    week_totals = [0] * weeks
 
-    # Drill-down: build from DB (by_day from ClaudeDailyUsage, by_tool from ClaudeToolCount)
+    # Weekly totals and drill-down by_tool: one query against the pre-aggregated rollup
     drilldown: dict[int, dict] = {}
-
-    # by_day — one entry per date in the 8-week window
-    for d_date, count in by_date_tools.items():
-        for idx, ws in enumerate(week_starts):
-            if ws <= d_date <= ws + timedelta(days=6):
-                dd = drilldown.setdefault(idx, {"by_day": {}, "by_tool": {}})
-                dd["by_day"][str(d_date)] = count
-                break
-
-    # by_tool — from ClaudeToolCount
-    tool_rows = ClaudeToolCount.objects.filter(date__gte=history_start).values("date", "tool_name", "count")
-    for tc in tool_rows:
-        for idx, ws in enumerate(week_starts):
-            if ws <= tc["date"] <= ws + timedelta(days=6):
-                dd = drilldown.setdefault(idx, {"by_day": {}, "by_tool": {}})
-                dd["by_tool"][tc["tool_name"]] = dd["by_tool"].get(tc["tool_name"], 0) + tc["count"]
-                break
-
-    # Daily detail for calendar click: all-time per-day per-tool breakdown
-    all_tool_rows = ClaudeToolCount.objects.all().values("date", "tool_name", "count")
-    daily_tools: dict[str, dict] = {}
-    for tc in all_tool_rows:
-        ds = str(tc["date"])
-        if ds not in daily_tools:
-            daily_tools[ds] = {"count": 0, "by_tool": {}}
-        daily_tools[ds]["by_tool"][tc["tool_name"]] = tc["count"]
-        daily_tools[ds]["count"] += tc["count"]
-
-    # Calendar heatmap using tool_call_count across all history
-    all_rows = list(ClaudeDailyUsage.objects.all())
-    all_by_date: dict[date, int] = {}
-    for r in all_rows:
-        all_by_date[r.date] = max(all_by_date.get(r.date, 0), r.tool_call_count)
+    # Rollup weeks are bucketed from UTC timestamps; bound both ends so a row
+    # for the (local) week after week_start_current can't index past the chart.
+    rollup_rows = ClaudeWeeklyRollup.objects.filter(
+        week_start__gte=history_start, week_start__lte=week_start_current,
+    ).values(
+        "week_start", "tool_name", "count"
+    )
+    for r in rollup_rows:
+        idx = (r["week_start"] - history_start).days // 7
+        if r["tool_name"] == ClaudeWeeklyRollup.TOTAL:
+            week_totals[idx] = r["count"]
+        else:
+            dd = drilldown.setdefault(idx, {"by_day": {}, "by_tool": {}})
+            dd["by_tool"][r["tool_name"]] = r["count"]
+
+    # Calendar heatmap using tool_call_count across all history (max across model
+    # rows): one row per day. A clicked day's per-tool breakdown is loaded from
+    # history_day rather than shipping every ClaudeToolCount row with the page.
+    all_by_date: dict[date, int] = {
+        r["date"]: r["tools"]
+        for r in ClaudeDailyUsage.objects.values("date").annotate(tools=Max("tool_call_count"))
+    }
+
+    # Drill-down by_day reuses the heatmap's per-date counts
+    for d_date, count in all_by_date.items():
+        if d_date >= history_start:
+            dd = drilldown.setdefault((d_date - history_start).days // 7, {"by_day": {}, "by_tool": {}})
+            dd["by_day"][str(d_date)] = count
 
     max_tools = max(all_by_date.values(), default=1) or 1
     min_date = min(all_by_date.keys(), default=today)
@@ -178,14 +153,25 @@ def history(request):
             "week_starts": [str(ws) for ws in week_starts],
         }),
         "drilldown_json": json.dumps(drilldown),
-        "daily_tools_json": json.dumps(daily_tools),
         "heatmap_months": heatmap_months,
         "max_tools": max_tools,
         "today_str": str(today),
         "today_count": today_count,
+        "history_weeks": weeks,
     })
 
 
+@login_required
+def history_day(request, day):
+    """Per-tool call counts for one calendar day, fetched when the day is clicked."""
+    try:
+        day = date.fromisoformat(day)
+    except ValueError:
+        raise Http404("Invalid date")
+    by_tool = dict(ClaudeToolCount.objects.filter(date=day).values_list("tool_name", "count"))
+    return JsonResponse({"date": str(day), "count": sum(by_tool.values()), "by_tool": by_tool})
+
+
 @login_required
 def by_project(request):
     sessions = list(
@@ -1,3 +1,79 @@
+from datetime import date
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from config.models import HubConfig
+from config.utils import bulk_upsert
+from dashboard.models import EnergyDailyReading
+
+
+class BulkUpsertTests(TestCase):
+    def setUp(self):
+        # Migrations seed a few settings; start from an empty table
+        HubConfig.objects.all().delete()
+
+    def test_counts_created_and_updated(self):
+        HubConfig.objects.create(key="a", value="old")
+        HubConfig.objects.create(key="b", value="old")
+
+        created, updated = bulk_upsert(
+            HubConfig,
+            [{"key": "a", "value": "new"}, {"key": "c", "value": "new"}, {"key": "d", "value": "new"}],
+            ["key"], ["value"],
+        )
+
+        self.assertEqual((created, updated), (2, 1))
+        self.assertEqual(
+            dict(HubConfig.objects.values_list("key", "value")),
+            {"a": "new", "b": "old", "c": "new", "d": "new"},
+        )
+
+    def test_duplicate_keys_last_wins(self):
+        HubConfig.objects.create(key="a", value="old")
+
+        created, updated = bulk_upsert(
+            HubConfig,
+            [{"key": "a", "value": "1"}, {"key": "b", "value": "1"}, {"key": "a", "value": "2"}, {"key": "b", "value": "2"}],
+            ["key"], ["value"],
+        )
+
+        self.assertEqual((created, updated), (1, 1))
+        self.assertEqual(dict(HubConfig.objects.values_list("key", "value")), {"a": "2", "b": "2"})
+
+    def test_chunks_across_batch_size(self):
+        HubConfig.objects.bulk_create(HubConfig(key=f"k{i}", value="old") for i in range(0, 10, 2))
+        rows = [{"key": f"k{i}", "value": "new"} for i in range(10)]
+
+        bulk_create = HubConfig.objects.bulk_create
+        with mock.patch.object(HubConfig.objects, "bulk_create", wraps=bulk_create) as spy:
+            created, updated = bulk_upsert(HubConfig, rows, ["key"], ["value"], batch_size=3)
+
+        self.assertEqual([len(call.args[0]) for call in spy.call_args_list], [3, 3, 3, 1])
+
+        self.assertEqual((created, updated), (5, 5))
+        self.assertEqual(set(HubConfig.objects.values_list("value", flat=True)), {"new"})
+        self.assertEqual(HubConfig.objects.count(), 10)
+
+    def test_composite_key_normalises_values(self):
+        # Keys given as strings match existing rows stored as dates
+        EnergyDailyReading.objects.create(date=date(2025, 1, 1), name="Total", usage_kwh=1.0)
+
+        created, updated = bulk_upsert(
+            EnergyDailyReading,
+            [
+                {"date": "2025-01-01", "name": "Total", "usage_kwh": 2.0},
+                {"date": date(2025, 1, 1), "name": "Fridge", "usage_kwh": 0.5},
+                {"date": "2025-01-02", "name": "Total", "usage_kwh": 3.0},
+            ],
+            ["date", "name"], ["usage_kwh"],
+        )
+
+        self.assertEqual((created, updated), (2, 1))
+        self.assertEqual(
+            set(EnergyDailyReading.objects.values_list("date", "name", "usage_kwh")),
+            {(date(2025, 1, 1), "Total", 2.0), (date(2025, 1, 1), "Fridge", 0.5), (date(2025, 1, 2), "Total", 3.0)},
+        )
+
+    def test_empty_rows(self):
+        self.assertEqual(bulk_upsert(HubConfig, [], ["key"], ["value"]), (0, 0))
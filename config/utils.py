@@ -1,4 +1,5 @@
 import os
+from asgiref.sync import sync_to_async
 from config.models import HubConfig
 from dotenv import load_dotenv
 
@@ -20,3 +21,83 @@ def get_config(key: str, default=None):
         return config_obj.value
     except HubConfig.DoesNotExist:
         return default
+
+
+class Setting:
+    """
+    A config value read with get_config on first use instead of at import.
+
+        WEATHER_URL = Setting("WEATHER_URL")
+
+        http.get("weather", WEATHER_URL.get())
+        await async_http.get_json("weather", await WEATHER_URL.aget())
+
+    The value is read once per process, like the module-level constants this
+    replaces. A HubConfig lookup is an ORM query, which Django refuses to run
+    on the event loop, so async code uses aget(), which does the first read in
+    a worker thread. `cast` is applied to the value (e.g. int, float).
+    """
+    _UNSET = object()
+
+    def __init__(self, key: str, default=None, cast=None):
+        self.key = key
+        self.default = default
+        self.cast = cast
+        self._value = self._UNSET
+
+    def get(self):
+        if self._value is self._UNSET:
+            value = get_config(self.key, self.default)
+            self._value = self.cast(value) if self.cast is not None else value
+        return self._value
+
+    async def aget(self):
+        if self._value is self._UNSET:
+            return await sync_to_async(self.get)()
+        return self._value
+
+
+def bulk_upsert(model, rows, unique_fields, update_fields, batch_size=500):
+    """
+    Insert or update `rows` (dicts of field values) in chunks with
+    bulk_create(update_conflicts=True) instead of one update_or_create per row.
+
+    Rows sharing a key are collapsed, last one wins, matching what sequential
+    update_or_create calls would leave behind. Returns (created, updated);
+    existing keys are read with one SELECT per chunk to tell them apart.
+    """
+    from django.db import transaction
+
+    key_fields = [model._meta.get_field(f) for f in unique_fields]
+
+    def key_of(values):
+        return tuple(f.to_python(v) for f, v in zip(key_fields, values))
+
+    deduped = {}
+    for row in rows:
+        deduped[key_of(row[f] for f in unique_fields)] = row
+    pending = list(deduped.items())
+
+    created = updated = 0
+    with transaction.atomic():
+        for i in range(0, len(pending), batch_size):
+            chunk = pending[i:i + batch_size]
+            lookup = {
+                f"{f}__in": {key[n] for key, _ in chunk}
+                for n, f in enumerate(unique_fields)
+            }
+            existing = {
+                key_of(values)
+                for values in model.objects.filter(**lookup).values_list(*unique_fields)
+            }
+            model.objects.bulk_create(
+                [model(**row) for _, row in chunk],
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=update_fields,
+            )
+            n_existing = sum(1 for key, _ in chunk if key in existing)
+            updated += n_existing
+            created += len(chunk) - n_existing
+
+    return created, updated
@@ -1,3 +1,31 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import CollectorSnapshot, EnergyDailyReading, K8sUsageHourly, NetworkDailyRollup
+
+
+@admin.register(CollectorSnapshot)
+class CollectorSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("key", "fetched_at", "duration_ms")
+    search_fields = ("key",)
+    readonly_fields = ("key", "data", "fetched_at", "duration_ms")
+
+
+@admin.register(NetworkDailyRollup)
+class NetworkDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ("date", "samples", "avg_latency", "p95_latency", "avg_download", "avg_upload", "uptime_ratio")
+    date_hierarchy = "date"
+
+
+@admin.register(EnergyDailyReading)
+class EnergyDailyReadingAdmin(admin.ModelAdmin):
+    list_display = ("date", "name", "usage_kwh", "percentage", "produced_kwh")
+    list_filter = ("name",)
+    date_hierarchy = "date"
+
+
+@admin.register(K8sUsageHourly)
+class K8sUsageHourlyAdmin(admin.ModelAdmin):
+    list_display = ("hour", "scope", "name", "samples", "cpu_avg", "cpu_max", "mem_avg", "mem_max")
+    list_filter = ("scope",)
+    search_fields = ("name",)
+    date_hierarchy = "hour"
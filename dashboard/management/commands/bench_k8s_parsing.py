@@ -0,0 +1,77 @@
+"""
+Management command: bench_k8s_parsing
+
+Micro-benchmark for the k8s quantity parser. Times parse_quantity with and
+without its cache against kubernetes.utils.parse_quantity, then a full
+ClusterSnapshot.pod_details() pass over a synthetic cluster (no API calls),
+so the cost of a pod-detail refresh can be checked on a laptop:
+
+    uv run python manage.py bench_k8s_parsing --pods 500
+"""
+import timeit
+
+from django.core.management.base import BaseCommand
+from kubernetes import client
+from kubernetes.utils import parse_quantity as reference_parse_quantity
+
+from dashboard.services.k8s import ClusterSnapshot, parse_quantity
+
+# Request/limit/usage strings as they typically repeat across a cluster
+_SAMPLES = ["100m", "250m", "500m", "1", "2", "128Mi", "256Mi", "512Mi", "1Gi", "2Gi", "3456789n", "98765Ki"]
+
+
+def _synthetic_cluster(pods: int, containers: int):
+    items, usage = [], []
+    for i in range(pods):
+        names = [f"c{j}" for j in range(containers)]
+        items.append(client.V1Pod(
+            metadata=client.V1ObjectMeta(namespace=f"ns{i % 20}", name=f"pod-{i}"),
+            spec=client.V1PodSpec(node_name=f"node{i % 4}", containers=[
+                client.V1Container(name=name, resources=client.V1ResourceRequirements(
+                    requests={"cpu": _SAMPLES[(i + j) % 4], "memory": _SAMPLES[5 + (i + j) % 4]},
+                    limits={"cpu": _SAMPLES[3 + (i + j) % 2], "memory": _SAMPLES[8 + (i + j) % 2]},
+                ))
+                for j, name in enumerate(names)
+            ]),
+            status=client.V1PodStatus(phase="Running", container_statuses=[]),
+        ))
+        usage.append({
+            "metadata": {"namespace": f"ns{i % 20}", "name": f"pod-{i}"},
+            "containers": [
+                {"name": name, "usage": {"cpu": f"{1000 + i}n", "memory": f"{2048 + i}Ki"}}
+                for name in names
+            ],
+        })
+    return ClusterSnapshot(pods=items, nodes=[], node_usage=None, pod_usage=usage)
+
+
+class Command(BaseCommand):
+    help = "Benchmark k8s resource-quantity parsing and pod-detail refresh"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pods", type=int, default=500, help="Pods in the synthetic cluster (default: 500)")
+        parser.add_argument("--containers", type=int, default=2, help="Containers per pod (default: 2)")
+        parser.add_argument("--repeat", type=int, default=20, help="Pod-detail passes to time (default: 20)")
+
+    def handle(self, *args, **options):
+        calls = 200_000
+        for label, fn in [
+            ("parse_quantity (cached)", parse_quantity),
+            ("parse_quantity (uncached)", parse_quantity.__wrapped__),
+            ("kubernetes.utils.parse_quantity", reference_parse_quantity),
+        ]:
+            seconds = timeit.timeit(lambda: [fn(s) for s in _SAMPLES], number=calls // len(_SAMPLES))
+            self.stdout.write(f"{label:34} {seconds / calls * 1e9:8.0f} ns/call")
+
+        snapshot = _synthetic_cluster(options["pods"], options["containers"])
+        repeat = options["repeat"]
+
+        def cold():
+            parse_quantity.cache_clear()
+            snapshot.pod_details()
+
+        for label, fn in [("pod_details (cold cache)", cold), ("pod_details (warm cache)", snapshot.pod_details)]:
+            seconds = timeit.timeit(fn, number=repeat)
+            self.stdout.write(f"{label:34} {seconds / repeat * 1e3:8.2f} ms/refresh ({options['pods']} pods)")
+        info = parse_quantity.cache_info()
+        self.stdout.write(f"cache: {info.currsize} entries, {info.hits} hits, {info.misses} misses")
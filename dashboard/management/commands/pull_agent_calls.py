@@ -1,10 +1,10 @@
 import logging
 import urllib3
-import requests
 from django.core.management.base import BaseCommand
 from django.utils.dateparse import parse_datetime
 from dashboard.models import AgentCall
 from config.utils import get_config
+from dashboard.services import http
 
 _log = logging.getLogger(__name__)
 
@@ -33,11 +33,11 @@ class Command(BaseCommand):
 
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         try:
-            resp = requests.get(
+            resp = http.get(
+                "money-tracker",
                 base_url,
                 headers={"Authorization": f"Bearer {token}"},
                 params=params,
-                timeout=30,
                 verify=False,
             )
             resp.raise_for_status()
@@ -0,0 +1,127 @@
+"""
+Management command: run_collectors
+
+Long-running process that refreshes every dashboard collector on its own
+schedule, writing each result to the cache and its CollectorSnapshot row. Card
+views then read snapshots instead of calling the upstream APIs, so upstream
+load is fixed by this schedule rather than by how many dashboards are open.
+
+Each interval is kept below the collector's cache TTL so web workers always
+find a fresh snapshot. Collectors run on a small thread pool; a collector is
+never started again while its previous run is still in flight.
+
+Deployed as its own Deployment (k8s/run-collectors-deployment.yaml). Pass
+--once to refresh everything a single time and exit.
+"""
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from dashboard.services.emporia import collect_emporia_daily_summary, collect_emporia_summary
+from dashboard.services.enphase import collect_enhase_summary
+from dashboard.services.k8s import collect_cluster_snapshot
+from dashboard.services.network import collect_network_summary
+from dashboard.services.splunk import splunk_collector_summary
+from dashboard.services.status_overview import collect_status_overview
+from dashboard.services.synology import collect_synology_summary
+from dashboard.services.weather import collect_weather_summary
+
+
+def _no_args():
+    return ()
+
+
+def _today():
+    # Same default the emporia daily card uses for its ?day= parameter
+    return (datetime.now().strftime('%Y-%m-%d'),)
+
+
+# (collector, interval seconds, argument factory). Order matters only for
+# --once: status_overview runs last so it sees the refreshed sub-collectors.
+SCHEDULE = [
+    (collect_cluster_snapshot, 10, _no_args),
+    (collect_synology_summary, 45, _no_args),
+    (collect_network_summary, 45, _no_args),
+    (collect_weather_summary, 240, _no_args),
+    (collect_emporia_summary, 240, _no_args),
+    (collect_enhase_summary, 240, _no_args),
+    (collect_emporia_daily_summary, 90, _today),
+    (splunk_collector_summary, 90, _no_args),
+    (collect_status_overview, 20, _no_args),
+]
+
+# How often the scheduler wakes up to look for due collectors
+_TICK_SECONDS = 1
+
+
+class Command(BaseCommand):
+    help = "Continuously refresh dashboard collectors into the cache and snapshot table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Refresh every collector once and exit",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of collectors that may run at the same time (default: 4)",
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        if options["once"]:
+            for collector, _, make_args in SCHEDULE:
+                self._run(collector, make_args())
+            return
+
+        stop = threading.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_: stop.set())
+
+        in_flight: set = set()
+        in_flight_lock = threading.Lock()
+        next_due = {collector: 0.0 for collector, _, _ in SCHEDULE}
+
+        def run_and_clear(collector, call_args):
+            try:
+                self._run(collector, call_args)
+            finally:
+                with in_flight_lock:
+                    in_flight.discard(collector)
+                close_old_connections()
+
+        self.stdout.write(f"Running {len(SCHEDULE)} collectors with {options['workers']} workers")
+        with ThreadPoolExecutor(max_workers=options["workers"], thread_name_prefix="collector") as pool:
+            while not stop.is_set():
+                now = time.monotonic()
+                for collector, interval, make_args in SCHEDULE:
+                    if now < next_due[collector]:
+                        continue
+                    with in_flight_lock:
+                        if collector in in_flight:
+                            continue
+                        in_flight.add(collector)
+                    next_due[collector] = now + interval
+                    pool.submit(run_and_clear, collector, make_args())
+                stop.wait(_TICK_SECONDS)
+
+        self.stdout.write("Stopped")
+
+    def _run(self, collector, call_args):
+        name = collector.__name__
+        started = time.monotonic()
+        try:
+            collector.refresh(*call_args)
+        except Exception as ex:
+            self.stderr.write(f"{name} failed after {time.monotonic() - started:.1f}s: {ex}")
+            return
+        if self.verbosity >= 2:
+            self.stdout.write(f"{name} refreshed in {time.monotonic() - started:.1f}s")
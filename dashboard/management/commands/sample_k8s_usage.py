@@ -0,0 +1,26 @@
+"""
+Management command: sample_k8s_usage
+
+Stores one metrics-server reading per node and per namespace in
+K8sUsageSample, folds the current and previous hour into K8sUsageHourly and
+prunes raw samples past their retention. The k8s page's trend charts and
+capacity forecasts read the hourly table. Runs every minute from
+k8s/sample-k8s-usage-cronjob.yaml.
+"""
+from django.core.management.base import BaseCommand
+from kubernetes.client.exceptions import ApiException
+from urllib3.exceptions import HTTPError
+
+from dashboard.services.k8s_history import sample_usage
+
+
+class Command(BaseCommand):
+    help = "Sample Kubernetes node and namespace usage into K8sUsageSample/K8sUsageHourly"
+
+    def handle(self, *args, **options):
+        try:
+            samples, hourly, pruned = sample_usage()
+        except (ApiException, HTTPError) as exc:
+            self.stderr.write(f"sample_k8s_usage: Kubernetes API request failed: {exc}")
+            return
+        self.stdout.write(f"sample_k8s_usage: {samples} sample(s), {hourly} hourly row(s) updated, {pruned} pruned")
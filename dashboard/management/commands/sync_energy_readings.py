@@ -0,0 +1,33 @@
+"""
+Management command: sync_energy_readings
+
+Stores each complete UTC day of Emporia circuit usage and Enphase production
+in EnergyDailyReading for every day of the last --days days that isn't stored
+yet. Finished days never change, so each run fetches only the days added since
+the last one, plus any day upstream was missing before. Runs hourly from
+k8s/sync-energy-readings-cronjob.yaml.
+"""
+import requests
+from django.core.management.base import BaseCommand
+
+from dashboard.services.emporia import sync_energy_readings
+
+
+class Command(BaseCommand):
+    help = "Store complete days of Emporia usage and Enphase production in EnergyDailyReading"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Days back to fill in missing readings for (default: 365)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            emporia_rows, enphase_rows = sync_energy_readings(backfill_days=options["days"])
+        except requests.RequestException as exc:
+            self.stderr.write(f"sync_energy_readings: request failed: {exc}")
+            return
+        self.stdout.write(f"sync_energy_readings: {emporia_rows} Emporia and {enphase_rows} Enphase reading(s) stored")
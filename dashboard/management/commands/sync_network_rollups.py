@@ -0,0 +1,32 @@
+"""
+Management command: sync_network_rollups
+
+Aggregates each complete UTC day of network collector samples into
+NetworkDailyRollup, starting the day after the newest stored row. Days are
+immutable once rolled up, so each run pages only through the records added
+since the last one. Runs hourly from k8s/sync-network-rollups-cronjob.yaml.
+"""
+import requests
+from django.core.management.base import BaseCommand
+
+from dashboard.services.network import sync_daily_rollups
+
+
+class Command(BaseCommand):
+    help = "Roll up complete days of network collector samples into NetworkDailyRollup"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=90,
+            help="Days to backfill when the table is empty (default: 90)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            written = sync_daily_rollups(backfill_days=options["days"])
+        except requests.RequestException as exc:
+            self.stderr.write(f"sync_network_rollups: request failed: {exc}")
+            return
+        self.stdout.write(f"sync_network_rollups: {written} day(s) rolled up")
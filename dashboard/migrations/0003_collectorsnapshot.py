@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:57
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_agentcall_source_agentcall_source_id_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectorSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('fetched_at', models.DateTimeField()),
+                ('duration_ms', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['key'],
+            },
+        ),
+    ]
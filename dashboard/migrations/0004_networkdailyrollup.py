@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_collectorsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NetworkDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('samples', models.IntegerField(default=0)),
+                ('avg_latency', models.FloatField(null=True)),
+                ('min_latency', models.FloatField(null=True)),
+                ('max_latency', models.FloatField(null=True)),
+                ('p95_latency', models.FloatField(null=True)),
+                ('avg_ping', models.FloatField(null=True)),
+                ('avg_download', models.FloatField(null=True)),
+                ('avg_upload', models.FloatField(null=True)),
+                ('uptime_ratio', models.FloatField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+    ]
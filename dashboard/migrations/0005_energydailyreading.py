@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_networkdailyrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnergyDailyReading',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('name', models.CharField(max_length=128)),
+                ('usage_kwh', models.FloatField(null=True)),
+                ('percentage', models.FloatField(null=True)),
+                ('produced_kwh', models.FloatField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['date', 'name'],
+                'unique_together': {('date', 'name')},
+            },
+        ),
+    ]
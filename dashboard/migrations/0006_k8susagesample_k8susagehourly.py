@@ -0,0 +1,52 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_energydailyreading'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='K8sUsageSample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField(db_index=True)),
+                ('scope', models.CharField(max_length=16)),
+                ('name', models.CharField(max_length=253)),
+                ('pods', models.IntegerField(default=0)),
+                ('cpu_cores', models.FloatField(null=True)),
+                ('mem_gib', models.FloatField(null=True)),
+                ('cpu_capacity', models.FloatField(null=True)),
+                ('mem_capacity', models.FloatField(null=True)),
+            ],
+            options={
+                'ordering': ['taken_at', 'scope', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='K8sUsageHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('scope', models.CharField(max_length=16)),
+                ('name', models.CharField(max_length=253)),
+                ('samples', models.IntegerField(default=0)),
+                ('pods', models.FloatField(null=True)),
+                ('cpu_avg', models.FloatField(null=True)),
+                ('cpu_max', models.FloatField(null=True)),
+                ('mem_avg', models.FloatField(null=True)),
+                ('mem_max', models.FloatField(null=True)),
+                ('cpu_capacity', models.FloatField(null=True)),
+                ('mem_capacity', models.FloatField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['hour', 'scope', 'name'],
+                'unique_together': {('hour', 'scope', 'name')},
+            },
+        ),
+    ]
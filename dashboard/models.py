@@ -1,4 +1,5 @@
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
 
 
 class AgentCall(models.Model):
@@ -23,3 +24,120 @@ class AgentCall(models.Model):
 
     def __str__(self):
         return f"AgentCall({self.created_at:%Y-%m-%d %H:%M}) {self.question[:40]!r}"
+
+
+class CollectorSnapshot(models.Model):
+    """
+    Latest result of a cached dashboard collector, written by run_collectors
+    (or by a web worker when it had to fetch live). Keyed by the collector's
+    cache key, so parameterised collectors get one row per argument set.
+    """
+    key = models.CharField(max_length=255, unique=True)
+    data = models.JSONField(encoder=DjangoJSONEncoder, null=True)
+    fetched_at = models.DateTimeField()
+    duration_ms = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["key"]
+
+    def __str__(self):
+        return f"{self.key} @ {self.fetched_at:%Y-%m-%d %H:%M:%S}"
+
+
+class NetworkDailyRollup(models.Model):
+    """
+    One complete UTC day of network collector samples, aggregated by
+    sync_network_rollups. Latencies are in ms with timeout sentinels excluded;
+    speeds are the collector's units. Metrics with no samples that day are null.
+    """
+    date = models.DateField(unique=True)
+    samples = models.IntegerField(default=0)
+    avg_latency = models.FloatField(null=True)
+    min_latency = models.FloatField(null=True)
+    max_latency = models.FloatField(null=True)
+    p95_latency = models.FloatField(null=True)
+    avg_ping = models.FloatField(null=True)
+    avg_download = models.FloatField(null=True)
+    avg_upload = models.FloatField(null=True)
+    uptime_ratio = models.FloatField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["date"]
+
+    def __str__(self):
+        return f"NetworkDailyRollup({self.date})"
+
+
+class EnergyDailyReading(models.Model):
+    """
+    One complete UTC day of energy data per Emporia circuit, stored by
+    sync_energy_readings. `usage_kwh`/`percentage` come from Emporia;
+    Enphase solar production is stored as `produced_kwh` on the whole-home
+    "Electricity Monitor" row. Either side is null until that source has
+    been synced for the day.
+    """
+    date = models.DateField()
+    name = models.CharField(max_length=128)
+    usage_kwh = models.FloatField(null=True)
+    percentage = models.FloatField(null=True)
+    produced_kwh = models.FloatField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [("date", "name")]
+        ordering = ["date", "name"]
+
+    def __str__(self):
+        return f"{self.date} {self.name}"
+
+
+class K8sUsageSample(models.Model):
+    """
+    One metrics-server reading, taken about once a minute by sample_k8s_usage.
+    `scope` is "node" (one row per node) or "namespace" (usage summed over the
+    namespace's pods). CPU is in cores and memory in GiB; allocatable capacity
+    is only set on node rows. Raw rows are pruned after a couple of days once
+    they are rolled up into K8sUsageHourly.
+    """
+    taken_at = models.DateTimeField(db_index=True)
+    scope = models.CharField(max_length=16)
+    name = models.CharField(max_length=253)
+    pods = models.IntegerField(default=0)
+    cpu_cores = models.FloatField(null=True)
+    mem_gib = models.FloatField(null=True)
+    cpu_capacity = models.FloatField(null=True)
+    mem_capacity = models.FloatField(null=True)
+
+    class Meta:
+        ordering = ["taken_at", "scope", "name"]
+
+    def __str__(self):
+        return f"{self.taken_at:%Y-%m-%d %H:%M} {self.scope}/{self.name}"
+
+
+class K8sUsageHourly(models.Model):
+    """
+    One UTC hour of K8sUsageSample rows for a node or namespace: average and
+    peak usage plus the average capacity, rewritten by each sampler run while
+    the hour is still open. These are what the k8s page charts and forecasts.
+    """
+    hour = models.DateTimeField()
+    scope = models.CharField(max_length=16)
+    name = models.CharField(max_length=253)
+    samples = models.IntegerField(default=0)
+    pods = models.FloatField(null=True)
+    cpu_avg = models.FloatField(null=True)
+    cpu_max = models.FloatField(null=True)
+    mem_avg = models.FloatField(null=True)
+    mem_max = models.FloatField(null=True)
+    cpu_capacity = models.FloatField(null=True)
+    mem_capacity = models.FloatField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [("hour", "scope", "name")]
+        ordering = ["hour", "scope", "name"]
+
+    def __str__(self):
+        return f"{self.hour:%Y-%m-%d %H}:00 {self.scope}/{self.name}"
@@ -0,0 +1,138 @@
+"""
+Streaming group-by aggregation for collector samples.
+
+    agg = aggregate.GroupAggregator(
+        key_of=lambda r: r["create_date"][:10],
+        metrics={"latency": lambda r: r.get("tcp_latency")},
+        quantiles=("latency",),
+    )
+    agg.consume(rows)                       # any iterable, e.g. a page generator
+    agg.groups["2025-06-01"]["latency"].quantile(0.95)
+
+Rows are folded into one fixed-size Stats per (group, metric) as they arrive,
+so memory grows with the number of groups (days, categories), not with the
+number of samples, and rows can come straight from a paginated generator.
+"""
+import math
+
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch: every value lands in a bucket whose bounds
+    are within `relative_accuracy` of each other, so quantile() is off by at
+    most that fraction. Holds at most `max_bins` buckets; past that the two
+    lowest are merged, which only loses accuracy at the bottom of the range.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 256):
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._max_bins = max_bins
+        self._bins: dict[int, int] = {}
+        self._non_positive = 0
+        self.count = 0
+
+    def add(self, value: float):
+        self.count += 1
+        if value <= 0:
+            self._non_positive += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self._bins[index] = self._bins.get(index, 0) + 1
+        if len(self._bins) > self._max_bins:
+            lowest = min(self._bins)
+            merged = self._bins.pop(lowest)
+            self._bins[min(self._bins)] += merged
+
+    def quantile(self, q: float) -> float | None:
+        """Approximate q-quantile (0 <= q <= 1) by nearest rank; None if empty."""
+        if not self.count:
+            return None
+        rank = max(0, math.ceil(q * self.count) - 1)
+        seen = self._non_positive
+        if rank < seen:
+            return 0.0
+        for index in sorted(self._bins):
+            seen += self._bins[index]
+            if seen > rank:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i] in relative terms
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return None
+
+
+class Stats:
+    """Count, sum, min and max of a stream of numbers, plus an optional QuantileSketch."""
+
+    __slots__ = ("count", "total", "min", "max", "sketch")
+
+    def __init__(self, quantiles: bool = False):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.sketch = QuantileSketch() if quantiles else None
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.sketch is not None:
+            self.sketch.add(value)
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        if self.sketch is None:
+            raise ValueError("Stats was created without quantiles=True")
+        return self.sketch.quantile(q)
+
+
+class GroupAggregator:
+    """
+    Fold rows into per-group Stats for each metric.
+
+    `key_of(row)` names the row's group; rows whose key is falsy are skipped.
+    `metrics` maps a metric name to a function returning the row's value, or
+    None to leave that metric out for the row. Metrics named in `quantiles`
+    also keep a QuantileSketch. `rows[key]` counts every row in the group,
+    including rows with no metric values.
+    """
+
+    def __init__(self, key_of, metrics: dict, quantiles=()):
+        self._key_of = key_of
+        self._metrics = metrics
+        self._quantiles = set(quantiles)
+        self.groups: dict[str, dict[str, Stats]] = {}
+        self.rows: dict[str, int] = {}
+
+    def add(self, row):
+        key = self._key_of(row)
+        if not key:
+            return
+        stats = self.groups.get(key)
+        if stats is None:
+            stats = self.groups[key] = {name: Stats(name in self._quantiles) for name in self._metrics}
+            self.rows[key] = 0
+        self.rows[key] += 1
+        for name, value_of in self._metrics.items():
+            value = value_of(row)
+            if value is not None:
+                stats[name].add(value)
+
+    def consume(self, rows) -> "GroupAggregator":
+        for row in rows:
+            self.add(row)
+        return self
+
+
+def day_in(start_date: str, end_date: str, day_of):
+    """A key_of for GroupAggregator: the row's YYYY-MM-DD day if start_date <= day < end_date, else None."""
+    def key_of(row):
+        day = day_of(row)
+        return day if day and start_date <= day < end_date else None
+    return key_of
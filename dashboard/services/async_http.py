@@ -0,0 +1,84 @@
+"""
+Shared httpx.AsyncClient for the async card views.
+
+One pooled client per event loop (under uvicorn that is one per worker), so
+card loads reuse keep-alive connections to each upstream instead of opening a
+new one per call. HTTP/2 is negotiated for https upstreams when `h2` is
+installed; plain-http services stay on HTTP/1.1.
+
+Every call names its upstream so it gets that service's connect/read timeouts,
+which are shared with the sync sessions in services.http.
+"""
+import asyncio
+import time
+import weakref
+
+import httpx
+
+from dashboard.services.http import record_duration, upstream_config
+
+try:
+    import h2  # noqa: F401  (only needed for httpx's http2 support)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# What callers should catch: transport/status errors, a missing or malformed
+# URL (unset config), and an undecodable body.
+HTTP_ERRORS = (httpx.HTTPError, httpx.InvalidURL, ValueError)
+
+_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_client() -> httpx.AsyncClient:
+    """The pooled client for the running event loop, created on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=_HTTP2,
+            limits=_LIMITS,
+            timeout=timeout_for(None),
+            follow_redirects=True,
+        )
+        _clients[loop] = client
+    return client
+
+
+def timeout_for(service: str | None) -> httpx.Timeout:
+    config = upstream_config(service)
+    return httpx.Timeout(config.read_timeout, connect=config.connect_timeout)
+
+
+async def get_json(service: str, url: str, **kwargs):
+    """GET `url` and return the decoded JSON body. Raises one of HTTP_ERRORS on failure."""
+    _check_url(url)
+    response = await _request(service, "GET", url, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+
+async def post_json(service: str, url: str, **kwargs):
+    """POST to `url` and return the decoded JSON body. Raises one of HTTP_ERRORS on failure."""
+    _check_url(url)
+    response = await _request(service, "POST", url, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+
+async def _request(service: str, method: str, url: str, **kwargs) -> httpx.Response:
+    started = time.monotonic()
+    status = "error"
+    try:
+        response = await get_client().request(method, url, timeout=timeout_for(service), **kwargs)
+        status = str(response.status_code)
+        return response
+    finally:
+        record_duration(service, method, status, (time.monotonic() - started) * 1000)
+
+
+def _check_url(url):
+    if not url:
+        raise httpx.InvalidURL("No URL configured")
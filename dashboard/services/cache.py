@@ -0,0 +1,273 @@
+"""
+TTL cache for the dashboard collectors.
+
+    @cached_collector(ttl=60)
+    def collect_weather_summary():
+        ...
+
+Calling the collector returns the cached value while it is younger than `ttl`.
+Once it is older, the stale value is still returned immediately and a single
+background thread refreshes it; after `stale_ttl` the entry is dropped and the
+next caller fetches synchronously. Fetches for the same key are single-flight:
+concurrent callers wait for the one in progress instead of hitting the upstream
+again. `collector.with_age(...)` returns a CachedResult so cards can show how
+old the data is.
+
+Async card views use `await collector.awith_age(...)`. A collector declared with
+`afetch=` (an async twin of the function, built on services.async_http) is
+fetched on the event loop; any other collector is run in a worker thread.
+
+Entries live in the Django cache (the shared database cache, see
+settings.CACHES); the single-flight locks are per process. Every live fetch is
+also written to a CollectorSnapshot row, and a cache miss reads that row before
+going upstream. While `manage.py run_collectors` keeps entries younger than
+`ttl`, web workers serve them without calling the upstream APIs; if the daemon
+is down or falls behind, they fetch live themselves. A snapshot that fails to
+save is logged and the fetched value is still returned.
+"""
+import asyncio
+import functools
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import DatabaseError, close_old_connections
+
+from dashboard.models import CollectorSnapshot
+
+_log = logging.getLogger(__name__)
+
+_KEY_PREFIX = "dashboard:collector:"
+
+# Upper bound on how long a background refresh may hold the refresh flag,
+# so a crashed worker can't block refreshes for the whole stale window.
+_REFRESH_FLAG_TTL = 120
+
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+# In-flight async fetches per event loop: {loop: {key: Task}}
+_tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Task]]" = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class CachedResult:
+    value: Any
+    fetched_at: float  # epoch seconds
+    stale: bool
+
+    @property
+    def age_seconds(self) -> int:
+        return max(0, int(time.time() - self.fetched_at))
+
+    @property
+    def fetched_at_dt(self) -> datetime:
+        return datetime.fromtimestamp(self.fetched_at, tz=timezone.utc)
+
+    @property
+    def age_label(self) -> str:
+        age = self.age_seconds
+        if age < 5:
+            return "just now"
+        if age < 60:
+            return f"{age}s ago"
+        if age < 3600:
+            return f"{age // 60}m ago"
+        return f"{age // 3600}h ago"
+
+
+def oldest(*results: CachedResult) -> CachedResult:
+    """The least recently fetched of several results, for cards built from more than one collector."""
+    return min(results, key=lambda r: r.fetched_at)
+
+
+def cached_collector(ttl: int, stale_ttl: int | None = None, afetch=None):
+    """
+    Cache a collector's return value for `ttl` seconds, serving it stale for up
+    to `stale_ttl` seconds (default 10 × ttl) while it is refreshed in the
+    background. Positional and keyword arguments are part of the cache key.
+    `afetch` is an optional coroutine function with the same signature, used by
+    awith_age instead of running the sync function in a thread.
+    """
+    if stale_ttl is None:
+        stale_ttl = ttl * 10
+
+    def decorator(fn):
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        def key_for(args, kwargs) -> str:
+            parts = [repr(a) for a in args] + [f"{k}={v!r}" for k, v in sorted(kwargs.items())]
+            return f"{_KEY_PREFIX}{name}({','.join(parts)})"
+
+        def fetch(key, args, kwargs) -> CachedResult:
+            snapshot = _load_snapshot(key, ttl)
+            if snapshot is not None:
+                value, fetched_at = snapshot
+                cache.set(key, (value, fetched_at), stale_ttl)
+                return CachedResult(value, fetched_at, stale=False)
+            return refresh(*args, **kwargs)
+
+        def refresh_in_background(key, lock, args, kwargs):
+            flag = f"{key}:refreshing"
+            if not cache.add(flag, True, _REFRESH_FLAG_TTL):
+                lock.release()
+                return
+
+            def run():
+                try:
+                    fetch(key, args, kwargs)
+                except Exception as ex:
+                    _log.warning("Background refresh of %s failed: %s", name, ex)
+                finally:
+                    cache.delete(flag)
+                    lock.release()
+                    close_old_connections()
+
+            threading.Thread(target=run, name=f"refresh:{name}", daemon=True).start()
+
+        @functools.wraps(fn)
+        def with_age(*args, **kwargs) -> CachedResult:
+            key = key_for(args, kwargs)
+            entry = cache.get(key)
+            lock = _lock_for(key)
+
+            if entry is not None:
+                value, fetched_at = entry
+                if time.time() - fetched_at < ttl:
+                    return CachedResult(value, fetched_at, stale=False)
+                # Stale: whoever takes the lock starts the refresh (and the
+                # thread releases it); everyone else just serves the stale value.
+                if lock.acquire(blocking=False):
+                    refresh_in_background(key, lock, args, kwargs)
+                return CachedResult(value, fetched_at, stale=True)
+
+            with lock:
+                # Another caller may have filled the entry while we waited.
+                entry = cache.get(key)
+                if entry is not None:
+                    value, fetched_at = entry
+                    return CachedResult(value, fetched_at, stale=time.time() - fetched_at >= ttl)
+                return fetch(key, args, kwargs)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return with_age(*args, **kwargs).value
+
+        def refresh(*args, **kwargs) -> CachedResult:
+            """Fetch from the upstream now, ignoring the cache and snapshot, and store the result."""
+            key = key_for(args, kwargs)
+            started = time.monotonic()
+            value = fn(*args, **kwargs)
+            fetched_at = time.time()
+            cache.set(key, (value, fetched_at), stale_ttl)
+            _save_snapshot(key, value, fetched_at, int((time.monotonic() - started) * 1000))
+            return CachedResult(value, fetched_at, stale=False)
+
+        async def afill(key, args, kwargs) -> CachedResult:
+            snapshot = await sync_to_async(_load_snapshot)(key, ttl)
+            if snapshot is not None:
+                value, fetched_at = snapshot
+                await cache.aset(key, (value, fetched_at), stale_ttl)
+                return CachedResult(value, fetched_at, stale=False)
+            started = time.monotonic()
+            value = await afetch(*args, **kwargs)
+            fetched_at = time.time()
+            await cache.aset(key, (value, fetched_at), stale_ttl)
+            await sync_to_async(_save_snapshot)(key, value, fetched_at, int((time.monotonic() - started) * 1000))
+            return CachedResult(value, fetched_at, stale=False)
+
+        async def arefresh(key, args, kwargs):
+            flag = f"{key}:refreshing"
+            if not await cache.aadd(flag, True, _REFRESH_FLAG_TTL):
+                return
+            try:
+                await afill(key, args, kwargs)
+            except Exception as ex:
+                _log.warning("Background refresh of %s failed: %s", name, ex)
+            finally:
+                await cache.adelete(flag)
+
+        async def awith_age(*args, **kwargs) -> CachedResult:
+            if afetch is None:
+                return await sync_to_async(_with_age_in_thread, thread_sensitive=False)(args, kwargs)
+
+            key = key_for(args, kwargs)
+            entry = await cache.aget(key)
+            if entry is not None:
+                value, fetched_at = entry
+                if time.time() - fetched_at < ttl:
+                    return CachedResult(value, fetched_at, stale=False)
+                _single_flight(key, lambda: arefresh(key, args, kwargs))
+                return CachedResult(value, fetched_at, stale=True)
+            # shield: a cancelled request mustn't cancel the fetch other callers await.
+            return await asyncio.shield(_single_flight(key, lambda: afill(key, args, kwargs)))
+
+        def _with_age_in_thread(args, kwargs) -> CachedResult:
+            try:
+                return with_age(*args, **kwargs)
+            finally:
+                close_old_connections()
+
+        def invalidate(*args, **kwargs):
+            cache.delete(key_for(args, kwargs))
+
+        wrapper.with_age = with_age
+        wrapper.awith_age = awith_age
+        wrapper.refresh = refresh
+        wrapper.invalidate = invalidate
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorator
+
+
+def _lock_for(key: str) -> threading.Lock:
+    with _locks_guard:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = threading.Lock()
+        return lock
+
+
+def _single_flight(key: str, start) -> asyncio.Task:
+    """The running task for `key` on this loop, or a new one from `start()`."""
+    tasks = _tasks.setdefault(asyncio.get_running_loop(), {})
+    task = tasks.get(key)
+    if task is None or task.done():
+        task = tasks[key] = asyncio.ensure_future(start())
+        task.add_done_callback(lambda t: tasks.pop(key, None) if tasks.get(key) is t else None)
+    return task
+
+
+def _load_snapshot(key: str, max_age: int) -> tuple[Any, float] | None:
+    """(value, fetched_at) from the snapshot table if it is younger than `max_age` seconds."""
+    row = CollectorSnapshot.objects.filter(key=key).values_list("data", "fetched_at").first()
+    if row is None:
+        return None
+    data, fetched_at = row
+    fetched_at = fetched_at.timestamp()
+    if time.time() - fetched_at >= max_age:
+        return None
+    return data, fetched_at
+
+
+def _save_snapshot(key: str, value: Any, fetched_at: float, duration_ms: int):
+    # Best effort: the value is already cached, so a failed write only means
+    # the next cold cache fetches live instead of reading the snapshot.
+    try:
+        CollectorSnapshot.objects.update_or_create(
+            key=key,
+            defaults={
+                "data": value,
+                "fetched_at": datetime.fromtimestamp(fetched_at, tz=timezone.utc),
+                "duration_ms": duration_ms,
+            },
+        )
+    except (DatabaseError, TypeError) as ex:
+        _log.warning("Could not save snapshot %s: %s", key, ex)
@@ -6,7 +6,7 @@ from openai import OpenAI
 from django.db import connection
 from config.utils import get_config
 from dashboard.services.status_overview import collect_status_overview
-from dashboard.services.k8s import collect_k8s_metrics_detailed
+from dashboard.services import k8s
 from dashboard.services.backup_status import collect_backup_status_summary
 
 _log = logging.getLogger("dashboard.chatbot")
@@ -15,7 +15,6 @@ _BASE_URL = "https://api.groq.com/openai/v1"
 _MODEL = "llama-3.3-70b-versatile"
 _MAX_TOOL_ROUNDS = 8
 _SQL_ROW_LIMIT = 100
-_DONE_PHASES = {"Succeeded", "Completed"}
 
 _FORBIDDEN_SQL = re.compile(
     r"\b(insert|update|delete|drop|alter|truncate|grant|revoke|create|comment|copy|"
@@ -72,26 +71,13 @@ def _tool_system_status(args):
     return collect_status_overview()
 
 
-def _slim_pod(p):
-    return {
-        "namespace": p.get("namespace"),
-        "name": p.get("name"),
-        "status": p.get("status"),
-        "restarts": p.get("restarts"),
-    }
-
-
 def _tool_k8s_overview(args):
-    d = collect_k8s_metrics_detailed()
-    pods = d.get("pod_details") or []
-    problems = [
-        p for p in pods
-        if (p.get("status") not in ("Running",) and p.get("status") not in _DONE_PHASES)
-        or (p.get("restarts") or 0) > 0
-    ]
+    d = k8s.collect_k8s_metrics_detailed()
+    pods_status, total_pods = k8s.pod_counts()
+    problems = k8s.problem_pods()
     return {
-        "pods_status": d.get("pods_status"),
-        "total_pods": d.get("total_pods"),
+        "pods_status": pods_status,
+        "total_pods": total_pods,
         "cluster_cpu_percent": d.get("cluster_cpu_percent"),
         "cluster_mem_percent": d.get("cluster_mem_percent"),
         "cluster_alerts": d.get("cluster_alerts"),
@@ -99,23 +85,13 @@ def _tool_k8s_overview(args):
                    "cpu_percent": n.get("cpu_percent"), "mem_percent": n.get("mem_percent")}
                   for n in (d.get("nodes_info") or [])],
         "problem_pod_count": len(problems),
-        "problem_pods": [_slim_pod(p) for p in problems[:20]],
+        "problem_pods": problems[:20],
     }
 
 
 def _tool_find_pods(args):
     a = args or {}
-    needle = (a.get("name_contains") or "").lower()
-    ns = (a.get("namespace") or "").lower()
-    d = collect_k8s_metrics_detailed()
-    pods = d.get("pod_details") or []
-    matched = []
-    for p in pods:
-        if needle and needle not in (p.get("name") or "").lower():
-            continue
-        if ns and ns != (p.get("namespace") or "").lower():
-            continue
-        matched.append(_slim_pod(p))
+    matched = k8s.find_pods(a.get("name_contains") or "", (a.get("namespace") or "").lower())
     return {"count": len(matched), "pods": matched[:60]}
 
 
@@ -1,23 +1,21 @@
-import requests
+import logging
 from asgiref.sync import sync_to_async
-from config.utils import get_config
+from config.utils import Setting
+from dashboard.services import http
 
-DARTS_URL = get_config("DARTS_URL")
+_log = logging.getLogger(__name__)
+
+DARTS_URL = Setting("DARTS_URL")
 
 
-# For now, exception handler will be here and only printing
 def _handle_exception(ex):
-        print('---------------------------------------')
-        print('Exception:')
-        print('---------------------------------------')
-        print(ex)
-        print('---------------------------------------')
+    _log.error("Darts API error: %s", ex)
 
 
 def _get_darts_scores(game: str) -> list:
     avg_scores = 0
     try:
-        response = requests.get(DARTS_URL)
+        response = http.get("darts", DARTS_URL.get())
         data = response.json()
 
         # Filter for the game
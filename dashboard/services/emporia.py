@@ -1,56 +1,260 @@
+import logging
+import asyncio
 import requests
-from datetime import datetime, timedelta, timezone
-from config.utils import get_config
+from asgiref.sync import sync_to_async
+from datetime import date, datetime, timedelta, timezone
+from config.utils import Setting, bulk_upsert
+from dashboard.models import EnergyDailyReading
+from dashboard.services import aggregate
+from dashboard.services import http
+from dashboard.services import async_http
+from dashboard.services import log
+from dashboard.services.cache import cached_collector
 
-EMPORIA_API_SEARCH_URL = get_config("EMPORIA_API_SEARCH_URL")
-ENPHASE_API_SEARCH_URL = get_config("ENPHASE_API_SEARCH_URL")
-COST_PER_KWH = float(get_config("COST_PER_KWH"))
+_log = logging.getLogger(__name__)
 
+EMPORIA_API_SEARCH_URL = Setting("EMPORIA_API_SEARCH_URL")
+ENPHASE_API_SEARCH_URL = Setting("ENPHASE_API_SEARCH_URL")
+COST_PER_KWH = Setting("COST_PER_KWH", cast=float)
 
-def _get_metrics():
-    # Calculate start date as 7 days ago
-    start_date = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%d")
-
-    # --- Get Enphase produced metrics ---
-    enphase_data = {}
-    try:
-        params = {"start_date": start_date}
-        print(f"[DEBUG] Enphase GET call: {ENPHASE_API_SEARCH_URL}")
-        print(f"[DEBUG] Enphase params: {params}")
-        response = requests.get(ENPHASE_API_SEARCH_URL, params=params)
-        print(f"[DEBUG] Enphase response status: {response.status_code}")
-        response.raise_for_status()
-        for item in response.json():
+# Emporia's whole-home circuit; the other names are its sub-circuits
+TOTAL_NAME = "Electricity Monitor"
+
+# Days stored by the first sync_energy_readings run, when the table is empty
+_BACKFILL_DAYS = 365
+
+
+# --- Upstream calls -----------------------------------------------------------
+# Every query below covers whole UTC days: start <= day < end (datetime.date).
+
+def _instant(day):
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def _emporia_payload(start, end, name=None):
+    payload = {"start_date": _instant(start), "end_date": _instant(end)}
+    if name:
+        payload["name"] = name
+    return payload
+
+
+def _enphase_params(start, end):
+    # Enphase's end_date is inclusive
+    return {"start_date": start.isoformat(), "end_date": (end - timedelta(days=1)).isoformat()}
+
+
+def _fetch_emporia(start, end, name=None):
+    payload = _emporia_payload(start, end, name)
+    response = http.post("emporia", EMPORIA_API_SEARCH_URL.get(), json=payload)
+    response.raise_for_status()
+    items = _within(response.json(), start, end, _emporia_day)
+    _log.debug("Emporia search %s..%s: %d items", start, end, len(items),
+               extra=log.span({"emporia.live_from": start.isoformat(), "emporia.items": len(items)}))
+    return items
+
+
+def _fetch_enphase(start, end):
+    params = _enphase_params(start, end)
+    response = http.get("enphase", ENPHASE_API_SEARCH_URL.get(), params=params)
+    response.raise_for_status()
+    items = _within(response.json(), start, end, _enphase_day)
+    _log.debug("Enphase search %s..%s: %d items", start, end, len(items),
+               extra=log.span({"enphase.live_from": start.isoformat(), "enphase.items": len(items)}))
+    return items
+
+
+def _emporia_day(item):
+    return item["instant"].split("T")[0]
+
+
+def _enphase_day(item):
+    return item["summary_date"]
+
+
+def _within(items, start, end, day_of):
+    start_date, end_date = start.isoformat(), end.isoformat()
+    return [item for item in items if start_date <= day_of(item) < end_date]
+
+
+# --- Stored days --------------------------------------------------------------
+# Finished days are read from EnergyDailyReading in the same shape the APIs
+# return, so everything downstream parses one format. A day counts as stored
+# once its TOTAL_NAME row has the source's value; every other day in the range
+# (normally just today, but also gaps and days older than the backfill) is
+# fetched live, one request per run of consecutive missing days.
+
+def _stored_days(field, start, end):
+    """Days in [start, end) whose TOTAL_NAME row has a value for `field`."""
+    return set(
+        EnergyDailyReading.objects.filter(
+            date__gte=start, date__lt=end, name=TOTAL_NAME, **{f"{field}__isnull": False}
+        ).values_list("date", flat=True)
+    )
+
+
+def _missing_runs(stored, start, end):
+    """[(first, end), ...] runs of consecutive days in [start, end) that are not in `stored`."""
+    runs = []
+    day = start
+    while day < end:
+        if day in stored:
+            day += timedelta(days=1)
+            continue
+        first = day
+        while day < end and day not in stored:
+            day += timedelta(days=1)
+        runs.append((first, day))
+    return runs
+
+
+def _stored_emporia(start, end, name=None):
+    """(stored Emporia items for [start, end), runs of days that must be fetched live)."""
+    stored = _stored_days("usage_kwh", start, end)
+    readings = EnergyDailyReading.objects.filter(date__in=stored, usage_kwh__isnull=False)
+    if name:
+        readings = readings.filter(name=name)
+    items = [
+        {"instant": _instant(r["date"]), "name": r["name"], "usage": r["usage_kwh"], "percentage": r["percentage"]}
+        for r in readings.values("date", "name", "usage_kwh", "percentage")
+    ]
+    return items, _missing_runs(stored, start, end)
+
+
+def _stored_enphase(start, end):
+    """(stored Enphase items for [start, end), runs of days that must be fetched live)."""
+    stored = _stored_days("produced_kwh", start, end)
+    readings = EnergyDailyReading.objects.filter(date__in=stored, name=TOTAL_NAME)
+    items = [
+        {"summary_date": r["date"].isoformat(), "max_energy_today": r["produced_kwh"] * 1000}
+        for r in readings.values("date", "produced_kwh")
+    ]
+    return items, _missing_runs(stored, start, end)
+
+
+def _emporia_items(start, end, name=None):
+    """Emporia usage items for [start, end): stored days plus a live fetch of the rest."""
+    items, runs = _stored_emporia(start, end, name)
+    for run_start, run_end in runs:
+        try:
+            items += _fetch_emporia(run_start, run_end, name)
+        except requests.RequestException as e:
+            _log.warning("Error fetching Emporia metrics: %s", e)
+    return items
+
+
+def _enphase_items(start, end):
+    """Enphase production items for [start, end): stored days plus a live fetch of the rest."""
+    items, runs = _stored_enphase(start, end)
+    for run_start, run_end in runs:
+        try:
+            items += _fetch_enphase(run_start, run_end)
+        except requests.RequestException as e:
+            _log.warning("Error fetching Enphase summary: %s", e)
+    return items
+
+
+def sync_energy_readings(backfill_days=_BACKFILL_DAYS):
+    """
+    Store every complete UTC day of the last `backfill_days` days that is not
+    stored yet, per source: all Emporia circuits, and Enphase production on the
+    TOTAL_NAME row. Stored days are not fetched again, so a run normally costs
+    one request per source for yesterday; a day upstream skipped or returned
+    without a total is retried on every run until it has one. Returns
+    (emporia rows, enphase rows) written. Raises requests.RequestException.
+    """
+    today = datetime.now(timezone.utc).date()
+    first_day = today - timedelta(days=backfill_days)
+
+    emporia_rows = []
+    for start, end in _missing_runs(_stored_days("usage_kwh", first_day, today), first_day, today):
+        rows = [
+            {"date": _emporia_day(item), "name": item["name"], "usage_kwh": item["usage"], "percentage": item.get("percentage")}
+            for item in _fetch_emporia(start, end)
+        ]
+        bulk_upsert(EnergyDailyReading, rows, ["date", "name"], ["usage_kwh", "percentage"])
+        emporia_rows += rows
+
+    enphase_rows = []
+    for start, end in _missing_runs(_stored_days("produced_kwh", first_day, today), first_day, today):
+        rows = [
             # Convert produced from Wh to kWh
-            enphase_data[item["summary_date"]] = item["max_energy_today"] / 1000
-    except requests.RequestException as e:
-        print(f"Error fetching Enphase summary: {e}")
-
-    # --- Get Emporia usage metrics ---
-    emporia_data = {}
-    emporia_start = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
-    payload = {"start_date": emporia_start,
-               "name": "Electricity Monitor"}
-    try:
-        print(f"[DEBUG] Emporia POST call: {EMPORIA_API_SEARCH_URL}")
-        print(f"[DEBUG] Emporia payload: {payload}")
-        response = requests.post(EMPORIA_API_SEARCH_URL, json=payload)
-        print(f"[DEBUG] Emporia response status: {response.status_code}")
-        response.raise_for_status()
-        for item in response.json():
-            date = item["instant"].split("T")[0]
-            emporia_data[date] = item["usage"]
-    except requests.RequestException as e:
-        print(f"Error fetching Emporia metrics: {e}")
+            {"date": _enphase_day(item), "name": TOTAL_NAME, "produced_kwh": item["max_energy_today"] / 1000}
+            for item in _fetch_enphase(start, end)
+        ]
+        bulk_upsert(EnergyDailyReading, rows, ["date", "name"], ["produced_kwh"])
+        enphase_rows += rows
+
+    return len(emporia_rows), len(enphase_rows)
+
+
+# --- Card and page data -------------------------------------------------------
+
+def _card_window():
+    # The last 7 days plus today
+    today = datetime.now(timezone.utc).date()
+    return today - timedelta(days=7), today + timedelta(days=1)
+
 
+def _month_bounds(year, month):
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def _get_metrics():
+    start, end = _card_window()
+    return _combine_items(_enphase_items(start, end), _emporia_items(start, end, TOTAL_NAME))
+
+
+async def _aget_metrics():
+    # Async twin of _get_metrics for the async card view: stored days from the
+    # DB, then both upstreams in parallel for the days not stored yet.
+    start, end = _card_window()
+    (emporia, emporia_runs), (enphase, enphase_runs) = await sync_to_async(
+        lambda: (_stored_emporia(start, end, TOTAL_NAME), _stored_enphase(start, end))
+    )()
+
+    enphase_url, emporia_url = await ENPHASE_API_SEARCH_URL.aget(), await EMPORIA_API_SEARCH_URL.aget()
+
+    live = await asyncio.gather(
+        *(async_http.get_json("enphase", enphase_url, params=_enphase_params(run_start, run_end))
+          for run_start, run_end in enphase_runs),
+        *(async_http.post_json("emporia", emporia_url, json=_emporia_payload(run_start, run_end, TOTAL_NAME))
+          for run_start, run_end in emporia_runs),
+        return_exceptions=True,
+    )
+
+    for (run_start, run_end), items in zip(enphase_runs, live[:len(enphase_runs)]):
+        if isinstance(items, Exception):
+            _log.warning("Error fetching Enphase summary: %s", items)
+        else:
+            enphase += _within(items, run_start, run_end, _enphase_day)
+
+    for (run_start, run_end), items in zip(emporia_runs, live[len(enphase_runs):]):
+        if isinstance(items, Exception):
+            _log.warning("Error fetching Emporia metrics: %s", items)
+        else:
+            emporia += _within(items, run_start, run_end, _emporia_day)
+
+    return _combine_items(enphase, emporia)
+
+
+def _combine_items(enphase_items, emporia_items):
+    # Convert produced from Wh to kWh
+    enphase_data = {_enphase_day(item): item["max_energy_today"] / 1000 for item in enphase_items}
+    emporia_data = {_emporia_day(item): item["usage"] for item in emporia_items}
+    return _combine(enphase_data, emporia_data)
+
+
+def _combine(enphase_data, emporia_data):
     # --- Combine by date ---
     all_dates = set(enphase_data.keys()) | set(emporia_data.keys())
     combined = []
-    for date in sorted(all_dates):
+    for day in sorted(all_dates):
         combined.append({
-            "date": date,
-            "usage": emporia_data.get(date, 0),
-            "produced": enphase_data.get(date, 0)
+            "date": day,
+            "usage": emporia_data.get(day, 0),
+            "produced": enphase_data.get(day, 0)
         })
 
     return combined
@@ -67,35 +271,16 @@ def _get_daily_metrics(target_date=None):
         List of daily usage summaries sorted by usage descending with Balance at the end.
     """
     if target_date is None:
-        target_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        start_date = (datetime.now(timezone.utc)).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+        day = datetime.now(timezone.utc).date()
     else:
-        # Parse the target_date and convert to UTC ISO format
-        target_dt = datetime.strptime(target_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-        start_date = target_dt.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
-
-    payload = {"start_date": start_date}
-    try:
-        print(f"[DEBUG] Daily Emporia POST call: {EMPORIA_API_SEARCH_URL}")
-        print(f"[DEBUG] Target date: {target_date}")
-        print(f"[DEBUG] Daily Emporia payload: {payload}")
-        response = requests.post(EMPORIA_API_SEARCH_URL, json=payload)
-        print(f"[DEBUG] Daily Emporia response status: {response.status_code}")
-        if response.status_code in (200, 201):
-            summary_info = response.json()
-            print(f"[DEBUG] Daily Emporia raw response count: {len(summary_info)} items")
-        else:
-            print(f"Failed to post to Emporia API: {response.status_code}, {response.text}")
-            return []
-    except requests.RequestException as e:
-        print(f"Error posting to Emporia API: {e}")
-        return []
+        day = datetime.strptime(target_date, "%Y-%m-%d").date()
 
-    # Only return {date, name, usage, cost, percentage} and filter to target_date only
+    summary_info = _emporia_items(day, day + timedelta(days=1))
+
+    # Only return {date, name, usage, cost, percentage}
     simplified = [
-        {"date": item["instant"].split("T")[0], "name": item["name"], "usage": item["usage"], "cost": item["usage"]*COST_PER_KWH, "percentage": item["percentage"]}
+        {"date": _emporia_day(item), "name": item["name"], "usage": item["usage"], "cost": item["usage"]*COST_PER_KWH.get(), "percentage": item["percentage"]}
         for item in summary_info
-        if item["instant"].split("T")[0] == target_date  # Filter to only the target date
     ]
 
     # Sort by usage descending, then move "Balance" to the end
@@ -110,180 +295,86 @@ def _get_daily_metrics(target_date=None):
     return simplified_sorted
 
 
-def _get_metrics_by_month(year, month):
+class EnergyMonth:
     """
-    Fetch metrics for a specific month (all days in that month).
-
-    Args:
-        year: Year (e.g., 2025)
-        month: Month number (1-12)
-
-    Returns:
-        List of daily metrics for the month, sorted by date.
+    One month of energy data for the energy page. Emporia (every circuit) and
+    Enphase are each loaded once, and both the daily usage/production series
+    and the per-category totals are derived from those items in one pass.
     """
-    # Calculate the first day of the month
-    start_dt = datetime(year, month, 1, tzinfo=timezone.utc)
 
-    # Calculate the last day of the month
-    if month == 12:
-        end_dt = datetime(year + 1, 1, 1, tzinfo=timezone.utc) - timedelta(days=1)
-    else:
-        end_dt = datetime(year, month + 1, 1, tzinfo=timezone.utc) - timedelta(days=1)
-
-    start_date = start_dt.strftime("%Y-%m-%d")
-    end_date = end_dt.strftime("%Y-%m-%d")
-
-    # --- Get Enphase produced metrics ---
-    enphase_data = {}
-    try:
-        params = {"start_date": start_date, "end_date": end_date}
-        print(f"[DEBUG] Monthly Enphase GET call: {ENPHASE_API_SEARCH_URL}")
-        print(f"[DEBUG] Monthly Enphase params: {params}")
-        response = requests.get(ENPHASE_API_SEARCH_URL, params=params)
-        print(f"[DEBUG] Monthly Enphase response status: {response.status_code}")
-        response.raise_for_status()
-        enphase_items = response.json()
-        print(f"[DEBUG] Monthly Enphase raw response count: {len(enphase_items)} items")
-        for item in enphase_items:
+    def __init__(self, year, month):
+        start, next_month = _month_bounds(year, month)
+
+        # Both loaders return only items inside the month
+        usage_days = aggregate.GroupAggregator(
+            key_of=lambda item: _emporia_day(item) if item["name"] == TOTAL_NAME else None,
+            metrics={"usage": lambda item: item["usage"]},
+        )
+        categories = aggregate.GroupAggregator(
+            key_of=lambda item: item["name"],
+            metrics={"usage": lambda item: item["usage"]},
+        )
+        for item in _emporia_items(start, next_month):
+            usage_days.add(item)
+            categories.add(item)
+        produced_days = aggregate.GroupAggregator(
+            key_of=_enphase_day,
             # Convert produced from Wh to kWh
-            enphase_data[item["summary_date"]] = item["max_energy_today"] / 1000
-    except requests.RequestException as e:
-        print(f"Error fetching Enphase summary for {year}-{month}: {e}")
-
-    # --- Get Emporia usage metrics ---
-    emporia_data = {}
-    # Set end_date to the first of the next month (API query boundary)
-    if month == 12:
-        end_dt_next = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
-    else:
-        end_dt_next = datetime(year, month + 1, 1, tzinfo=timezone.utc)
-    payload = {
-        "start_date": start_dt.isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
-        "end_date": end_dt_next.isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
-        "name": "Electricity Monitor"
-    }
-    try:
-        print(f"[DEBUG] Monthly Emporia POST call: {EMPORIA_API_SEARCH_URL}")
-        print(f"[DEBUG] Monthly Emporia payload: {payload}")
-        response = requests.post(EMPORIA_API_SEARCH_URL, json=payload)
-        print(f"[DEBUG] Monthly Emporia response status: {response.status_code}")
-        response.raise_for_status()
-        emporia_items = response.json()
-        print(f"[DEBUG] Monthly Emporia raw response count: {len(emporia_items)} items")
-        for item in emporia_items:
-            date = item["instant"].split("T")[0]
-            emporia_data[date] = item["usage"]
-    except requests.RequestException as e:
-        print(f"Error fetching Emporia metrics for {year}-{month}: {e}")
-
-    # --- Combine by date and filter to only the selected month ---
-    all_dates = set(enphase_data.keys()) | set(emporia_data.keys())
-    combined = []
-    for date in sorted(all_dates):
-        # Only include dates that are within the selected month
-        if start_date <= date <= end_date:
-            combined.append({
-                "date": date,
-                "usage": emporia_data.get(date, 0),
-                "produced": enphase_data.get(date, 0)
+            metrics={"produced": lambda item: item["max_energy_today"] / 1000},
+        ).consume(_enphase_items(start, next_month))
+
+        self.usage_by_day = {day: stats["usage"].total for day, stats in usage_days.groups.items()}
+        self.produced_by_day = {day: stats["produced"].total for day, stats in produced_days.groups.items()}
+        self.usage_by_category = {name: stats["usage"].total for name, stats in categories.groups.items()}
+
+    def daily(self):
+        """Daily {date, usage, produced} for the month, sorted by date."""
+        return _combine(self.produced_by_day, self.usage_by_day)
+
+    def categories(self):
+        """Category totals with cost and share, sorted by usage descending with Balance at the end."""
+        # Calculate total usage for percentage calculation
+        total_usage = sum(self.usage_by_category.values())
+
+        # Build the result list
+        result = []
+        for name, usage in self.usage_by_category.items():
+            # Multiply by 2 because "Electricity Monitor" is the total and other values
+            # are subcomponents, so the sum double-counts the usage
+            percentage = (usage / total_usage * 100 * 2) if total_usage > 0 else 0
+            cost = usage * COST_PER_KWH.get()
+            result.append({
+                "name": name,
+                "usage": usage,
+                "cost": cost,
+                "percentage": percentage
             })
 
-    return combined
+        # Sort by usage descending, then move "Balance" to the end
+        result_sorted = sorted(
+            [d for d in result if d["name"] != "Balance"],
+            key=lambda x: x["usage"],
+            reverse=True
+        )
+        balance_row = [d for d in result if d["name"] == "Balance"]
+        result_sorted.extend(balance_row)
 
+        return result_sorted
 
+
+@cached_collector(ttl=300, afetch=_aget_metrics)
 def collect_emporia_summary():
     return _get_metrics()
 
+@cached_collector(ttl=120)
 def collect_emporia_daily_summary(target_date=None):
     return _get_daily_metrics(target_date)
 
-def collect_emporia_monthly_summary(year, month):
-    return _get_metrics_by_month(year, month)
-
-def collect_emporia_monthly_category_summary(year, month):
+@cached_collector(ttl=600)
+def collect_emporia_month(year, month):
     """
-    Fetch monthly category totals for a specific month.
-
-    Args:
-        year: Year (e.g., 2025)
-        month: Month number (1-12)
-
-    Returns:
-        List of category summaries with total usage, cost, and percentage.
+    The energy page's monthly data for one month: {"daily": [...], "categories": [...]}
+    (see EnergyMonth), built from a single load of each upstream.
     """
-    # Calculate the first day of the month
-    start_dt = datetime(year, month, 1, tzinfo=timezone.utc)
-
-    # Calculate the last day of the month
-    if month == 12:
-        end_dt = datetime(year + 1, 1, 1, tzinfo=timezone.utc) - timedelta(days=1)
-    else:
-        end_dt = datetime(year, month + 1, 1, tzinfo=timezone.utc) - timedelta(days=1)
-
-    # Set end_date to the first of the next month (API query boundary)
-    if month == 12:
-        end_dt_next = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
-    else:
-        end_dt_next = datetime(year, month + 1, 1, tzinfo=timezone.utc)
-
-    start_date = start_dt.strftime("%Y-%m-%d")
-    end_date = end_dt.strftime("%Y-%m-%d")
-
-    payload = {
-        "start_date": start_dt.isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
-        "end_date": end_dt_next.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
-    }
-
-    try:
-        print(f"[DEBUG] Monthly Category Emporia POST call: {EMPORIA_API_SEARCH_URL}")
-        print(f"[DEBUG] Monthly Category Emporia payload: {payload}")
-        response = requests.post(EMPORIA_API_SEARCH_URL, json=payload)
-        print(f"[DEBUG] Monthly Category Emporia response status: {response.status_code}")
-        if response.status_code in (200, 201):
-            summary_info = response.json()
-            print(f"[DEBUG] Monthly Category Emporia raw response count: {len(summary_info)} items")
-        else:
-            print(f"Failed to post to Emporia API: {response.status_code}, {response.text}")
-            return []
-    except requests.RequestException as e:
-        print(f"Error posting to Emporia API: {e}")
-        return []
-
-    # Filter to only the selected month and aggregate by category name
-    category_totals = {}
-    for item in summary_info:
-        item_date = item["instant"].split("T")[0]
-        if start_date <= item_date <= end_date:
-            name = item["name"]
-            usage = item["usage"]
-            if name not in category_totals:
-                category_totals[name] = 0
-            category_totals[name] += usage
-
-    # Calculate total usage for percentage calculation
-    total_usage = sum(category_totals.values())
-
-    # Build the result list
-    result = []
-    for name, usage in category_totals.items():
-        # Multiply by 2 because "Electricity Monitor" is the total and other values
-        # are subcomponents, so the sum double-counts the usage
-        percentage = (usage / total_usage * 100 * 2) if total_usage > 0 else 0
-        cost = usage * COST_PER_KWH
-        result.append({
-            "name": name,
-            "usage": usage,
-            "cost": cost,
-            "percentage": percentage
-        })
-
-    # Sort by usage descending, then move "Balance" to the end
-    result_sorted = sorted(
-        [d for d in result if d["name"] != "Balance"],
-        key=lambda x: x["usage"],
-        reverse=True
-    )
-    balance_row = [d for d in result if d["name"] == "Balance"]
-    result_sorted.extend(balance_row)
-
-    return result_sorted
\ No newline at end of file
+    energy_month = EnergyMonth(year, month)
+    return {"daily": energy_month.daily(), "categories": energy_month.categories()}
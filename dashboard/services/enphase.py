@@ -1,8 +1,14 @@
+import logging
 import requests
 from datetime import datetime, timedelta, timezone
-from config.utils import get_config
+from config.utils import Setting
+from dashboard.services import http
+from dashboard.services import async_http
+from dashboard.services.cache import cached_collector
 
-ENPHASE_API_SEARCH_URL = get_config("ENPHASE_API_SEARCH_URL")
+_log = logging.getLogger(__name__)
+
+ENPHASE_API_SEARCH_URL = Setting("ENPHASE_API_SEARCH_URL")
 
 
 def _get_metrics():
@@ -12,20 +18,36 @@ def _get_metrics():
     params = {"start_date": start_date}
     
     try:
-        response = requests.get(ENPHASE_API_SEARCH_URL, params=params)
+        response = http.get("enphase", ENPHASE_API_SEARCH_URL.get(), params=params)
         response.raise_for_status()  # raise exception if status != 2xx
         summary_info = response.json()
     except requests.RequestException as e:
-        print(f"Error fetching summary: {e}")
+        _log.warning("Error fetching Enphase summary: %s", e)
+        return []
+
+    return _simplify(summary_info)
+
+
+async def _aget_metrics():
+    start_date = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%d")
+    try:
+        summary_info = await async_http.get_json(
+            "enphase", await ENPHASE_API_SEARCH_URL.aget(), params={"start_date": start_date}
+        )
+    except async_http.HTTP_ERRORS as e:
+        _log.warning("Error fetching Enphase summary: %s", e)
         return []
+    return _simplify(summary_info)
+
 
+def _simplify(summary_info):
     # Only return {date, produced} equivalent
-    simplified = [
+    return [
         {"date": item["summary_date"], "produced": item["max_energy_today"]}
         for item in summary_info
     ]
-    return simplified
 
 
+@cached_collector(ttl=300, afetch=_aget_metrics)
 def collect_enhase_summary():
     return _get_metrics()
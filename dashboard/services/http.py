@@ -0,0 +1,137 @@
+"""
+Pooled HTTP sessions for the dashboard services.
+
+    from dashboard.services import http
+
+    response = http.get("weather", WEATHER_URL.get())
+
+Each upstream gets one process-wide requests.Session with a sized connection
+pool (keep-alive is on by default), bounded retries with exponential backoff
+on connection errors and 502/503/504, and default connect/read timeouts that
+a call can still override with `timeout=`. Every request records its latency
+in the `http.client.duration` OTel histogram, tagged with the upstream name,
+method and status code.
+
+Upstreams not listed in UPSTREAMS get DEFAULT_UPSTREAM.
+"""
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+from opentelemetry import metrics
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@dataclass(frozen=True)
+class Upstream:
+    connect_timeout: float = 3.0
+    read_timeout: float = 10.0
+    retries: int = 2
+    pool_size: int = 10
+    # POST endpoints that only search/read (Emporia, Enphase) are safe to retry
+    retry_post: bool = False
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+
+DEFAULT_UPSTREAM = Upstream()
+
+UPSTREAMS = {
+    "weather": Upstream(read_timeout=5.0),
+    "synology": Upstream(read_timeout=5.0),
+    "network": Upstream(read_timeout=5.0),
+    "enphase": Upstream(read_timeout=10.0, retry_post=True),
+    "emporia": Upstream(read_timeout=15.0, retry_post=True),
+    "darts": Upstream(read_timeout=10.0),
+    "prometheus": Upstream(read_timeout=15.0),
+    "tempo": Upstream(read_timeout=15.0),
+    "todo": Upstream(read_timeout=5.0, retries=1),
+    "money-tracker": Upstream(read_timeout=30.0),
+    "splunk": Upstream(read_timeout=15.0, pool_size=20),
+}
+
+_RETRY_STATUSES = (502, 503, 504)
+_BACKOFF_FACTOR = 0.3  # 0.3s, 0.6s, 1.2s, ...
+
+_duration = metrics.get_meter("homelab-hub").create_histogram(
+    name="http.client.duration",
+    description="Latency of outbound HTTP requests from dashboard services",
+    unit="ms",
+)
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def upstream_config(name: str) -> Upstream:
+    return UPSTREAMS.get(name, DEFAULT_UPSTREAM)
+
+
+class _UpstreamSession(requests.Session):
+    """Session that applies the upstream's default timeout and records latency."""
+
+    def __init__(self, name: str, config: Upstream):
+        super().__init__()
+        self.upstream = name
+        self.config = config
+
+        allowed = set(Retry.DEFAULT_ALLOWED_METHODS)
+        if config.retry_post:
+            allowed.add("POST")
+        retry = Retry(
+            total=config.retries,
+            backoff_factor=_BACKOFF_FACTOR,
+            status_forcelist=_RETRY_STATUSES,
+            allowed_methods=frozenset(allowed),
+            raise_on_status=False,  # hand the last response back to raise_for_status()
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.pool_size, max_retries=retry)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault("timeout", self.config.timeout)
+        started = time.monotonic()
+        status = "error"
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            status = str(response.status_code)
+            return response
+        finally:
+            record_duration(self.upstream, method, status, (time.monotonic() - started) * 1000)
+
+
+def record_duration(upstream: str, method: str, status: str, duration_ms: float):
+    """Add one request to the latency histogram (also used by services.async_http)."""
+    _duration.record(duration_ms, {"upstream": upstream, "method": method.upper(), "status": status})
+
+
+def session(name: str) -> requests.Session:
+    """The shared session for upstream `name`, created on first use."""
+    s = _sessions.get(name)
+    if s is None:
+        with _sessions_lock:
+            s = _sessions.get(name)
+            if s is None:
+                s = _sessions[name] = _UpstreamSession(name, upstream_config(name))
+    return s
+
+
+def new_session(name: str) -> requests.Session:
+    """
+    A private session with upstream `name`'s pooling, retries, timeouts and
+    metrics, for clients that keep their own cookies (e.g. a login session).
+    """
+    return _UpstreamSession(name, upstream_config(name))
+
+
+def get(name: str, url: str, **kwargs) -> requests.Response:
+    return session(name).get(url, **kwargs)
+
+
+def post(name: str, url: str, **kwargs) -> requests.Response:
+    return session(name).post(url, **kwargs)
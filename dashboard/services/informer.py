@@ -0,0 +1,169 @@
+"""
+Watch-based informer: an in-memory, indexed copy of one Kubernetes resource.
+
+    pods = informer.Informer(
+        "pods", v1.list_pod_for_all_namespaces,
+        indexes={"namespace": lambda p: p.metadata.namespace},
+    ).start()
+    if pods.synced:
+        pods.by_index("namespace", "homelab-hub")
+
+A daemon thread lists the resource once, then follows a watch stream from
+that list's resourceVersion and applies ADDED/MODIFIED/DELETED events to the
+store. Each stream is closed by the server after _WATCH_TIMEOUT seconds and
+resumed from the last resourceVersion seen (bookmarks keep it current
+between changes), so a quiet cluster costs one long-lived request, not a
+list per query. A 410 Gone, or any other error, drops the resourceVersion
+and the informer relists after a backoff.
+
+`synced` is False until the first list lands and again from an error until
+the next successful relist; callers should fall back to a direct API call
+while it is False rather than serve a store that may be out of date.
+"""
+import logging
+import threading
+
+from kubernetes import watch
+
+_log = logging.getLogger(__name__)
+
+_WATCH_TIMEOUT = 300  # seconds the server keeps one watch request open
+_READ_TIMEOUT = _WATCH_TIMEOUT + 30  # client side, to notice a dead connection
+_BACKOFF_INITIAL = 1
+_BACKOFF_MAX = 60
+
+
+class Informer:
+    """
+    Keep every object of one kind in memory, keyed by "namespace/name".
+
+    `list_fn` is a kubernetes client list call (e.g. CoreV1Api.list_node).
+    `indexes` maps an index name to a function returning the object's value
+    for it; by_index() and counts() are answered from those without a scan.
+    """
+
+    def __init__(self, name: str, list_fn, indexes: dict | None = None):
+        self.name = name
+        self._list = list_fn
+        self._index_fns = indexes or {}
+        self._items = {}
+        self._indexes = {index: {} for index in self._index_fns}  # index -> value -> {key: obj}
+        self._values = {}  # key -> {index: value}, to unindex on update/delete
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._resource_version = None
+        self._watch = None
+        self._thread = None
+
+    # ---------- Queries ----------
+    @property
+    def synced(self) -> bool:
+        return self._synced.is_set()
+
+    def wait_synced(self, timeout: float | None = None) -> bool:
+        return self._synced.wait(timeout)
+
+    def items(self) -> list:
+        with self._lock:
+            return list(self._items.values())
+
+    def by_index(self, index: str, value) -> list:
+        with self._lock:
+            return list(self._indexes[index].get(value, {}).values())
+
+    def counts(self, index: str) -> dict:
+        """{value: number of objects} for one index."""
+        with self._lock:
+            return {value: len(keys) for value, keys in self._indexes[index].items()}
+
+    # ---------- Lifecycle ----------
+    def start(self) -> "Informer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"informer:{self.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._watch is not None:
+            self._watch.stop()
+
+    def _run(self):
+        delay = _BACKOFF_INITIAL
+        while not self._stopped.is_set():
+            try:
+                if self._resource_version is None:
+                    self._relist()
+                    delay = _BACKOFF_INITIAL
+                self._follow()
+            except Exception as ex:
+                status = getattr(ex, "status", None)
+                if status == 410:
+                    _log.info("%s watch expired, relisting", self.name)
+                else:
+                    _log.warning("%s informer error, relisting in %ss: %s", self.name, delay, ex)
+                    self._synced.clear()
+                    self._stopped.wait(delay)
+                    delay = min(delay * 2, _BACKOFF_MAX)
+                self._resource_version = None
+
+    def _relist(self):
+        result = self._list(_request_timeout=_READ_TIMEOUT)
+        with self._lock:
+            self._items.clear()
+            self._values.clear()
+            for values in self._indexes.values():
+                values.clear()
+            for obj in result.items:
+                self._put(_key(obj), obj)
+        self._resource_version = result.metadata.resource_version
+        self._synced.set()
+        _log.debug("%s informer listed %d objects at %s", self.name, len(result.items), self._resource_version)
+
+    def _follow(self):
+        self._watch = watch.Watch()
+        for event in self._watch.stream(
+            self._list,
+            resource_version=self._resource_version,
+            timeout_seconds=_WATCH_TIMEOUT,
+            allow_watch_bookmarks=True,
+            _request_timeout=_READ_TIMEOUT,
+        ):
+            self._apply(event)
+            if self._stopped.is_set():
+                break
+
+    def _apply(self, event: dict):
+        kind = event["type"]
+        if kind == "BOOKMARK":
+            self._resource_version = event["raw_object"]["metadata"]["resourceVersion"]
+            return
+        obj = event["object"]
+        key = _key(obj)
+        with self._lock:
+            self._remove(key)
+            if kind != "DELETED":
+                self._put(key, obj)
+        self._resource_version = obj.metadata.resource_version
+
+    # ---------- Store (callers hold _lock) ----------
+    def _put(self, key: str, obj):
+        self._items[key] = obj
+        values = self._values[key] = {index: fn(obj) for index, fn in self._index_fns.items()}
+        for index, value in values.items():
+            self._indexes[index].setdefault(value, {})[key] = obj
+
+    def _remove(self, key: str):
+        if self._items.pop(key, None) is None:
+            return
+        for index, value in self._values.pop(key).items():
+            bucket = self._indexes[index][value]
+            del bucket[key]
+            if not bucket:
+                del self._indexes[index][value]
+
+
+def _key(obj) -> str:
+    meta = obj.metadata
+    return f"{meta.namespace}/{meta.name}" if meta.namespace else meta.name
@@ -1,99 +1,229 @@
+import functools
+import logging
+import re
+import threading
+
 from kubernetes import client, config
+from config.utils import get_config
+from dashboard.services.cache import cached_collector
+from dashboard.services.informer import Informer
+
+_log = logging.getLogger(__name__)
+
+_DONE_PHASES = {"Succeeded", "Completed"}
+
+_clients = None
+_clients_lock = threading.Lock()
+
+_informers = None
+_informers_lock = threading.Lock()
+
 
-# For now, exception handler will be here and only printing
 def _handle_exception(ex):
-        print('---------------------------------------')
-        print('Exception:')
-        print('---------------------------------------')
-        print(ex)
-        print('---------------------------------------')
+    _log.error("Kubernetes API error: %s", ex)
 
 
 # ---------- Parsers ----------
-def _parse_cpu(value: str) -> float:
-    if value.endswith("m"):
-        return int(value[:-1]) / 1000
-    if value.endswith("n"):
-        return int(value[:-1]) / 1_000_000_000
-    return float(value)
+# Kubernetes resource.Quantity: a signed decimal number followed by a binary
+# SI suffix (Ki..Ei), a decimal SI suffix (n, u, m, k, M..E) or a decimal
+# exponent (e3, E-2). "E" alone is exa; "E" followed by digits is an exponent.
+_QUANTITY = re.compile(
+    r"([+-]?(?:\d+\.?\d*|\.\d+))"
+    r"(?:(Ki|Mi|Gi|Ti|Pi|Ei|n|u|m|k|M|G|T|P|E)|[eE]([+-]?\d+))?"
+)
+_SUFFIX_SCALE = {
+    "Ki": 2 ** 10, "Mi": 2 ** 20, "Gi": 2 ** 30, "Ti": 2 ** 40, "Pi": 2 ** 50, "Ei": 2 ** 60,
+    "n": 1e-9, "u": 1e-6, "m": 1e-3,
+    "k": 1e3, "M": 1e6, "G": 1e9, "T": 1e12, "P": 1e15, "E": 1e18,
+}
+_GIB = 2 ** 30
 
-def _parse_memory(value: str) -> float:
+
+@functools.lru_cache(maxsize=4096)
+def parse_quantity(value: str) -> float:
     """
-    Convert memory string to GiB.
-    Handles:
-        - Binary units: Ki, Mi, Gi, Ti
-        - SI units: K, M, G, T
-        - Plain integers (bytes)
-    Returns: float GiB
+    A Kubernetes quantity ("250m", "128Mi", "1.5", "2e3") in base units:
+    cores for CPU, bytes for memory. Raises ValueError if it isn't one.
+    Pods repeat a handful of request/limit strings, so results are cached.
     """
-    value = value.strip()
+    match = _QUANTITY.fullmatch(value.strip())
+    if match is None:
+        raise ValueError(f"invalid quantity {value!r}")
+    number, suffix, exponent = match.groups()
+    if exponent is not None:
+        return float(f"{number}e{exponent}")
+    if suffix is None:
+        return float(number)
+    scale = _SUFFIX_SCALE[suffix]
+    # Integers times a binary scale stay exact as ints, e.g. "128Mi"
+    if isinstance(scale, int) and number.lstrip("+-").isdigit():
+        return float(int(number) * scale)
+    return float(number) * scale
+
+
+def _parse_quantity_or_zero(value: str, kind: str) -> float:
     try:
-        if value.endswith("Ki"):
-            return int(value[:-2]) / 1024 / 1024
-        elif value.endswith("Mi"):
-            return int(value[:-2]) / 1024
-        elif value.endswith("Gi"):
-            return int(value[:-2])
-        elif value.endswith("Ti"):
-            return int(value[:-2]) * 1024
-        elif value.endswith("K"):
-            return int(value[:-1]) / 1024 / 1024
-        elif value.endswith("M"):
-            return int(value[:-1]) / 1024
-        elif value.endswith("G"):
-            return int(value[:-1])
-        elif value.endswith("T"):
-            return int(value[:-1]) * 1024
-        else:
-            return int(value) / 1024 / 1024 / 1024
-    except ValueError as ex:
-        _handle_exception(f"Unable to parse memory value '{value}': {ex}")
-        return 0
+        return parse_quantity(value)
+    except ValueError:
+        _log.warning("Unable to parse %s quantity %r", kind, value)
+        return 0.0
+
+
+def _parse_cpu(value: str) -> float:
+    """CPU quantity in cores; 0 (with a warning) if it can't be parsed."""
+    return _parse_quantity_or_zero(value, "cpu")
+
+
+def _parse_memory(value: str) -> float:
+    """Memory quantity in GiB; 0 (with a warning) if it can't be parsed."""
+    return _parse_quantity_or_zero(value, "memory") / _GIB
+
 
 # ---------- Core client ----------
 def _get_k8s_client():
+    """The process-wide (CoreV1Api, CustomObjectsApi) pair; kube config is loaded on first use only."""
+    global _clients
+    if _clients is None:
+        with _clients_lock:
+            if _clients is None:
+                try:
+                    config.load_incluster_config()
+                except config.ConfigException:
+                    config.load_kube_config()
+                api = client.ApiClient()
+                _clients = (client.CoreV1Api(api), client.CustomObjectsApi(api))
+    return _clients
+
+
+def _get_informers():
+    """
+    The (pods, nodes) informers, started on first use, or (None, None) when
+    K8S_INFORMER is "false". Each process keeps its own watch on both.
+    """
+    global _informers
+    if _informers is None:
+        with _informers_lock:
+            if _informers is None:
+                if str(get_config("K8S_INFORMER", "true")).lower() == "false":
+                    _informers = (None, None)
+                else:
+                    v1, _ = _get_k8s_client()
+                    _informers = (
+                        Informer("pods", v1.list_pod_for_all_namespaces, indexes={
+                            "namespace": lambda pod: pod.metadata.namespace,
+                            "node": lambda pod: pod.spec.node_name,
+                            "phase": lambda pod: pod.status.phase,
+                        }).start(),
+                        Informer("nodes", v1.list_node).start(),
+                    )
+    return _informers
+
+
+def _synced_pods() -> Informer | None:
+    pods, _ = _get_informers()
+    return pods if pods is not None and pods.synced else None
+
+
+def _list_pods() -> list:
+    """Every pod: from the informer's store when it is synced, else one list call."""
+    pods = _synced_pods()
+    if pods is not None:
+        return pods.items()
+    v1, _ = _get_k8s_client()
+    return v1.list_pod_for_all_namespaces().items
+
+
+def _list_nodes() -> list:
+    _, nodes = _get_informers()
+    if nodes is not None and nodes.synced:
+        return nodes.items()
+    v1, _ = _get_k8s_client()
+    return v1.list_node().items
+
+
+def _list_metrics(custom: client.CustomObjectsApi, plural: str) -> list | None:
+    """metrics-server usage items for `plural` ("nodes" or "pods"), or None if unavailable."""
     try:
-        config.load_incluster_config()
-    except:
-        config.load_kube_config()
-    return client.CoreV1Api(), client.CustomObjectsApi()
-
-# ---------- Pod metrics ----------
-def _get_pod_counts(v1: client.CoreV1Api):
-    pods_status = {"running": 0, "pending": 0, "failed": 0}
-    for pod in v1.list_pod_for_all_namespaces().items:
-        phase = pod.status.phase.lower()
-        if phase in pods_status:
-            pods_status[phase] += 1
-    total_pods = sum(pods_status.values())
-    return pods_status, total_pods
-
-# ---------- Node metrics ----------
-def _get_nodes(v1: client.CoreV1Api, custom: client.CustomObjectsApi):
-    nodes_info = []
-    nodes = v1.list_node()
-    for node in nodes.items:
-        cap = node.status.capacity
-        alloc = node.status.allocatable
-        nodes_info.append({
-            "name": node.metadata.name,
-            "cpu_capacity": int(cap.get("cpu", 0)),
-            "cpu_allocatable": int(alloc.get("cpu", 0)),
-            "mem_capacity": round(int(cap.get("memory", "0Ki")[:-2]) / 1024 / 1024, 2),  # GiB
-            "mem_allocatable": round(int(alloc.get("memory", "0Ki")[:-2]) / 1024 / 1024, 2),  # GiB
-            "ready": any(
-                cond.type == "Ready" and cond.status == "True"
-                for cond in node.status.conditions
-            ),
-        })
-
-    # Merge usage from metrics server
-    try:
-        usage = custom.list_cluster_custom_object(
-            group="metrics.k8s.io", version="v1beta1", plural="nodes"
+        return custom.list_cluster_custom_object(
+            group="metrics.k8s.io", version="v1beta1", plural=plural
+        )["items"]
+    except Exception as ex:
+        _handle_exception(ex)
+        return None
+
+
+def _restarts(pod) -> int:
+    return sum(c.restart_count for c in pod.status.container_statuses or [])
+
+
+# ---------- Snapshot ----------
+class ClusterSnapshot:
+    """
+    One read of the cluster: a pod list, a node list and the metrics-server
+    usage for each, taken together. Pod counts, node usage and pod details are
+    all derived from these lists, so a refresh costs one call per resource no
+    matter how many views use the result.
+    """
+
+    def __init__(self, pods, nodes, node_usage, pod_usage):
+        self.pods = pods
+        self.nodes = nodes
+        self.node_usage = node_usage  # metrics items, or None without metrics-server
+        self.pod_usage = pod_usage or []
+
+    @classmethod
+    def take(cls) -> "ClusterSnapshot":
+        _, custom = _get_k8s_client()
+        return cls(
+            pods=_list_pods(),
+            nodes=_list_nodes(),
+            node_usage=_list_metrics(custom, "nodes"),
+            pod_usage=_list_metrics(custom, "pods"),
         )
+
+    # ---------- Pod metrics ----------
+    def pod_counts(self):
+        pods_status = {"running": 0, "pending": 0, "failed": 0}
+        for pod in self.pods:
+            phase = pod.status.phase.lower()
+            if phase in pods_status:
+                pods_status[phase] += 1
+        total_pods = sum(pods_status.values())
+        return pods_status, total_pods
+
+    # ---------- Node metrics ----------
+    def nodes_info(self):
+        nodes_info = []
+        for node in self.nodes:
+            cap = node.status.capacity
+            alloc = node.status.allocatable
+            nodes_info.append({
+                "name": node.metadata.name,
+                "cpu_capacity": int(cap.get("cpu", 0)),
+                "cpu_allocatable": int(alloc.get("cpu", 0)),
+                "mem_capacity": round(_parse_memory(cap.get("memory", "0")), 2),  # GiB
+                "mem_allocatable": round(_parse_memory(alloc.get("memory", "0")), 2),  # GiB
+                "ready": any(
+                    cond.type == "Ready" and cond.status == "True"
+                    for cond in node.status.conditions or []
+                ),
+            })
+
+        # Merge usage from metrics server; without it (or if its response
+        # can't be merged) usage is unknown rather than zero
+        if self.node_usage is not None:
+            try:
+                return self._merge_node_usage(nodes_info)
+            except Exception as ex:
+                _handle_exception(ex)
+        for node in nodes_info:
+            node["cpu_usage"] = node["mem_usage"] = None
+            node["cpu_percent"] = node["mem_percent"] = None
+        return nodes_info, None, None
+
+    def _merge_node_usage(self, nodes_info):
         usage_map = {}
-        for u in usage["items"]:
+        for u in self.node_usage:
             name = u["metadata"]["name"]
             cpu_usage = _parse_cpu(u["usage"]["cpu"])
             mem_usage = _parse_memory(u["usage"]["memory"])
@@ -120,130 +250,111 @@ def _get_nodes(v1: client.CoreV1Api, custom: client.CustomObjectsApi):
 
         cluster_cpu_percent = round((total_cpu_usage / total_cpu_capacity) * 100, 1) if total_cpu_capacity else None
         cluster_mem_percent = round((total_mem_usage / total_mem_capacity) * 100, 1) if total_mem_capacity else None
+        return nodes_info, cluster_cpu_percent, cluster_mem_percent
 
-    except Exception as ex:
-        _handle_exception(ex)
-        for node in nodes_info:
-            node["cpu_usage"] = node["mem_usage"] = None
-            node["cpu_percent"] = node["mem_percent"] = None
-        cluster_cpu_percent = cluster_mem_percent = None
-
-    return nodes_info, cluster_cpu_percent, cluster_mem_percent
+    # ---------- Pod details ----------
+    def pod_details(self):
+        pod_usage_map = {}
+        try:
+            for item in self.pod_usage:
+                ns = item["metadata"]["namespace"]
+                name = item["metadata"]["name"]
+                container_usages = {}
+                for c in item["containers"]:
+                    cpu = _parse_cpu(c["usage"]["cpu"])
+                    mem = _parse_memory(c["usage"]["memory"])
+                    container_usages[c["name"]] = {"cpu": cpu, "mem": mem}
+                pod_usage_map[(ns, name)] = container_usages
+        except Exception as ex:
+            _handle_exception(ex)
+            pod_usage_map = {}
 
+        pod_details = []
+        for pod in self.pods:
+            ns = pod.metadata.namespace
+            pod_name = pod.metadata.name
+            node_name = pod.spec.node_name
+            status = pod.status.phase
+            restarts = _restarts(pod)
 
+            cpu_req_total = cpu_lim_total = 0.0
+            mem_req_total = mem_lim_total = 0.0
+            missing_resources = False
 
-def _collect_k8s_pod_details():
-    v1, custom = _get_k8s_client()
-    pod_details = []
+            for container in pod.spec.containers:
+                req = container.resources.requests or {}
+                lim = container.resources.limits or {}
 
-    # Get metrics for current usage (requires metrics-server)
-    pod_usage_map = {}
-    try:
-        usage = custom.list_cluster_custom_object(
-            group="metrics.k8s.io", version="v1beta1", plural="pods"
-        )
-        for item in usage["items"]:
-            ns = item["metadata"]["namespace"]
-            name = item["metadata"]["name"]
-            container_usages = {}
-            for c in item["containers"]:
-                cpu = _parse_cpu(c["usage"]["cpu"])
-                mem = _parse_memory(c["usage"]["memory"])
-                container_usages[c["name"]] = {"cpu": cpu, "mem": mem}
-            pod_usage_map[(ns, name)] = container_usages
-    except Exception as ex:
-        _handle_exception(ex)
+                cpu_req = _parse_cpu(req.get("cpu", "0")) if req.get("cpu") else None
+                cpu_lim = _parse_cpu(lim.get("cpu", "0")) if lim.get("cpu") else None
+                mem_req = _parse_memory(req.get("memory", "0")) if req.get("memory") else None
+                mem_lim = _parse_memory(lim.get("memory", "0")) if lim.get("memory") else None
 
-    # Iterate all pods
-    for pod in v1.list_pod_for_all_namespaces().items:
-        ns = pod.metadata.namespace
-        pod_name = pod.metadata.name
-        node_name = pod.spec.node_name
-        status = pod.status.phase
-        restarts = sum(c.restart_count for c in pod.status.container_statuses or [])
-
-        cpu_req_total = cpu_lim_total = 0.0
-        mem_req_total = mem_lim_total = 0.0
-        missing_resources = False
-
-        for container in pod.spec.containers:
-            req = container.resources.requests or {}
-            lim = container.resources.limits or {}
-
-            cpu_req = _parse_cpu(req.get("cpu", "0")) if req.get("cpu") else None
-            cpu_lim = _parse_cpu(lim.get("cpu", "0")) if lim.get("cpu") else None
-            mem_req = _parse_memory(req.get("memory", "0")) if req.get("memory") else None
-            mem_lim = _parse_memory(lim.get("memory", "0")) if lim.get("memory") else None
-
-            if cpu_req is None and cpu_lim is None and mem_req is None and mem_lim is None:
-                missing_resources = True
-
-            cpu_req_total += cpu_req or 0
-            cpu_lim_total += cpu_lim or 0
-            mem_req_total += mem_req or 0
-            mem_lim_total += mem_lim or 0
-
-        # Get current usage from metrics server if available
-        usage = pod_usage_map.get((ns, pod_name), {})
-        cpu_usage_total = sum(u.get("cpu", 0) for u in usage.values())
-        mem_usage_total = sum(u.get("mem", 0) for u in usage.values())
-
-        pod_details.append({
-            "namespace": ns,
-            "name": pod_name,
-            "node": node_name,
-            "status": status,
-            "restarts": restarts,
-            "cpu_request": round(cpu_req_total, 2) if cpu_req_total else None,
-            "cpu_limit": round(cpu_lim_total, 2) if cpu_lim_total else None,
-            "mem_request": round(mem_req_total, 2) if mem_req_total else None,
-            "mem_limit": round(mem_lim_total, 2) if mem_lim_total else None,
-            "cpu_usage": round(cpu_usage_total, 2) if cpu_usage_total else None,
-            "mem_usage": round(mem_usage_total, 2) if mem_usage_total else None,
-            "missing_resources": missing_resources,
-        })
-
-    return pod_details
+                if cpu_req is None and cpu_lim is None and mem_req is None and mem_lim is None:
+                    missing_resources = True
 
+                cpu_req_total += cpu_req or 0
+                cpu_lim_total += cpu_lim or 0
+                mem_req_total += mem_req or 0
+                mem_lim_total += mem_lim or 0
 
-# ---------- Wrappers ----------
-def collect_k8s_metrics_summary():
-    try: 
-        v1, custom = _get_k8s_client()
-        pods_status, total_pods = _get_pod_counts(v1)
-        nodes_info, cluster_cpu_percent, cluster_mem_percent = _get_nodes(v1, custom)
-        return pods_status, nodes_info, total_pods, cluster_cpu_percent, cluster_mem_percent
-    except Exception as ex:
-        print(f'Exception with collect_k8s_metrics_detailed: {ex}')
-        return None, None, None, None, None
+            # Get current usage from metrics server if available
+            usage = pod_usage_map.get((ns, pod_name), {})
+            cpu_usage_total = sum(u.get("cpu", 0) for u in usage.values())
+            mem_usage_total = sum(u.get("mem", 0) for u in usage.values())
 
-def collect_k8s_metrics_detailed():
-    """
-    Returns the same summary as the high-level dashboard,
-    plus pod-level details.
-    """
-    pods_status, nodes_info, total_pods, cluster_cpu_percent, cluster_mem_percent = collect_k8s_metrics_summary()
-    try: 
-        pod_details = _collect_k8s_pod_details()
+            pod_details.append({
+                "namespace": ns,
+                "name": pod_name,
+                "node": node_name,
+                "status": status,
+                "restarts": restarts,
+                "cpu_request": round(cpu_req_total, 2) if cpu_req_total else None,
+                "cpu_limit": round(cpu_lim_total, 2) if cpu_lim_total else None,
+                "mem_request": round(mem_req_total, 2) if mem_req_total else None,
+                "mem_limit": round(mem_lim_total, 2) if mem_lim_total else None,
+                "cpu_usage": round(cpu_usage_total, 2) if cpu_usage_total else None,
+                "mem_usage": round(mem_usage_total, 2) if mem_usage_total else None,
+                "missing_resources": missing_resources,
+            })
 
-        # ---------- Alerts ----------
-        cluster_alerts = []
-        if pods_status["pending"] > 0:
-            cluster_alerts.append(f"{pods_status['pending']} pods pending")
-        if pods_status["failed"] > 0:
-            cluster_alerts.append(f"{pods_status['failed']} pods failed")
+        return pod_details
 
+    def as_dict(self) -> dict:
+        pods_status, total_pods = self.pod_counts()
+        nodes_info, cluster_cpu_percent, cluster_mem_percent = self.nodes_info()
         return {
             "pods_status": pods_status,
             "total_pods": total_pods,
             "nodes_info": nodes_info,
             "cluster_cpu_percent": cluster_cpu_percent,
             "cluster_mem_percent": cluster_mem_percent,
-            "pod_details": pod_details,
-            "cluster_alerts": cluster_alerts,
+            "pod_details": self.pod_details(),
         }
+
+
+# ---------- Wrappers ----------
+@cached_collector(ttl=15)
+def collect_cluster_snapshot():
+    """ClusterSnapshot.as_dict() for the whole cluster, or None if the API is unreachable."""
+    try:
+        return ClusterSnapshot.take().as_dict()
     except Exception as ex:
-        print(f'Exception with collect_k8s_metrics_detailed: {ex}')
+        _log.error('Error collecting k8s cluster snapshot: %s', ex)
+        return None
+
+
+def summary_of(snapshot):
+    """(pods_status, nodes_info, total_pods, cluster_cpu_percent, cluster_mem_percent) from a snapshot."""
+    if snapshot is None:
+        return None, None, None, None, None
+    return (snapshot["pods_status"], snapshot["nodes_info"], snapshot["total_pods"],
+            snapshot["cluster_cpu_percent"], snapshot["cluster_mem_percent"])
+
+
+def detailed_of(snapshot):
+    """The k8s page context from a snapshot: the summary, pod details and cluster alerts."""
+    if snapshot is None:
         return {
             "pods_status": None,
             "total_pods": None,
@@ -252,4 +363,74 @@ def collect_k8s_metrics_detailed():
             "cluster_mem_percent": None,
             "pod_details": None,
             "cluster_alerts": None,
-        }
\ No newline at end of file
+        }
+
+    # ---------- Alerts ----------
+    pods_status = snapshot["pods_status"]
+    cluster_alerts = []
+    if pods_status["pending"] > 0:
+        cluster_alerts.append(f"{pods_status['pending']} pods pending")
+    if pods_status["failed"] > 0:
+        cluster_alerts.append(f"{pods_status['failed']} pods failed")
+    return {**snapshot, "cluster_alerts": cluster_alerts}
+
+
+def collect_k8s_metrics_summary():
+    return summary_of(collect_cluster_snapshot())
+
+
+def collect_k8s_metrics_detailed():
+    """
+    Returns the same summary as the high-level dashboard,
+    plus pod-level details.
+    """
+    return detailed_of(collect_cluster_snapshot())
+
+
+# ---------- Pod queries ----------
+# Answered from the pod informer's store when it is synced, so they cost no
+# API round trip; otherwise from the cached cluster snapshot.
+_POD_ROW_FIELDS = ("namespace", "name", "status", "restarts")
+
+
+def _pod_rows(namespace: str | None = None) -> list[dict]:
+    pods = _synced_pods()
+    if pods is not None:
+        found = pods.by_index("namespace", namespace) if namespace else pods.items()
+        return [{
+            "namespace": pod.metadata.namespace,
+            "name": pod.metadata.name,
+            "status": pod.status.phase,
+            "restarts": _restarts(pod),
+        } for pod in found]
+    details = (collect_cluster_snapshot() or {}).get("pod_details") or []
+    return [
+        {field: p[field] for field in _POD_ROW_FIELDS}
+        for p in details
+        if not namespace or p["namespace"] == namespace
+    ]
+
+
+def pod_counts():
+    """(pods_status, total_pods) as in the summary, from the informer's phase index when synced."""
+    pods = _synced_pods()
+    if pods is None:
+        pods_status, _, total_pods, _, _ = summary_of(collect_cluster_snapshot())
+        return pods_status, total_pods
+    counts = pods.counts("phase")
+    pods_status = {phase: counts.get(phase.capitalize(), 0) for phase in ("running", "pending", "failed")}
+    return pods_status, sum(pods_status.values())
+
+
+def find_pods(name_contains: str = "", namespace: str = "") -> list[dict]:
+    """Pods whose name contains `name_contains` (case-insensitive), optionally in one namespace."""
+    needle = name_contains.lower()
+    return [p for p in _pod_rows(namespace or None) if needle in p["name"].lower()]
+
+
+def problem_pods() -> list[dict]:
+    """Pods that are neither Running nor finished, or that have restarted."""
+    return [
+        p for p in _pod_rows()
+        if (p["status"] != "Running" and p["status"] not in _DONE_PHASES) or (p["restarts"] or 0) > 0
+    ]
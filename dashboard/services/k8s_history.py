@@ -0,0 +1,186 @@
+"""
+Stored history of Kubernetes node and namespace resource usage.
+
+    sample_usage()                  # sample_k8s_usage, once a minute
+    collect_k8s_usage_history()     # trend charts + forecasts for the k8s page
+
+Each sample writes one K8sUsageSample row per node and per namespace from a
+ClusterSnapshot. The same run re-aggregates the current and previous UTC hour
+into K8sUsageHourly and prunes raw rows older than RAW_RETENTION, so the raw
+table stays at a couple of days of minutes while hourly rows are kept for
+HOURLY_RETENTION. The k8s page reads only the hourly table.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+
+from django.db.models import Avg, Count, Max, Sum
+from django.db.models.functions import TruncHour
+
+from config.utils import bulk_upsert
+from dashboard.models import K8sUsageHourly, K8sUsageSample
+from dashboard.services.cache import cached_collector
+from dashboard.services.k8s import ClusterSnapshot
+
+_log = logging.getLogger(__name__)
+
+RAW_RETENTION = timedelta(days=2)
+HOURLY_RETENTION = timedelta(days=400)
+
+_TREND_DAYS = 7
+_TOP_NAMESPACES = 10
+# A forecast needs at least this many hours of history to be worth showing
+_MIN_FORECAST_HOURS = 24
+_HOURLY_FIELDS = ("samples", "pods", "cpu_avg", "cpu_max", "mem_avg", "mem_max", "cpu_capacity", "mem_capacity")
+
+
+# ---------- Sampling ----------
+def _sample_rows(snapshot: dict, taken_at: datetime) -> list[K8sUsageSample]:
+    rows = []
+    pods_per_node = {}
+    namespaces = {}
+    for pod in snapshot["pod_details"]:
+        pods_per_node[pod["node"]] = pods_per_node.get(pod["node"], 0) + 1
+        ns = namespaces.setdefault(pod["namespace"], {"pods": 0, "cpu": 0.0, "mem": 0.0})
+        ns["pods"] += 1
+        ns["cpu"] += pod["cpu_usage"] or 0
+        ns["mem"] += pod["mem_usage"] or 0
+
+    for node in snapshot["nodes_info"]:
+        rows.append(K8sUsageSample(
+            taken_at=taken_at, scope="node", name=node["name"],
+            pods=pods_per_node.get(node["name"], 0),
+            cpu_cores=node["cpu_usage"], mem_gib=node["mem_usage"],
+            cpu_capacity=node["cpu_allocatable"], mem_capacity=node["mem_allocatable"],
+        ))
+    for name, ns in namespaces.items():
+        rows.append(K8sUsageSample(
+            taken_at=taken_at, scope="namespace", name=name,
+            pods=ns["pods"], cpu_cores=round(ns["cpu"], 3), mem_gib=round(ns["mem"], 3),
+        ))
+    return rows
+
+
+def _roll_up(since: datetime) -> int:
+    """Rewrite K8sUsageHourly for every hour from the one containing `since`. Returns rows written."""
+    first_hour = since.replace(minute=0, second=0, microsecond=0)
+    hours = (
+        K8sUsageSample.objects.filter(taken_at__gte=first_hour)
+        .annotate(hour=TruncHour("taken_at", tzinfo=timezone.utc))
+        .values("hour", "scope", "name")
+        .annotate(
+            samples=Count("id"), pods=Avg("pods"),
+            cpu_avg=Avg("cpu_cores"), cpu_max=Max("cpu_cores"),
+            mem_avg=Avg("mem_gib"), mem_max=Max("mem_gib"),
+            cpu_capacity=Avg("cpu_capacity"), mem_capacity=Avg("mem_capacity"),
+        )
+    )
+    rows = list(hours)
+    bulk_upsert(K8sUsageHourly, rows, ["hour", "scope", "name"], list(_HOURLY_FIELDS))
+    return len(rows)
+
+
+def _prune(now: datetime) -> int:
+    raw, _ = K8sUsageSample.objects.filter(taken_at__lt=now - RAW_RETENTION).delete()
+    hourly, _ = K8sUsageHourly.objects.filter(hour__lt=now - HOURLY_RETENTION).delete()
+    return raw + hourly
+
+
+def sample_usage() -> tuple[int, int, int]:
+    """
+    Store one usage sample for every node and namespace, refresh the hourly
+    rollups it touches and prune expired rows. Returns (samples, hourly rows,
+    pruned rows). Nothing is stored when metrics-server is unavailable.
+    """
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    snapshot = ClusterSnapshot.take().as_dict()
+    if snapshot["cluster_cpu_percent"] is None and snapshot["cluster_mem_percent"] is None:
+        _log.warning("metrics-server unavailable, no k8s usage sample stored")
+        return 0, 0, 0
+
+    rows = _sample_rows(snapshot, now)
+    K8sUsageSample.objects.bulk_create(rows)
+    # The previous hour too, so a sample that lands just after the hour turns still closes it
+    rolled = _roll_up(now - timedelta(hours=1))
+    return len(rows), rolled, _prune(now)
+
+
+# ---------- Trends ----------
+def _fit(points: list[tuple[float, float]]) -> tuple[float, float] | None:
+    """Least-squares (slope, intercept) of y over x, or None without enough spread."""
+    n = len(points)
+    if n < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var_x:
+        return None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+    return slope, mean_y - slope * mean_x
+
+
+def _forecast(trend: list[dict], usage: str, capacity: str) -> dict | None:
+    """
+    Linear growth of hourly `usage` across the trend window and how many
+    days until the fitted line reaches the latest `capacity`. `days_to_full`
+    is None when usage is flat or shrinking.
+    """
+    if not trend or not trend[-1][capacity]:
+        return None
+    last = datetime.fromisoformat(trend[-1]["hour"])
+    # x is in days before the latest hour, so gaps in sampling don't skew the slope
+    points = [
+        ((datetime.fromisoformat(row["hour"]) - last).total_seconds() / 86400, row[usage])
+        for row in trend if row[usage] is not None
+    ]
+    if len(points) < _MIN_FORECAST_HOURS:
+        return None
+    fit = _fit(points)
+    if fit is None:
+        return None
+    per_day, current = fit
+    days_to_full = None
+    if per_day > 0:
+        days_to_full = max(0.0, round((trend[-1][capacity] - current) / per_day, 1))
+    return {"per_day": round(per_day, 3), "current": round(current, 2), "days_to_full": days_to_full}
+
+
+@cached_collector(ttl=300)
+def collect_k8s_usage_history(days=_TREND_DAYS):
+    """
+    Cluster-wide hourly usage for the last `days` days (node rows summed per
+    hour), a linear capacity forecast for CPU and memory, and the namespaces
+    using the most memory on average over the window.
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    hourly = K8sUsageHourly.objects.filter(hour__gte=since)
+
+    trend = [
+        {
+            "hour": row["hour"].isoformat(),
+            "cpu_avg": row["cpu_avg"], "cpu_max": row["cpu_max"],
+            "mem_avg": row["mem_avg"], "mem_max": row["mem_max"],
+            "cpu_capacity": row["cpu_capacity"], "mem_capacity": row["mem_capacity"],
+        }
+        for row in hourly.filter(scope="node").values("hour").annotate(
+            cpu_avg=Sum("cpu_avg"), cpu_max=Sum("cpu_max"),
+            mem_avg=Sum("mem_avg"), mem_max=Sum("mem_max"),
+            cpu_capacity=Sum("cpu_capacity"), mem_capacity=Sum("mem_capacity"),
+        ).order_by("hour")
+    ]
+
+    namespaces = [
+        {"name": row["name"], "cpu_avg": round(row["cpu"] or 0, 3), "mem_avg": round(row["mem"] or 0, 2)}
+        for row in hourly.filter(scope="namespace").values("name").annotate(
+            cpu=Avg("cpu_avg"), mem=Avg("mem_avg"),
+        ).order_by("-mem")[:_TOP_NAMESPACES]
+    ]
+
+    return {
+        "trend": trend,
+        "forecast": {
+            "cpu": _forecast(trend, "cpu_avg", "cpu_capacity"),
+            "mem": _forecast(trend, "mem_avg", "mem_capacity"),
+        },
+        "namespaces": namespaces,
+    }
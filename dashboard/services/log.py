@@ -0,0 +1,68 @@
+"""
+Logging for the dashboard services.
+
+    import logging
+    _log = logging.getLogger(__name__)
+
+    _log.debug("Emporia search %s..%s: %d items", start, end, n, extra=log.span({"emporia.items": n}))
+    _log.warning("Error fetching weather: %s", ex)
+
+Services log through standard loggers under "dashboard.services", configured
+in settings.LOGGING:
+
+- Console output is at DASHBOARD_LOG_LEVEL and span events at
+  DASHBOARD_SPAN_LOG_LEVEL (both default INFO). The logger's own level is
+  the lower of the two, so with neither at DEBUG a debug call returns
+  before a record is built. Keep messages to counts and IDs, not payloads.
+- SpanEventHandler records each message at or above its level as an event
+  on the current OTel span. Attributes passed with `extra=log.span(...)`
+  are also set on the span itself. Nothing happens when no span is
+  recording.
+- SampleFilter passes only a fraction of a chatty logger's debug/info
+  records. Warnings and errors always pass. It is attached per logger in
+  LOGGING (e.g. network paging).
+"""
+import logging
+import random
+
+from opentelemetry import trace
+
+_SPAN_ATTRIBUTES = "span_attributes"
+
+
+def span(attributes: dict) -> dict:
+    """`extra=` for a log call: set these attributes on the current span too."""
+    return {_SPAN_ATTRIBUTES: attributes}
+
+
+class SampleFilter(logging.Filter):
+    """Pass about `rate` (0-1) of records below WARNING; warnings and errors always pass."""
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = float(rate)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+class SpanEventHandler(logging.Handler):
+    """Add each record to the current OTel span as an event (and its span attributes to the span)."""
+
+    def emit(self, record: logging.LogRecord):
+        current = trace.get_current_span()
+        if not current.is_recording():
+            return
+        try:
+            attributes = getattr(record, _SPAN_ATTRIBUTES, None) or {}
+            if attributes:
+                current.set_attributes(attributes)
+            current.add_event(record.getMessage(), {
+                "log.severity": record.levelname,
+                "log.logger": record.name,
+                **attributes,
+            })
+            if record.exc_info and record.exc_info[1] is not None:
+                current.record_exception(record.exc_info[1])
+        except Exception:
+            self.handleError(record)
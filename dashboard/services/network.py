@@ -1,9 +1,20 @@
+import logging
 import requests
-from datetime import datetime, timezone
-from config.utils import get_config
+from datetime import datetime, timedelta, timezone
+from django.db.models import Max
+from config.utils import Setting, bulk_upsert
+from dashboard.models import NetworkDailyRollup
+from dashboard.services import http
+from dashboard.services import aggregate
+from dashboard.services import async_http
+from dashboard.services import log
+from dashboard.services import paginate
+from dashboard.services.cache import cached_collector
 from urllib.parse import urlparse, urlunparse
 
-NETWORK_URL = get_config("NETWORK_URL")
+_log = logging.getLogger(__name__)
+
+NETWORK_URL = Setting("NETWORK_URL")
 
 # Collector writes a large sentinel (~1,800,000 ms = 30 min) when a ping/speedtest
 # times out. Any value at or above this threshold is a timeout, not a real latency.
@@ -16,250 +27,275 @@ def _get_metrics():
     Looks back up to 1 hour to find the latest non-null value for each metric.
     """
     try:
-        # Parse the URL to get base URL without query parameters
-        parsed_url = urlparse(NETWORK_URL)
-        base_url = urlunparse((
-            parsed_url.scheme,
-            parsed_url.netloc,
-            parsed_url.path,
-            '',
-            '',
-            ''
-        ))
+        base_url = _base_url(NETWORK_URL.get())
 
         # Fetch recent records (last hour, approximately 12 records if testing every 5 min)
         # Using limit of 50 to be safe
         params = {'page': 1, 'limit': 50}
-        response = requests.get(base_url, params=params)
+        response = http.get("network", base_url, params=params)
         response.raise_for_status()
         records = response.json()
 
-        if not records:
-            return None
-
-        # Initialize result with values from the most recent record
-        result = {
-            'tcp_latency': None,
-            'internet_ping': None,
-            'internet_download': None,
-            'internet_upload': None,
-            'online': records[0].get('online', False),
-            'id': records[0].get('id'),
-            'create_date': records[0].get('create_date'),
-            'update_date': records[0].get('update_date')
-        }
+        return _summarize(records)
+
+    except requests.RequestException as ex:
+        _log.warning("Error fetching network data: %s", ex)
+        return None
+
 
-        # Find the most recent non-null value for each metric
-        for record in records:
-            # Stop looking if we already have all metrics
-            if all([result['tcp_latency'] is not None,
-                    result['internet_ping'] is not None,
-                    result['internet_download'] is not None,
-                    result['internet_upload'] is not None]):
+async def _aget_metrics():
+    try:
+        records = await async_http.get_json(
+            "network", _base_url(await NETWORK_URL.aget()), params={'page': 1, 'limit': 50}
+        )
+    except async_http.HTTP_ERRORS as ex:
+        _log.warning("Error fetching network data: %s", ex)
+        return None
+    return _summarize(records)
+
+
+def _summarize(records):
+    """Reduce the most recent records (newest first) to one set of current metrics."""
+    if not records:
+        return None
+
+    # Initialize result with values from the most recent record
+    result = {
+        'tcp_latency': None,
+        'internet_ping': None,
+        'internet_download': None,
+        'internet_upload': None,
+        'online': records[0].get('online', False),
+        'id': records[0].get('id'),
+        'create_date': records[0].get('create_date'),
+        'update_date': records[0].get('update_date')
+    }
+
+    # Find the most recent non-null value for each metric
+    for record in records:
+        # Stop looking if we already have all metrics
+        if all([result['tcp_latency'] is not None,
+                result['internet_ping'] is not None,
+                result['internet_download'] is not None,
+                result['internet_upload'] is not None]):
+            break
+
+        # Check record age (only use records from last hour)
+        record_date = record.get('create_date', '')
+        if record_date:
+            record_time = datetime.fromisoformat(record_date.replace('Z', '+00:00'))
+            age = datetime.now(timezone.utc) - record_time
+            if age.total_seconds() > 3600:  # More than 1 hour old
                 break
 
-            # Check record age (only use records from last hour)
-            record_date = record.get('create_date', '')
-            if record_date:
-                record_time = datetime.fromisoformat(record_date.replace('Z', '+00:00'))
-                age = datetime.now(timezone.utc) - record_time
-                if age.total_seconds() > 3600:  # More than 1 hour old
-                    break
+        # Fill in missing metrics with most recent non-null values
+        if result['tcp_latency'] is None and record.get('tcp_latency') is not None:
+            result['tcp_latency'] = record.get('tcp_latency')
+
+        if result['internet_ping'] is None and record.get('internet_ping') is not None:
+            result['internet_ping'] = record.get('internet_ping')
+
+        if result['internet_download'] is None and record.get('internet_download') is not None:
+            result['internet_download'] = record.get('internet_download')
+
+        if result['internet_upload'] is None and record.get('internet_upload') is not None:
+            result['internet_upload'] = record.get('internet_upload')
+
+    # Flag timeout sentinels and blank the value so the UI shows "Timeout"
+    result['tcp_latency_timeout'] = (
+        result['tcp_latency'] is not None and result['tcp_latency'] >= _TIMEOUT_MS
+    )
+    result['internet_ping_timeout'] = (
+        result['internet_ping'] is not None and result['internet_ping'] >= _TIMEOUT_MS
+    )
+    if result['tcp_latency_timeout']:
+        result['tcp_latency'] = None
+    if result['internet_ping_timeout']:
+        result['internet_ping'] = None
+
+    # Set defaults for any metrics still null (but keep None for timeouts)
+    if result['tcp_latency'] is None and not result['tcp_latency_timeout']:
+        result['tcp_latency'] = 0
+    if result['internet_ping'] is None and not result['internet_ping_timeout']:
+        result['internet_ping'] = 0
+    if result['internet_download'] is None:
+        result['internet_download'] = 0
+    if result['internet_upload'] is None:
+        result['internet_upload'] = 0
+
+    return result
+
+
+def _base_url(url):
+    # Parse the URL to get base URL without query parameters
+    parsed_url = urlparse(url)
+    return urlunparse((
+        parsed_url.scheme,
+        parsed_url.netloc,
+        parsed_url.path,
+        '',
+        '',
+        ''
+    ))
+
+
+# Records per page when paging back through history (the API's maximum)
+_PAGE_LIMIT = 100
+# Pages past this are treated as empty; the collector writes ~144 records a day
+_MAX_PAGES = 2000
+# Days aggregated by the first sync_daily_rollups run, when the table is empty
+_BACKFILL_DAYS = 90
+
+_ROLLUP_FIELDS = (
+    "samples", "avg_latency", "min_latency", "max_latency", "p95_latency",
+    "avg_ping", "avg_download", "avg_upload", "uptime_ratio",
+)
+
+
+def _iter_records(start_date, end_date):
+    """
+    Yield collector records from start_date up to (not including) end_date,
+    both YYYY-MM-DD, newest first. Only the pages overlapping those days are
+    fetched (see services.paginate).
+    """
+    base_url = _base_url(NETWORK_URL.get())
 
-            # Fill in missing metrics with most recent non-null values
-            if result['tcp_latency'] is None and record.get('tcp_latency') is not None:
-                result['tcp_latency'] = record.get('tcp_latency')
+    def fetch_page(page):
+        response = http.get("network", base_url, params={'page': page, 'limit': _PAGE_LIMIT})
+        response.raise_for_status()
+        records = response.json()
+        _log.debug("Network page %d: %d records", page, len(records))
+        return records
 
-            if result['internet_ping'] is None and record.get('internet_ping') is not None:
-                result['internet_ping'] = record.get('internet_ping')
+    yield from paginate.iter_window(
+        fetch_page, _day_start(start_date), _day_start(end_date), _record_time, max_pages=_MAX_PAGES
+    )
 
-            if result['internet_download'] is None and record.get('internet_download') is not None:
-                result['internet_download'] = record.get('internet_download')
 
-            if result['internet_upload'] is None and record.get('internet_upload') is not None:
-                result['internet_upload'] = record.get('internet_upload')
+def _day_start(day):
+    return datetime.fromisoformat(day).replace(tzinfo=timezone.utc).timestamp()
 
-        # Flag timeout sentinels and blank the value so the UI shows "Timeout"
-        result['tcp_latency_timeout'] = (
-            result['tcp_latency'] is not None and result['tcp_latency'] >= _TIMEOUT_MS
-        )
-        result['internet_ping_timeout'] = (
-            result['internet_ping'] is not None and result['internet_ping'] >= _TIMEOUT_MS
-        )
-        if result['tcp_latency_timeout']:
-            result['tcp_latency'] = None
-        if result['internet_ping_timeout']:
-            result['internet_ping'] = None
-
-        # Set defaults for any metrics still null (but keep None for timeouts)
-        if result['tcp_latency'] is None and not result['tcp_latency_timeout']:
-            result['tcp_latency'] = 0
-        if result['internet_ping'] is None and not result['internet_ping_timeout']:
-            result['internet_ping'] = 0
-        if result['internet_download'] is None:
-            result['internet_download'] = 0
-        if result['internet_upload'] is None:
-            result['internet_upload'] = 0
-
-        return result
 
-    except requests.RequestException as ex:
-        print(f"Error fetching network data: {ex}")
-        return None
+def _record_time(item):
+    create_date = item.get('create_date')
+    if not create_date:
+        return float('-inf')
+    return datetime.fromisoformat(create_date.replace('Z', '+00:00')).timestamp()
 
 
-def _get_metrics_by_month(year, month):
+def _rollup_days(records, start_date, end_date):
+    """
+    Aggregate records into per-day rollups (NetworkDailyRollup fields) for days
+    with start_date <= day < end_date. Returns {YYYY-MM-DD: fields}. Records
+    are folded in as they arrive, so memory is set by the number of days.
     """
-    Fetch network metrics for a specific month.
+    days = aggregate.GroupAggregator(
+        key_of=aggregate.day_in(start_date, end_date, lambda item: item.get("create_date", "").split("T")[0]),
+        metrics={
+            "latency": lambda item: _real_latency(item.get("tcp_latency")),
+            "ping": lambda item: _real_latency(item.get("internet_ping")),
+            "download": lambda item: item.get("internet_download"),
+            "upload": lambda item: item.get("internet_upload"),
+            "online": lambda item: 1 if item.get("online") else 0,
+        },
+        quantiles=("latency",),
+    ).consume(records)
+
+    return {
+        day: {
+            "samples": days.rows[day],
+            "avg_latency": stats["latency"].mean,
+            "min_latency": stats["latency"].min,
+            "max_latency": stats["latency"].max,
+            "p95_latency": stats["latency"].quantile(0.95),
+            "avg_ping": stats["ping"].mean,
+            "avg_download": stats["download"].mean,
+            "avg_upload": stats["upload"].mean,
+            "uptime_ratio": stats["online"].mean,
+        }
+        for day, stats in days.groups.items()
+    }
+
+
+def _real_latency(value):
+    """`value` unless it is missing or a timeout sentinel."""
+    return value if value is not None and value < _TIMEOUT_MS else None
 
-    Args:
-        year: Year (e.g., 2025)
-        month: Month number (1-12)
 
-    Returns:
-        List of daily network metrics for the month, sorted by date.
+def _chart_row(day, rollup):
+    """A rollup in the shape the monthly chart expects (0 for days without samples)."""
+    return {
+        "date": day,
+        "download": rollup["avg_download"] or 0,
+        "upload": rollup["avg_upload"] or 0,
+        "ping": rollup["avg_ping"] or 0,
+        "tcp_latency": rollup["avg_latency"] or 0,
+    }
+
+
+def sync_daily_rollups(backfill_days=_BACKFILL_DAYS):
     """
-    # Calculate the first day of the month
-    start_dt = datetime(year, month, 1, tzinfo=timezone.utc)
+    Store rollups for every complete UTC day after the newest stored one (or
+    the last `backfill_days` days when the table is empty). Only the pages
+    covering those days are fetched. Returns the number of days written.
+    """
+    today = datetime.now(timezone.utc).date()
+    latest = NetworkDailyRollup.objects.aggregate(latest=Max("date"))["latest"]
+    first_day = latest + timedelta(days=1) if latest else today - timedelta(days=backfill_days)
+    if first_day >= today:
+        return 0
+
+    start_date, end_date = first_day.isoformat(), today.isoformat()
+    rollups = _rollup_days(_iter_records(start_date, end_date), start_date, end_date)
+    rows = [{"date": day, **fields} for day, fields in rollups.items()]
+    bulk_upsert(NetworkDailyRollup, rows, ["date"], list(_ROLLUP_FIELDS))
+    return len(rows)
+
+
+def _get_metrics_by_month(year, month):
+    """
+    Daily network metrics for one month, sorted by date.
 
-    # Calculate the last day of the month
+    Complete days come from NetworkDailyRollup. Only days the table doesn't
+    have yet (normally just today) are aggregated from the live API, so a
+    finished month never touches the collector.
+    """
+    start_dt = datetime(year, month, 1, tzinfo=timezone.utc)
     if month == 12:
         end_dt = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
     else:
         end_dt = datetime(year, month + 1, 1, tzinfo=timezone.utc)
-
     start_date = start_dt.strftime("%Y-%m-%d")
     end_date = end_dt.strftime("%Y-%m-%d")
 
-    try:
-        # Parse the URL to get base URL without query parameters
-        parsed_url = urlparse(NETWORK_URL)
-
-        # Build base URL without query parameters
-        base_url = urlunparse((
-            parsed_url.scheme,
-            parsed_url.netloc,
-            parsed_url.path,
-            '',
-            '',
-            ''
-        ))
-
-        # Calculate how many pages we need based on how far back the month is
-        # Assume ~144 records per day, 100 records per page
-        now = datetime.now(timezone.utc)
-        days_back = (now - start_dt).days
-        estimated_pages = int((days_back * 144) / 100) + 10  # Add 10 page buffer
-        max_pages = min(estimated_pages, 200)  # Cap at 200 pages for safety
-
-        print(f"[DEBUG] Selected month is ~{days_back} days back, fetching ~{max_pages} pages")
-
-        # Fetch historical data using pagination (API max limit is 100)
-        # Keep fetching until we have data covering the entire selected month
-        network_items = []
-        page = 0
-
-        for page in range(1, max_pages + 1):
-            params = {'page': page, 'limit': 100}
-            response = requests.get(base_url, params=params)
-
-            if response.status_code != 200:
-                print(f"[DEBUG] Stopped pagination at page {page}: status {response.status_code}")
-                break
-
-            page_data = response.json()
-            if not page_data:
-                print(f"[DEBUG] No more data at page {page}")
-                break
-
-            network_items.extend(page_data)
-
-            # Check dates in this page to see if we've reached the start of the month
-            for item in page_data:
-                item_date = item.get('create_date', '').split('T')[0]
-                if item_date and item_date >= start_date and item_date < end_date:
-                    # We found data within our target month
-                    if item_date[:7] == start_date[:7]:  # Check if it's from the start of the month
-                        has_start_of_month = True
-
-            # Check the oldest date in this page
-            if page_data:
-                oldest_date = page_data[-1].get('create_date', '').split('T')[0]
-                # If we've gone past the start of the month, we can stop
-                if oldest_date and oldest_date < start_date:
-                    print(f"[DEBUG] Reached data before month start ({oldest_date}) at page {page}, stopping")
-                    break
-
-        print(f"[DEBUG] Monthly Network total records fetched: {len(network_items)} items after {page} pages")
-
-        # Group by date and calculate daily averages
-        daily_data = {}
-        for item in network_items:
-            create_date = item.get("create_date", "")
-            if not create_date:
-                continue
-
-            # Extract just the date part
-            date_only = create_date.split("T")[0]
-
-            # Filter to only include dates in the selected month
-            if start_date <= date_only < end_date:
-                if date_only not in daily_data:
-                    daily_data[date_only] = {
-                        "download": [],
-                        "upload": [],
-                        "ping": [],
-                        "tcp_latency": []
-                    }
-
-                # Append values if they exist (some records might have None)
-                download = item.get("internet_download")
-                upload = item.get("internet_upload")
-                ping = item.get("internet_ping")
-                tcp_latency = item.get("tcp_latency")
-
-                if download is not None:
-                    daily_data[date_only]["download"].append(download)
-                if upload is not None:
-                    daily_data[date_only]["upload"].append(upload)
-                if ping is not None and ping < _TIMEOUT_MS:
-                    daily_data[date_only]["ping"].append(ping)
-                if tcp_latency is not None and tcp_latency < _TIMEOUT_MS:
-                    daily_data[date_only]["tcp_latency"].append(tcp_latency)
-
-        # Calculate averages for each day
-        metrics = []
-        for date, values in daily_data.items():
-            avg_download = sum(values["download"]) / len(values["download"]) if values["download"] else 0
-            avg_upload = sum(values["upload"]) / len(values["upload"]) if values["upload"] else 0
-            avg_ping = sum(values["ping"]) / len(values["ping"]) if values["ping"] else 0
-            avg_tcp_latency = sum(values["tcp_latency"]) / len(values["tcp_latency"]) if values["tcp_latency"] else 0
-
-            metrics.append({
-                "date": date,
-                "download": avg_download,
-                "upload": avg_upload,
-                "ping": avg_ping,
-                "tcp_latency": avg_tcp_latency
-            })
-
-        print(f"[DEBUG] Requested month: {year}-{month:02d} ({start_date} to {end_date})")
-        print(f"[DEBUG] Aggregated daily data for {len(daily_data)} unique dates")
-        if daily_data:
-            print(f"[DEBUG] Date range in results: {min(daily_data.keys())} to {max(daily_data.keys())}")
-        else:
-            print(f"[DEBUG] No data found for the selected month")
-
-        return sorted(metrics, key=lambda x: x["date"])
-
-    except requests.RequestException as e:
-        print(f"Error fetching network metrics for {year}-{month}: {e}")
-        return []
-
-
+    stored = NetworkDailyRollup.objects.filter(date__gte=start_dt.date(), date__lt=end_dt.date())
+    metrics = [
+        _chart_row(row["date"].isoformat(), row)
+        for row in stored.values("date", *_ROLLUP_FIELDS)
+    ]
+
+    latest = NetworkDailyRollup.objects.aggregate(latest=Max("date"))["latest"]
+    live_from = max(start_date, (latest + timedelta(days=1)).isoformat() if latest else start_date)
+    tomorrow = (datetime.now(timezone.utc).date() + timedelta(days=1)).isoformat()
+    live_to = min(end_date, tomorrow)
+    if live_from < live_to:
+        try:
+            rollups = _rollup_days(_iter_records(live_from, live_to), live_from, live_to)
+        except requests.RequestException as e:
+            _log.warning("Error fetching network metrics for %s-%s: %s", year, month, e)
+            rollups = {}
+        metrics.extend(_chart_row(day, rollup) for day, rollup in rollups.items())
+        _log.debug("Network %s-%02d: %d live day(s) from %s", year, month, len(rollups), live_from,
+                   extra=log.span({"network.live_from": live_from, "network.live_days": len(rollups)}))
+
+    return sorted(metrics, key=lambda x: x["date"])
+
+
+@cached_collector(ttl=60, afetch=_aget_metrics)
 def collect_network_summary():
     return _get_metrics()
 
 
+@cached_collector(ttl=600)
 def collect_network_monthly_summary(year, month):
     return _get_metrics_by_month(year, month)
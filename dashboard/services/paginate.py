@@ -0,0 +1,111 @@
+"""
+Seek-and-fetch pagination for collector APIs that list records newest first.
+
+    rows = paginate.iter_window(fetch_page, start, end, timestamp_of)
+
+Instead of walking pages 1, 2, 3, ... until it passes the window, iter_window
+finds the first and last page that overlap [start, end) by searching page
+numbers: it interpolates a guess from page 1's time span, brackets the
+boundary around that guess with doubling steps, then bisects. Probed pages
+are kept until the range fetch reaches them, so probes that land inside the
+window are not fetched twice. The remaining pages of the range are fetched
+concurrently on a small thread pool and not kept; the window's rows are
+yielded in page order (newest first).
+
+A month ten weeks back costs a handful of probes plus that month's own pages,
+where a sequential walk would fetch every page since today.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+
+def iter_window(fetch_page, start: float, end: float, timestamp_of, max_workers: int = 4, max_pages: int = 2000):
+    """
+    Yield the rows with start <= timestamp_of(row) < end.
+
+    `fetch_page(n)` returns page n (1-based) as a list of rows sorted newest
+    first, and an empty list past the last page; it should raise on errors
+    rather than return [] so a failed request isn't mistaken for the end.
+    Timestamps are epoch seconds. Pages beyond `max_pages` are treated as empty.
+    """
+    pages = _Pages(fetch_page, max_pages)
+    first = _first_page_before(pages, end, timestamp_of, _guess_page(pages, end, timestamp_of))
+    last = _first_page_before(pages, start, timestamp_of, _guess_page(pages, start, timestamp_of))
+    if not pages.get(first):
+        return
+
+    numbers = list(range(first, last + 1))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="paginate") as pool:
+        # Submit a bounded batch at a time so only a few pages are held in memory
+        for i in range(0, len(numbers), max_workers):
+            for rows in pool.map(pages.take, numbers[i:i + max_workers]):
+                for row in rows:
+                    if start <= timestamp_of(row) < end:
+                        yield row
+
+
+class _Pages:
+    """fetch_page with memoization of search probes, so the range fetch can reuse them."""
+
+    def __init__(self, fetch_page, max_pages: int):
+        self._fetch = fetch_page
+        self._max_pages = max_pages
+        self._fetched = {}
+
+    def get(self, n: int) -> list:
+        if n > self._max_pages:
+            return []
+        rows = self._fetched.get(n)
+        if rows is None:
+            rows = self._fetched[n] = self._fetch(n)
+        return rows
+
+    def take(self, n: int) -> list:
+        """Page n for the range fetch: a probe is handed over and forgotten, any other page isn't stored."""
+        if n > self._max_pages:
+            return []
+        rows = self._fetched.pop(n, None)
+        return self._fetch(n) if rows is None else rows
+
+
+def _guess_page(pages: _Pages, boundary: float, timestamp_of) -> int:
+    """Estimate the page holding `boundary` from the rate at which page 1 covers time."""
+    rows = pages.get(1)
+    if len(rows) < 2:
+        return 1
+    newest, oldest = timestamp_of(rows[0]), timestamp_of(rows[-1])
+    if boundary >= oldest or newest <= oldest:
+        return 1
+    seconds_per_page = newest - oldest
+    return 1 + int((oldest - boundary) / seconds_per_page) + 1
+
+
+def _first_page_before(pages: _Pages, boundary: float, timestamp_of, guess: int) -> int:
+    """The smallest page number whose oldest row is earlier than `boundary` (or which is empty)."""
+
+    def reaches(n):
+        if n < 1:
+            return False
+        rows = pages.get(n)
+        return not rows or timestamp_of(rows[-1]) < boundary
+
+    # Bracket the answer around the guess: reaches(lo) is False, reaches(hi) is True
+    step = 1
+    if reaches(guess):
+        hi, lo = guess, guess - 1
+        while reaches(lo):
+            hi, lo = lo, lo - step
+            step *= 2
+        lo = max(lo, 0)
+    else:
+        lo, hi = guess, guess + 1
+        while not reaches(hi):
+            lo, hi = hi, hi + step
+            step *= 2
+
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if reaches(mid):
+            hi = mid
+        else:
+            lo = mid
+    return hi
@@ -1,9 +1,9 @@
-import requests
 from datetime import datetime, timedelta
 import pytz
-from config.utils import get_config
+from config.utils import Setting
+from dashboard.services import http
 
-PROMETHEUS_URL = get_config("PROMETHEUS_URL", "http://prometheus-operator-kube-p-prometheus.monitoring.svc.cluster.local:9090")
+PROMETHEUS_URL = Setting("PROMETHEUS_URL", "http://prometheus-operator-kube-p-prometheus.monitoring.svc.cluster.local:9090")
 
 
 def _parse_earliest(earliest: str):
@@ -20,7 +20,7 @@ def _parse_earliest(earliest: str):
 
 def prom_instant_query(query: str) -> dict:
     try:
-        r = requests.get(f"{PROMETHEUS_URL}/api/v1/query", params={"query": query}, timeout=15)
+        r = http.get("prometheus", f"{PROMETHEUS_URL.get()}/api/v1/query", params={"query": query})
         r.raise_for_status()
         data = r.json()
         if data.get("status") != "success":
@@ -33,12 +33,12 @@ def prom_instant_query(query: str) -> dict:
 def prom_range_query(query: str, earliest: str = "-1h", step: str = "60s") -> dict:
     try:
         start, end = _parse_earliest(earliest)
-        r = requests.get(f"{PROMETHEUS_URL}/api/v1/query_range", params={
+        r = http.get("prometheus", f"{PROMETHEUS_URL.get()}/api/v1/query_range", params={
             "query": query,
             "start": start.timestamp(),
             "end": end.timestamp(),
             "step": step,
-        }, timeout=15)
+        })
         r.raise_for_status()
         data = r.json()
         if data.get("status") != "success":
@@ -1,66 +1,364 @@
+import logging
 from datetime import datetime, timedelta
+import hashlib
+import json
+import re
+import threading
 import time
 import pytz
 import requests
 import urllib3
+from django.core.cache import cache
 from jTookkit.jDateTime import DateUtility
-from config.utils import get_config
+from opentelemetry import metrics
+from config.utils import Setting
+from dashboard.services import http
+from dashboard.services import log
+from dashboard.services.cache import cached_collector
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+_log = logging.getLogger(__name__)
 
-SPLUNK_HOST = get_config("SPLUNK_HOST")
-SPLUNK_WEB_PORT = int(get_config("SPLUNK_WEB_PORT", 8000))
-SPLUNK_USER = get_config("SPLUNK_USER", "admin")
-SPLUNK_PASSWORD = get_config("SPLUNK_PASSWORD", "")
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-def _splunk_session():
-    web_base = f"http://{SPLUNK_HOST}:{SPLUNK_WEB_PORT}"
-    login_url = f"{web_base}/en-US/account/login"
-    session = requests.Session()
+SPLUNK_HOST = Setting("SPLUNK_HOST")
+SPLUNK_WEB_PORT = Setting("SPLUNK_WEB_PORT", 8000, cast=int)
+SPLUNK_USER = Setting("SPLUNK_USER", "admin")
+SPLUNK_PASSWORD = Setting("SPLUNK_PASSWORD", "")
 
-    session.get(login_url, timeout=10)
-    cval = session.cookies.get("cval", "")
+class SplunkError(Exception):
+    pass
 
-    session.post(login_url, data={
-        "username": SPLUNK_USER,
-        "password": SPLUNK_PASSWORD,
-        "cval": cval,
-    }, timeout=10)
 
-    return session, web_base
+class SplunkClient:
+    """
+    Process-wide authenticated client for Splunk's REST API via the Splunk Web
+    proxy. Logs in once and reuses the session cookies and CSRF token for every
+    search; a 401 or a 303 redirect to the login page triggers one re-login and
+    a retry. Shared by all threads: logins are serialised, and a thread that
+    finds the session expired only logs in again if no other thread already has.
+    """
 
-def _splunk_search(query: str, earliest: str = "-24h", latest: str = "now") -> dict:
+    def __init__(self, host: str, port: int, username: str, password: str):
+        self.port = port
+        self.web_base = f"http://{host}:{port}"
+        self.api_base = f"{self.web_base}/en-US/splunkd/__raw/services"
+        self._username = username
+        self._password = password
+        self._session = http.new_session("splunk")
+        self._login_lock = threading.Lock()
+        self._csrf_token = ""
+        self._generation = 0  # bumped on every successful login
+
+    def _login(self):
+        login_url = f"{self.web_base}/en-US/account/login"
+        self._session.cookies.clear()
+        self._session.get(login_url)
+        cval = self._session.cookies.get("cval", "")
+        self._session.post(login_url, data={
+            "username": self._username,
+            "password": self._password,
+            "cval": cval,
+        })
+        token = self._session.cookies.get(f"splunkweb_csrf_token_{self.port}", "")
+        if not token:
+            raise SplunkError("Splunk login failed")
+        self._csrf_token = token
+        self._generation += 1
+
+    def _ensure_login(self, stale_generation: int | None = None) -> int:
+        """
+        Log in if there is no session yet, or if `stale_generation` is still the
+        current one (i.e. nobody has re-logged in since that request failed).
+        """
+        with self._login_lock:
+            if self._generation == 0 or self._generation == stale_generation:
+                self._login()
+            return self._generation
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Call `{api_base}/{path}` with the session credentials, re-authenticating once if needed."""
+        generation = self._ensure_login()
+        response = self._send(method, path, **kwargs)
+        if response.status_code in (401, 303):
+            # Release the connection first: a stream=True response holds it until closed
+            response.close()
+            self._ensure_login(stale_generation=generation)
+            response = self._send(method, path, **kwargs)
+        return response
+
+    def _send(self, method: str, path: str, **kwargs) -> requests.Response:
+        headers = {"X-Splunk-Form-Key": self._csrf_token, "X-Requested-With": "XMLHttpRequest"}
+        headers.update(kwargs.pop("headers", {}))
+        return self._session.request(
+            method, f"{self.api_base}/{path}", headers=headers, allow_redirects=False, **kwargs
+        )
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _splunk_client() -> SplunkClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = SplunkClient(SPLUNK_HOST.get(), SPLUNK_WEB_PORT.get(), SPLUNK_USER.get(), SPLUNK_PASSWORD.get())
+    return _client
+
+
+def _splunk_search(query: str, earliest: str = "-24h", latest: str = "now", oneshot: bool = True) -> dict:
+    """
+    Run `query` and return {"success", "data"/"message"}. Short searches use a
+    oneshot request, which returns the results with no job to poll; one that
+    comes back at its row cap may be truncated, so it is rerun as a job. Pass
+    oneshot=False for slow searches: they run as a job that is polled with
+    backoff, and all of its results are collected page by page. Successful
+    results are cached (see _result_cache_key).
+    """
+    key, ttl = _result_cache_key(query, earliest, latest)
+    data = _cached_result(key)
+    if data is not None:
+        return {"success": True, "data": data}
+    started = time.monotonic()
     try:
-        session, web_base = _splunk_session()
-        jobs_url = f"{web_base}/en-US/splunkd/__raw/services/search/jobs"
-        csrf_token = session.cookies.get(f"splunkweb_csrf_token_{SPLUNK_WEB_PORT}", "")
-
-        r = session.post(jobs_url, data={
-            "search": query,
-            "output_mode": "json",
-            "earliest_time": earliest,
-            "latest_time": latest,
-        }, headers={"X-Splunk-Form-Key": csrf_token, "X-Requested-With": "XMLHttpRequest"}, timeout=10)
-
-        if r.status_code != 201:
-            return {"success": False, "data": [], "message": f"Job create failed: {r.status_code} {r.text[:300]}"}
-        sid = r.json()["sid"]
-
-        status_url = f"{jobs_url}/{sid}"
-        for _ in range(60):
-            sr = session.get(status_url, params={"output_mode": "json"}, timeout=10)
-            state = sr.json().get("entry", [{}])[0].get("content", {}).get("dispatchState", "")
-            if state == "DONE":
-                break
-            time.sleep(0.5)
-        else:
-            return {"success": False, "data": [], "message": "Search job timed out"}
-
-        rr = session.get(f"{status_url}/results", params={"output_mode": "json", "count": 1000}, timeout=15)
-        results = rr.json().get("results", [])
-        return {"success": True, "data": results}
+        if oneshot:
+            data = _oneshot(query, earliest, latest)
+            if len(data) >= _ONESHOT_MAX_RESULTS:
+                _log.debug("Splunk oneshot over %s..%s hit its %d row cap, rerunning as a job",
+                           earliest, latest, _ONESHOT_MAX_RESULTS)
+                oneshot = False
+        if not oneshot:
+            data = list(_iter_job_results(query, earliest, latest))
     except Exception as e:
+        _log.warning("Splunk search over %s..%s failed: %s", earliest, latest, e)
         return {"success": False, "data": [], "message": str(e)}
+    duration_ms = int((time.monotonic() - started) * 1000)
+    _log.debug("Splunk %s search over %s..%s: %d rows in %d ms", "oneshot" if oneshot else "job",
+               earliest, latest, len(data), duration_ms,
+               extra=log.span({"splunk.rows": len(data), "splunk.duration_ms": duration_ms}))
+    cache.set(key, data, ttl)
+    return {"success": True, "data": data}
+
+
+# Query-result cache. Searches over a window that ends "now" (or any relative
+# time) are bucketed to the minute: repeats within the same minute share one
+# result, which lives only as long as that minute. Windows that end at an
+# absolute time safely in the past can no longer change and are kept for a day.
+# Results go to the Django cache, the database cache in settings.CACHES, so
+# every web worker and pod reuses a search any one of them ran.
+_RESULT_CACHE_PREFIX = "dashboard:splunk:"
+_LIVE_BUCKET_SECONDS = 60
+_HISTORICAL_TTL = 24 * 3600
+# Events can be indexed a few minutes after they happen; a window ending more
+# recently than this still counts as live.
+_INDEXING_LAG = 300
+
+# Collapses whitespace runs that are not inside a double-quoted string
+_SPL_WHITESPACE = re.compile(r'("(?:[^"\\]|\\.)*")|\s+')
+
+_result_cache_lookups = metrics.get_meter("homelab-hub").create_counter(
+    name="splunk.result_cache.lookups",
+    description="Splunk query-result cache lookups, by result (hit or miss)",
+)
+
+
+def _result_cache_key(query: str, earliest: str, latest: str) -> tuple[str, int]:
+    """Cache key and TTL for `query` over [earliest, latest]."""
+    normalized = _SPL_WHITESPACE.sub(lambda m: m.group(1) or " ", query).strip()
+    end = _absolute_time(latest)
+    if end is not None and end < time.time() - _INDEXING_LAG:
+        window, ttl = f"{earliest}|{latest}", _HISTORICAL_TTL
+    else:
+        bucket = int(time.time() // _LIVE_BUCKET_SECONDS)
+        window, ttl = f"{earliest}|{latest}|{bucket}", _LIVE_BUCKET_SECONDS
+    digest = hashlib.sha256(f"{normalized}\n{window}".encode()).hexdigest()
+    return _RESULT_CACHE_PREFIX + digest, ttl
+
+
+def _absolute_time(value: str) -> float | None:
+    """Epoch seconds for an absolute Splunk time (epoch or ISO 8601), None for relative ones."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _cached_result(key: str) -> list | None:
+    data = cache.get(key)
+    _result_cache_lookups.add(1, {"result": "miss" if data is None else "hit"})
+    return data
+
+
+# Results returned by a oneshot search; a search that reaches it is rerun as a job
+_ONESHOT_MAX_RESULTS = 1000
+# Rows fetched per request when paging through a job's results
+_PAGE_SIZE = 1000
+# Job polling: first check after 50 ms, then 1.5x longer each time, capped at 2 s
+_POLL_INITIAL = 0.05
+_POLL_MAX = 2.0
+_POLL_FACTOR = 1.5
+# How long a search may run, for both job polling and oneshot/export reads
+_SEARCH_TIMEOUT = 60.0
+
+
+def _search_timeout() -> tuple[float, float]:
+    # Oneshot and export responses only arrive once the search has produced
+    # them, so they get the whole search budget as their read timeout.
+    return (http.upstream_config("splunk").connect_timeout, _SEARCH_TIMEOUT)
+
+
+def _oneshot(query: str, earliest: str, latest: str) -> list:
+    r = _splunk_client().request("POST", "search/jobs", data={
+        "search": query,
+        "output_mode": "json",
+        "earliest_time": earliest,
+        "latest_time": latest,
+        "exec_mode": "oneshot",
+        "count": _ONESHOT_MAX_RESULTS,
+    }, timeout=_search_timeout())
+    if r.status_code != 200:
+        raise SplunkError(f"Oneshot search failed: {r.status_code} {r.text[:300]}")
+    return r.json().get("results", [])
+
+
+def _iter_job_results(query: str, earliest: str, latest: str, page_size: int = _PAGE_SIZE):
+    """Run `query` as a search job and yield its result rows, one page of `page_size` at a time."""
+    client = _splunk_client()
+    sid = _create_job(client, query, earliest, latest)
+    _wait_for_job(client, sid)
+    yield from _iter_pages(client, sid, page_size)
+
+
+def _create_job(client: "SplunkClient", query: str, earliest: str, latest: str) -> str:
+    r = client.request("POST", "search/jobs", data={
+        "search": query,
+        "output_mode": "json",
+        "earliest_time": earliest,
+        "latest_time": latest,
+    })
+    if r.status_code != 201:
+        raise SplunkError(f"Job create failed: {r.status_code} {r.text[:300]}")
+    return r.json()["sid"]
+
+
+def _job_done(client: "SplunkClient", sid: str) -> bool:
+    """Whether job `sid` has finished. Raises SplunkError if it failed."""
+    sr = client.request("GET", f"search/jobs/{sid}", params={"output_mode": "json"})
+    content = sr.json().get("entry", [{}])[0].get("content", {})
+    state = content.get("dispatchState", "")
+    if state == "FAILED":
+        messages = "; ".join(m.get("text", "") for m in content.get("messages", []))
+        raise SplunkError(f"Search job failed: {messages or sid}")
+    return state == "DONE"
+
+
+def _poll_delays():
+    """Sleep intervals for job polling, ending once the search budget is spent."""
+    deadline = time.monotonic() + _SEARCH_TIMEOUT
+    delay = _POLL_INITIAL
+    while time.monotonic() + delay <= deadline:
+        yield delay
+        delay = min(delay * _POLL_FACTOR, _POLL_MAX)
+
+
+def _wait_for_job(client: "SplunkClient", sid: str):
+    if _job_done(client, sid):
+        return
+    for delay in _poll_delays():
+        time.sleep(delay)
+        if _job_done(client, sid):
+            return
+    raise SplunkError("Search job timed out")
+
+
+def _iter_pages(client: "SplunkClient", sid: str, page_size: int = _PAGE_SIZE):
+    offset = 0
+    while True:
+        rr = client.request("GET", f"search/jobs/{sid}/results", params={
+            "output_mode": "json",
+            "offset": offset,
+            "count": page_size,
+        })
+        page = rr.json().get("results", [])
+        yield from page
+        if len(page) < page_size:
+            return
+        offset += page_size
+
+
+def splunk_search_batch(searches: dict[str, tuple[str, str, str]]):
+    """
+    Run several searches side by side. `searches` maps a name to
+    (query, earliest, latest). All jobs are submitted up front and polled
+    together, and (name, result) pairs are yielded in the order the jobs
+    finish. Each result has the same shape as _splunk_search's, and cached
+    results are yielded without a job. A page that needs every result waits
+    only as long as its slowest search.
+    """
+    client = _splunk_client()
+    pending = {}  # name -> (sid, cache key, ttl)
+    for name, (query, earliest, latest) in searches.items():
+        key, ttl = _result_cache_key(query, earliest, latest)
+        data = _cached_result(key)
+        if data is not None:
+            yield name, {"success": True, "data": data}
+            continue
+        try:
+            pending[name] = (_create_job(client, query, earliest, latest), key, ttl)
+        except Exception as e:
+            yield name, {"success": False, "data": [], "message": str(e)}
+
+    def finished():
+        for name, (sid, key, ttl) in list(pending.items()):
+            try:
+                if not _job_done(client, sid):
+                    continue
+                data = list(_iter_pages(client, sid))
+                cache.set(key, data, ttl)
+                result = {"success": True, "data": data}
+            except Exception as e:
+                result = {"success": False, "data": [], "message": str(e)}
+            del pending[name]
+            yield name, result
+
+    yield from finished()
+    for delay in _poll_delays():
+        if not pending:
+            return
+        time.sleep(delay)
+        yield from finished()
+    for name in pending:
+        yield name, {"success": False, "data": [], "message": "Search job timed out"}
+
+
+def iter_splunk_results(query: str, earliest: str = "-24h", latest: str = "now"):
+    """
+    Yield result rows for `query` as Splunk streams them from the export
+    endpoint. There is no job to poll and no row cap, and only one row is held
+    in memory at a time. Raises SplunkError or requests.RequestException on
+    failure.
+    """
+    r = _splunk_client().request("POST", "search/jobs/export", data={
+        "search": query,
+        "output_mode": "json",
+        "earliest_time": earliest,
+        "latest_time": latest,
+    }, stream=True, timeout=_search_timeout())
+    with r:
+        if r.status_code != 200:
+            raise SplunkError(f"Export search failed: {r.status_code} {r.text[:300]}")
+        for line in r.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            # Besides final rows the stream carries preview rows and "messages" objects
+            if "result" in event and not event.get("preview"):
+                yield event["result"]
 
 def _transform_splunk_collector_summary(results: list):
     ten_minutes_ago = datetime.now(tz=pytz.UTC) - timedelta(minutes=10)
@@ -92,38 +390,39 @@ def _transform_splunk_collector_summary(results: list):
         del item["_last_run_est_dt"]
     return transformed
 
-def otel_response_summary(earliest: str = "-1h") -> dict:
-    query = r"""
-        search index="otel_logging" event="Response"
-        | rename service.name as service_name
-        | eval endpoint = coalesce(endpoint, "none")
-        | eval service = coalesce(service, service_name, "none")
-        | eval status = coalesce(status, "")
-        | eval method = coalesce(method, "")
-        | eval path = coalesce(path, "")
-        | stats dc(transaction_id) as transactions by service, endpoint, method, status
-        | sort service, endpoint, method, status
-    """
-    result = _splunk_search(query, earliest=earliest)
+_RESPONSE_SUMMARY_QUERY = r"""
+    search index="otel_logging" event="Response"
+    | rename service.name as service_name
+    | eval endpoint = coalesce(endpoint, "none")
+    | eval service = coalesce(service, service_name, "none")
+    | eval status = coalesce(status, "")
+    | eval method = coalesce(method, "")
+    | eval path = coalesce(path, "")
+    | stats dc(transaction_id) as transactions by service, endpoint, method, status
+    | sort service, endpoint, method, status
+"""
+
+_SERVICE_STATUS_QUERY = r"""
+    search index="otel_logging" event="Response"
+    | rename service.name as service_name
+    | eval endpoint = coalesce(endpoint, "none")
+    | eval service = coalesce(service, service_name, "none")
+    | eval status = coalesce(status, "none")
+    | eval method = coalesce(method, "")
+    | eval path = coalesce(path, "")
+    | stats dc(transaction_id) as transactions by service status
+    | xyseries service status transactions
+    | sort service
+"""
+
+
+def _rows_result(result: dict) -> dict:
     if not result["success"]:
         return {"success": False, "data": [], "message": result.get("message", "Query failed")}
     return {"success": True, "data": result["data"]}
 
 
-def otel_service_status_summary(earliest: str = "-1h") -> dict:
-    query = r"""
-        search index="otel_logging" event="Response"
-        | rename service.name as service_name
-        | eval endpoint = coalesce(endpoint, "none")
-        | eval service = coalesce(service, service_name, "none")
-        | eval status = coalesce(status, "none")
-        | eval method = coalesce(method, "")
-        | eval path = coalesce(path, "")
-        | stats dc(transaction_id) as transactions by service status
-        | xyseries service status transactions
-        | sort service
-    """
-    result = _splunk_search(query, earliest=earliest)
+def _service_status_result(result: dict) -> dict:
     if not result["success"]:
         return {"success": False, "data": [], "status_columns": [], "message": result.get("message", "Query failed")}
     data = result["data"]
@@ -131,6 +430,27 @@ def otel_service_status_summary(earliest: str = "-1h") -> dict:
     return {"success": True, "data": data, "status_columns": status_cols}
 
 
+def otel_response_summary(earliest: str = "-1h") -> dict:
+    return _rows_result(_splunk_search(_RESPONSE_SUMMARY_QUERY, earliest=earliest))
+
+
+def otel_service_status_summary(earliest: str = "-1h") -> dict:
+    return _service_status_result(_splunk_search(_SERVICE_STATUS_QUERY, earliest=earliest))
+
+
+def otel_overview_summaries(earliest: str = "-1h") -> tuple[dict, dict]:
+    """
+    The OTEL overview's service x status pivot and its per-endpoint breakdown
+    (otel_response_summary, covering every service), run as one batch. The
+    breakdown lets the page open a service's endpoints without another search.
+    """
+    results = dict(splunk_search_batch({
+        "status": (_SERVICE_STATUS_QUERY, earliest, "now"),
+        "endpoints": (_RESPONSE_SUMMARY_QUERY, earliest, "now"),
+    }))
+    return _service_status_result(results["status"]), _rows_result(results["endpoints"])
+
+
 def otel_endpoint_summary(service: str, earliest: str = "-1h") -> dict:
     query = f"""
         search index="otel_logging" event="Response" service="{service}"
@@ -231,7 +551,8 @@ def otel_filtered_transactions(service: str = "", endpoint: str = "", method: st
     return {"success": True, "data": result["data"]}
 
 
-def otel_recent_transactions(earliest: str = "-1h", limit: int = 500) -> dict:
+def iter_recent_transactions(earliest: str = "-1h", limit: int = 500):
+    """Stream the rows behind otel_recent_transactions without holding them all in memory."""
     query = f"""
         search index="otel_logging" event="Response"
         | rename service.name as service_name
@@ -247,12 +568,18 @@ def otel_recent_transactions(earliest: str = "-1h", limit: int = 500) -> dict:
         | sort -_time
         | head {limit}
     """
-    result = _splunk_search(query, earliest=earliest)
-    if not result["success"]:
-        return {"success": False, "data": [], "message": result.get("message", "Query failed")}
-    return {"success": True, "data": result["data"]}
+    return iter_splunk_results(query, earliest=earliest)
+
+
+def otel_recent_transactions(earliest: str = "-1h", limit: int = 500) -> dict:
+    try:
+        data = list(iter_recent_transactions(earliest, limit))
+    except Exception as e:
+        return {"success": False, "data": [], "message": str(e)}
+    return {"success": True, "data": data}
 
 
+@cached_collector(ttl=120)
 def splunk_collector_summary():
     query = r"""
         search index="otel_logging"
@@ -272,8 +599,9 @@ def splunk_collector_summary():
         | eval max_duration = round(max_duration, 1)
         | sort component
     """
-    result = _splunk_search(query)
+    # Scans a day of every collector's logs: too slow for a oneshot request
+    result = _splunk_search(query, oneshot=False)
     if not result["success"]:
-        print(f"❌ Splunk query failed: {result['message']}")
+        _log.warning("Splunk collector summary query failed: %s", result["message"])
 
     return _transform_splunk_collector_summary(result["data"])
@@ -1,15 +1,30 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from django.db import close_old_connections
+from opentelemetry import trace as otel_trace
+
 from dashboard.services.k8s import collect_k8s_metrics_summary
 from dashboard.services.synology import collect_synology_summary
 from dashboard.services.network import collect_network_summary
 from dashboard.services.backup_status import collect_backup_status_summary
 from dashboard.services.aws_billing import collect_aws_billing_summary
-from claude_usage.services import collect_claude_dashboard_summary
+from claude_usage.services import collect_trailing_usage
 from monitoring.services import collect_host_status
+from dashboard.services.cache import cached_collector
+
+_tracer = otel_trace.get_tracer("homelab-hub.dashboard")
 
 _HIGH_USAGE = 85
 _AWS_BUDGET = 2.0
 _CLAUDE_WEEKLY_LIMIT = 90
 
+# All checks run concurrently; whatever hasn't finished within this budget is
+# reported as timed out so the overview costs roughly the slowest check.
+_CHECK_TIMEOUT = 8.0  # seconds
+
 
 def _check_k8s(issues):
     try:
@@ -17,6 +32,9 @@ def _check_k8s(issues):
     except Exception as e:
         return {"name": "Kubernetes", "status": "warn", "detail": "Unavailable"}
 
+    if pods is None:
+        return {"name": "Kubernetes", "status": "warn", "detail": "Unavailable"}
+
     status = "ok"
     detail = f"{pods.get('running', 0)}/{total} pods running"
 
@@ -154,11 +172,11 @@ def _check_aws(issues):
 
 def _check_claude(issues):
     try:
-        c = collect_claude_dashboard_summary()
+        snapshot = collect_trailing_usage()["snapshot"]
     except Exception:
         return {"name": "Claude Code", "status": "warn", "detail": "Unavailable"}
 
-    pct = c.get("weekly_pct")
+    pct = snapshot.weekly_pct if snapshot else None
     if pct is None:
         return {"name": "Claude Code", "status": "warn", "detail": "No data"}
 
@@ -169,17 +187,67 @@ def _check_claude(issues):
     return {"name": "Claude Code", "status": "ok", "detail": detail}
 
 
+_CHECKS = [
+    ("Kubernetes", _check_k8s),
+    ("Synology NAS", _check_synology),
+    ("Network", _check_network),
+    ("Monitored Hosts", _check_hosts),
+    ("Backups", _check_backup),
+    ("AWS Spending", _check_aws),
+    ("Claude Code", _check_claude),
+]
+
+# Shared across calls, one thread per check. A check whose previous run is
+# still going is not submitted again: callers wait on that run instead, so a
+# hung upstream ties up at most one thread per check and can't queue others.
+_pool = ThreadPoolExecutor(max_workers=len(_CHECKS), thread_name_prefix="status-check")
+_in_flight: dict[str, Future] = {}
+_in_flight_lock = threading.Lock()
+
+
+def _submit(name, fn) -> Future:
+    """The running future for check `name`, or a newly submitted one if it has none."""
+    with _in_flight_lock:
+        future = _in_flight.get(name)
+        if future is None or future.done():
+            future = _in_flight[name] = _pool.submit(contextvars.copy_context().run, _run_check, name, fn)
+        return future
+
+
+def _run_check(name, fn):
+    """Run one check with its own issue list, timing it. Executes on the pool."""
+    issues = []
+    started = time.monotonic()
+    try:
+        with _tracer.start_as_current_span("status.check", attributes={"check.name": name}):
+            check = fn(issues)
+    finally:
+        close_old_connections()
+    check["duration_ms"] = int((time.monotonic() - started) * 1000)
+    return check, issues
+
+
+@cached_collector(ttl=30)
 def collect_status_overview():
+    started = time.monotonic()
+    futures = [_submit(name, fn) for name, fn in _CHECKS]
+    wait(futures, timeout=_CHECK_TIMEOUT)
+
     issues = []
-    checks = [
-        _check_k8s(issues),
-        _check_synology(issues),
-        _check_network(issues),
-        _check_hosts(issues),
-        _check_backup(issues),
-        _check_aws(issues),
-        _check_claude(issues),
-    ]
+    checks = []
+    for (name, _), future in zip(_CHECKS, futures):
+        if not future.done():
+            checks.append({
+                "name": name, "status": "warn", "detail": "Timed out",
+                "duration_ms": int(_CHECK_TIMEOUT * 1000),
+            })
+            continue
+        try:
+            check, check_issues = future.result()
+        except Exception:
+            check, check_issues = {"name": name, "status": "warn", "detail": "Unavailable", "duration_ms": 0}, []
+        checks.append(check)
+        issues.extend(check_issues)
 
     if any(i["severity"] == "critical" for i in issues):
         overall = "critical"
@@ -195,4 +263,5 @@ def collect_status_overview():
         "overall": overall,
         "issues": issues,
         "checks": checks,
+        "duration_ms": int((time.monotonic() - started) * 1000),
     }
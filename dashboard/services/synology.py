@@ -1,20 +1,35 @@
+import logging
 import requests
-from config.utils import get_config
+from config.utils import Setting
+from dashboard.services import http
+from dashboard.services import async_http
+from dashboard.services.cache import cached_collector
 
-SYNOLOGY_URL = get_config("SYNOLOGY_URL")
+_log = logging.getLogger(__name__)
+
+SYNOLOGY_URL = Setting("SYNOLOGY_URL")
 
 
 def _get_metrics():
     results = {}
     try:
-        response = requests.get(SYNOLOGY_URL)
+        response = http.get("synology", SYNOLOGY_URL.get())
         response.raise_for_status()  # raise exception if status != 2xx
         results = response.json()[0]
     except requests.RequestException as ex:
-        print(f"Error fetching synology data: {ex}")
+        _log.warning("Error fetching synology data: %s", ex)
         return None
     return results
 
 
+async def _aget_metrics():
+    try:
+        return (await async_http.get_json("synology", await SYNOLOGY_URL.aget()))[0]
+    except async_http.HTTP_ERRORS as ex:
+        _log.warning("Error fetching synology data: %s", ex)
+        return None
+
+
+@cached_collector(ttl=60, afetch=_aget_metrics)
 def collect_synology_summary():
     return _get_metrics()
@@ -1,9 +1,9 @@
-import requests
 from datetime import datetime, timedelta
 import pytz
-from config.utils import get_config
+from config.utils import Setting
+from dashboard.services import http
 
-TEMPO_URL = get_config("TEMPO_URL", "http://tempo.monitoring.svc.cluster.local:3100")
+TEMPO_URL = Setting("TEMPO_URL", "http://tempo.monitoring.svc.cluster.local:3100")
 
 
 def _parse_earliest(earliest: str):
@@ -20,7 +20,7 @@ def _parse_earliest(earliest: str):
 
 def tempo_services() -> dict:
     try:
-        r = requests.get(f"{TEMPO_URL}/api/search/tag/service.name/values", timeout=10)
+        r = http.get("tempo", f"{TEMPO_URL.get()}/api/search/tag/service.name/values")
         r.raise_for_status()
         return {"success": True, "data": sorted(r.json().get("tagValues", []))}
     except Exception as e:
@@ -38,7 +38,7 @@ def tempo_recent_traces(service: str = "", earliest: str = "-1h", limit: int = 5
             tags_parts.append(f"name={root_span}")
         if tags_parts:
             params["tags"] = " ".join(tags_parts)
-        r = requests.get(f"{TEMPO_URL}/api/search", params=params, timeout=15)
+        r = http.get("tempo", f"{TEMPO_URL.get()}/api/search", params=params)
         r.raise_for_status()
         data = r.json()
         return {"success": True, "data": data.get("traces", []), "metrics": data.get("metrics", {})}
@@ -48,7 +48,7 @@ def tempo_recent_traces(service: str = "", earliest: str = "-1h", limit: int = 5
 
 def tempo_trace_detail(trace_id: str) -> dict:
     try:
-        r = requests.get(f"{TEMPO_URL}/api/traces/{trace_id}", timeout=10)
+        r = http.get("tempo", f"{TEMPO_URL.get()}/api/traces/{trace_id}")
         r.raise_for_status()
         return {"success": True, "data": r.json()}
     except Exception as e:
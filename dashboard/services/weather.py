@@ -1,32 +1,56 @@
+import logging
+import asyncio
 import requests
-from config.utils import get_config
+from config.utils import Setting
+from dashboard.services import http
+from dashboard.services import async_http
+from dashboard.services.cache import cached_collector
 
-WEATHER_URL = get_config("WEATHER_URL")
-FORECAST_URL = get_config("FORECAST_URL")
+_log = logging.getLogger(__name__)
+
+WEATHER_URL = Setting("WEATHER_URL")
+FORECAST_URL = Setting("FORECAST_URL")
  
 
 def _get_metrics():
     results = {}
     try:
         # Get the weather
-        response = requests.get(WEATHER_URL)
+        response = http.get("weather", WEATHER_URL.get())
         response.raise_for_status()  # raise exception if status != 2xx
         results["weather"] = response.json()[0]
     except requests.RequestException as e:
-        print(f"Error fetching weather: {e}")
+        _log.warning("Error fetching weather: %s", e)
         return None
 
     try:
         # Get the forecast
-        response = requests.get(FORECAST_URL)
+        response = http.get("weather", FORECAST_URL.get())
         response.raise_for_status()  # raise exception if status != 2xx
         results["forecast"] = response.json()
     except requests.RequestException as e:
-        print(f"Error fetching forecast: {e}")
+        _log.warning("Error fetching forecast: %s", e)
         return None
 
     return results
 
 
+async def _aget_metrics():
+    # Async twin of _get_metrics for the async card view; both calls in parallel.
+    weather, forecast = await asyncio.gather(
+        async_http.get_json("weather", await WEATHER_URL.aget()),
+        async_http.get_json("weather", await FORECAST_URL.aget()),
+        return_exceptions=True,
+    )
+    if isinstance(weather, Exception):
+        _log.warning("Error fetching weather: %s", weather)
+        return None
+    if isinstance(forecast, Exception):
+        _log.warning("Error fetching forecast: %s", forecast)
+        return None
+    return {"weather": weather[0], "forecast": forecast}
+
+
+@cached_collector(ttl=300, afetch=_aget_metrics)
 def collect_weather_summary():
     return _get_metrics()
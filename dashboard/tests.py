@@ -1,3 +1,135 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
+from kubernetes.utils import parse_quantity as reference_parse_quantity
 
-# Create your tests here.
+from dashboard.services import paginate
+from dashboard.services.k8s import _parse_cpu, _parse_memory, parse_quantity
+
+
+class ParseQuantityTests(SimpleTestCase):
+    # (quantity, value in base units)
+    VALID = [
+        ("0", 0),
+        ("1", 1),
+        ("1.5", 1.5),
+        (".5", 0.5),
+        ("+2", 2),
+        ("-2", -2),
+        ("100m", 0.1),
+        ("2500m", 2.5),
+        ("250000u", 0.25),
+        ("123456789n", 0.123456789),
+        ("1k", 1_000),
+        ("1M", 1_000_000),
+        ("1G", 10 ** 9),
+        ("1T", 10 ** 12),
+        ("1P", 10 ** 15),
+        ("1E", 10 ** 18),
+        ("1Ki", 1024),
+        ("128Mi", 128 * 2 ** 20),
+        ("1.5Gi", 1.5 * 2 ** 30),
+        ("2Ti", 2 * 2 ** 40),
+        ("1Pi", 2 ** 50),
+        ("1Ei", 2 ** 60),
+        ("1e3", 1_000),
+        ("1E3", 1_000),
+        ("1.5e2", 150),
+        ("5e-3", 0.005),
+        (" 64Mi ", 64 * 2 ** 20),
+    ]
+    INVALID = ["", "abc", "Mi", "1Z", "1e", "1 Mi", "1KiB", "1K", "--1", "1.2.3"]
+
+    def test_valid(self):
+        for quantity, expected in self.VALID:
+            with self.subTest(quantity=quantity):
+                self.assertAlmostEqual(parse_quantity(quantity), expected, delta=abs(expected) * 1e-12)
+
+    def test_matches_kubernetes_client(self):
+        for quantity, _ in self.VALID:
+            with self.subTest(quantity=quantity):
+                expected = float(reference_parse_quantity(quantity.strip()))
+                self.assertAlmostEqual(parse_quantity(quantity), expected, delta=abs(expected) * 1e-12)
+
+    def test_invalid(self):
+        for quantity in self.INVALID:
+            with self.subTest(quantity=quantity), self.assertRaises(ValueError):
+                parse_quantity(quantity)
+
+    def test_cpu_in_cores(self):
+        for quantity, cores in [("100m", 0.1), ("2", 2), ("500000000n", 0.5), ("1500u", 0.0015)]:
+            with self.subTest(quantity=quantity):
+                self.assertAlmostEqual(_parse_cpu(quantity), cores)
+
+    def test_memory_in_gib(self):
+        for quantity, gib in [("1Gi", 1), ("512Mi", 0.5), ("1048576Ki", 1), ("1073741824", 1), ("1G", 10 ** 9 / 2 ** 30)]:
+            with self.subTest(quantity=quantity):
+                self.assertAlmostEqual(_parse_memory(quantity), gib)
+
+    def test_unparseable_is_zero(self):
+        with self.assertLogs("dashboard.services.k8s", "WARNING"):
+            self.assertEqual(_parse_cpu("lots"), 0)
+        with self.assertLogs("dashboard.services.k8s", "WARNING"):
+            self.assertEqual(_parse_memory("1KiB"), 0)
+
+
+class FakePages:
+    """A newest-first page source over `timestamps`, counting fetches per page."""
+
+    def __init__(self, timestamps, per_page):
+        self.rows = sorted(timestamps, reverse=True)
+        self.per_page = per_page
+        self.fetches = {}
+
+    def __call__(self, n):
+        self.fetches[n] = self.fetches.get(n, 0) + 1
+        return self.rows[(n - 1) * self.per_page:n * self.per_page]
+
+
+class IterWindowTests(SimpleTestCase):
+    # (case, timestamps, per page, start, end)
+    CASES = [
+        ("inside first page", range(1, 1001), 50, 980, 995),
+        ("spans first page boundary", range(1, 1001), 50, 940, 960),
+        ("deep in history", range(1, 10001), 50, 3000, 5000),
+        ("oldest rows", range(1, 1001), 50, 0, 30),
+        ("whole history", range(1, 1001), 50, 0, 2000),
+        ("past last page", range(1001, 2001), 50, 0, 500),
+        ("newer than everything", range(1, 1001), 50, 5000, 6000),
+        ("page-sized window", range(1, 1001), 50, 501, 551),
+        ("exactly full pages", range(1, 501), 100, 150, 350),
+        ("single page of data", range(1, 11), 50, 3, 8),
+        ("sparse timestamps", range(0, 100000, 37), 25, 41000, 77000),
+        ("empty source", [], 50, 0, 100),
+    ]
+
+    def test_matches_full_scan(self):
+        for case, timestamps, per_page, start, end in self.CASES:
+            with self.subTest(case):
+                source = FakePages(timestamps, per_page)
+                rows = list(paginate.iter_window(source, start, end, lambda t: t))
+                self.assertEqual(rows, [t for t in source.rows if start <= t < end])
+
+    def test_fetches_each_page_once(self):
+        for case, timestamps, per_page, start, end in self.CASES:
+            with self.subTest(case):
+                source = FakePages(timestamps, per_page)
+                list(paginate.iter_window(source, start, end, lambda t: t))
+                self.assertEqual({n for n, count in source.fetches.items() if count > 1}, set())
+
+    def test_skips_pages_outside_window(self):
+        source = FakePages(range(1, 10001), 50)
+        list(paginate.iter_window(source, 3000, 5000, lambda t: t))
+        # 41 pages overlap the window; the search should add only a handful of probes
+        self.assertLess(len(source.fetches), 60)
+
+    def test_max_pages_treated_as_end(self):
+        source = FakePages(range(1, 1001), 50)
+        rows = list(paginate.iter_window(source, 0, 2000, lambda t: t, max_pages=4))
+        self.assertEqual(rows, source.rows[:200])
+        self.assertLessEqual(max(source.fetches), 4)
+
+    def test_errors_propagate(self):
+        def failing(n):
+            raise ConnectionError("upstream down")
+
+        with self.assertRaises(ConnectionError):
+            list(paginate.iter_window(failing, 0, 100, lambda t: t))
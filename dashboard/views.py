@@ -1,16 +1,18 @@
+import asyncio
 import json
-import requests as http_requests
+from asgiref.sync import sync_to_async
 from django.core.serializers.json import DjangoJSONEncoder
 from django.shortcuts import render
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
-from dashboard.services.k8s import collect_k8s_metrics_summary, collect_k8s_metrics_detailed
+from dashboard.services.k8s import collect_cluster_snapshot, collect_k8s_metrics_detailed, summary_of
+from dashboard.services.k8s_history import collect_k8s_usage_history
 from dashboard.services.synology import collect_synology_summary
 from dashboard.services.network import collect_network_summary, collect_network_monthly_summary
-from dashboard.services.emporia import collect_emporia_summary, collect_emporia_daily_summary, collect_emporia_monthly_summary, collect_emporia_monthly_category_summary
+from dashboard.services.emporia import collect_emporia_summary, collect_emporia_daily_summary, collect_emporia_month
 from dashboard.services.enphase import collect_enhase_summary
-from dashboard.services.splunk import splunk_collector_summary, otel_response_summary, otel_service_status_summary, otel_endpoint_summary, otel_transaction_list, otel_recent_transactions, otel_summary, otel_filtered_transactions
+from dashboard.services.splunk import splunk_collector_summary, otel_overview_summaries, otel_endpoint_summary, otel_transaction_list, otel_summary, otel_filtered_transactions
 from dashboard.services.tempo import tempo_services, tempo_recent_traces, tempo_trace_detail
 from dashboard.services.prometheus_svc import prom_instant_query, prom_range_query
 from dashboard.services.weather import collect_weather_summary
@@ -18,6 +20,8 @@ from dashboard.services.aws_billing import collect_aws_billing_summary
 from dashboard.services.backup_status import collect_backup_status_summary
 from dashboard.services.status_overview import collect_status_overview
 from dashboard.services.chatbot import answer_question
+from dashboard.services.cache import oldest
+from dashboard.services import http
 from claude_usage.services import collect_claude_dashboard_summary
 from monitoring.services import collect_host_status
 from config.utils import get_config
@@ -40,82 +44,89 @@ def home(request):
 
 
 @login_required
-def card_k8s(request):
+async def card_k8s(request):
     with _tracer.start_as_current_span("card.k8s"):
-        pods_status, nodes, total_pods, cluster_cpu, cluster_mem = collect_k8s_metrics_summary()
+        cached = await collect_cluster_snapshot.awith_age()
+        pods_status, nodes, total_pods, cluster_cpu, cluster_mem = summary_of(cached.value)
     return render(request, "dashboard/partials/_card_k8s.html", {
         "pods": pods_status, "nodes": nodes, "total_pods": total_pods,
         "cluster_cpu_percent": cluster_cpu, "cluster_mem_percent": cluster_mem,
+        "cache_info": cached,
     })
 
 
 @login_required
-def card_synology(request):
+async def card_synology(request):
     with _tracer.start_as_current_span("card.synology"):
-        synology_metrics = collect_synology_summary()
+        cached = await collect_synology_summary.awith_age()
     return render(request, "dashboard/partials/_card_synology.html", {
-        "synology_metrics": synology_metrics,
+        "synology_metrics": cached.value, "cache_info": cached,
     })
 
 
 @login_required
 def card_claude(request):
     with _tracer.start_as_current_span("card.claude"):
-        claude_summary = collect_claude_dashboard_summary()
+        claude_summary = collect_claude_dashboard_summary(request)
     return render(request, "dashboard/partials/_card_claude.html", {
         "claude_summary": claude_summary,
     })
 
 
 @login_required
-def card_network(request):
+async def card_network(request):
     with _tracer.start_as_current_span("card.network"):
-        network_metrics = collect_network_summary() or {
+        cached, host_status = await asyncio.gather(
+            collect_network_summary.awith_age(), sync_to_async(collect_host_status)(),
+        )
+        network_metrics = cached.value or {
             'tcp_latency': 0, 'internet_ping': 0,
             'internet_download': 0, 'internet_upload': 0, 'online': False,
         }
-        host_status = collect_host_status()
     return render(request, "dashboard/partials/_card_network.html", {
         "network_metrics": network_metrics, "host_status": host_status,
+        "cache_info": cached,
     })
 
 
 @login_required
-def card_emporia_chart(request):
+async def card_emporia_chart(request):
     with _tracer.start_as_current_span("card.emporia_chart"):
-        emporia_metrics = collect_emporia_summary()
-        enhase_summary = collect_enhase_summary()
+        emporia_cached, enphase_cached = await asyncio.gather(
+            collect_emporia_summary.awith_age(), collect_enhase_summary.awith_age(),
+        )
     return render(request, "dashboard/partials/_card_emporia_chart.html", {
-        "emporia_metrics": json.dumps(emporia_metrics, cls=DjangoJSONEncoder),
-        "enphase_metrics": enhase_summary,
+        "emporia_metrics": json.dumps(emporia_cached.value, cls=DjangoJSONEncoder),
+        "enphase_metrics": enphase_cached.value,
+        "cache_info": oldest(emporia_cached, enphase_cached),
     })
 
 
 @login_required
-def card_emporia_daily(request):
+async def card_emporia_daily(request):
     with _tracer.start_as_current_span("card.emporia_daily"):
         selected_day = request.GET.get('day', datetime.now().strftime('%Y-%m-%d'))
-        emporia_daily_summary = collect_emporia_daily_summary(selected_day)
+        cached = await collect_emporia_daily_summary.awith_age(selected_day)
     return render(request, "dashboard/partials/_card_emporia_daily.html", {
-        "emporia_daily_summary": emporia_daily_summary,
+        "emporia_daily_summary": cached.value, "cache_info": cached,
     })
 
 
 @login_required
-def card_splunk(request):
+async def card_splunk(request):
     with _tracer.start_as_current_span("card.splunk"):
-        splunk_summary = splunk_collector_summary()
+        cached = await splunk_collector_summary.awith_age()
     return render(request, "dashboard/partials/_card_splunk.html", {
-        "splunk_summary": splunk_summary,
+        "splunk_summary": cached.value, "cache_info": cached,
     })
 
 
 @login_required
-def card_weather(request):
+async def card_weather(request):
     with _tracer.start_as_current_span("card.weather"):
-        weather_summary = collect_weather_summary()
+        cached = await collect_weather_summary.awith_age()
     return render(request, "dashboard/partials/_card_weather.html", {
-        "weather_summary": weather_summary,
+        "weather_summary": cached.value, "cache_info": cached,
     })
 
 
@@ -129,11 +140,11 @@ def card_aws_billing(request):
 
 
 @login_required
-def card_status(request):
+async def card_status(request):
     with _tracer.start_as_current_span("card.status"):
-        status = collect_status_overview()
+        cached = await collect_status_overview.awith_age()
     return render(request, "dashboard/partials/_card_status.html", {
-        "status": status,
+        "status": cached.value, "cache_info": cached,
     })
 
 
@@ -206,7 +217,13 @@ def k8s(request):
         "pod_count": len(data.get("pods", [])) if data else 0,
         "node_count": len(data.get("nodes", [])) if data else 0,
     }
-    return render(request, "dashboard/k8s.html", data)
+    history = collect_k8s_usage_history()
+    return render(request, "dashboard/k8s.html", {
+        **data,
+        "usage_trend": json.dumps(history["trend"], cls=DjangoJSONEncoder),
+        "usage_forecast": history["forecast"],
+        "namespace_usage": history["namespaces"],
+    })
 
 @login_required
 def energy(request):
@@ -218,11 +235,10 @@ def energy(request):
     # Get day parameter for daily summary, default to current date
     selected_day = request.GET.get('day', current_date.strftime('%Y-%m-%d'))
 
-    # Collect monthly metrics
-    emporia_monthly_metrics = collect_emporia_monthly_summary(selected_year, selected_month)
-
-    # Collect monthly category summary
-    emporia_monthly_category_summary = collect_emporia_monthly_category_summary(selected_year, selected_month)
+    # Collect monthly metrics and category summary (one upstream load for both)
+    emporia_month = collect_emporia_month(selected_year, selected_month)
+    emporia_monthly_metrics = emporia_month["daily"]
+    emporia_monthly_category_summary = emporia_month["categories"]
 
     # Collect daily summary
     emporia_daily_summary = collect_emporia_daily_summary(selected_day)
@@ -288,15 +304,15 @@ def networking(request):
 def todo_tasks(request):
     try:
         if request.method == 'GET':
-            resp = http_requests.get(
-                f'{_TODO_BASE}/lists/{_TODO_LIST_ID}/tasks/',
-                headers=_todo_headers(), timeout=5,
+            resp = http.get(
+                "todo", f'{_TODO_BASE}/lists/{_TODO_LIST_ID}/tasks/',
+                headers=_todo_headers(),
             )
             return JsonResponse(resp.json(), safe=False, status=resp.status_code)
         data = json.loads(request.body)
-        resp = http_requests.post(
-            f'{_TODO_BASE}/lists/{_TODO_LIST_ID}/tasks/',
-            headers=_todo_headers(), json=data, timeout=5,
+        resp = http.post(
+            "todo", f'{_TODO_BASE}/lists/{_TODO_LIST_ID}/tasks/',
+            headers=_todo_headers(), json=data,
         )
         return JsonResponse(resp.json(), status=resp.status_code)
     except Exception as exc:
@@ -307,9 +323,9 @@ def todo_tasks(request):
 @require_http_methods(["POST"])
 def todo_task_complete(request, task_id):
     try:
-        resp = http_requests.post(
-            f'{_TODO_BASE}/tasks/{task_id}/complete/',
-            headers=_todo_headers(), timeout=5,
+        resp = http.post(
+            "todo", f'{_TODO_BASE}/tasks/{task_id}/complete/',
+            headers=_todo_headers(),
         )
         return JsonResponse(resp.json(), status=resp.status_code)
     except Exception as exc:
@@ -327,7 +343,7 @@ _OTEL_TIME_RANGES = [
 @login_required
 def otel_overview(request):
     earliest = request.GET.get("earliest", "-1h")
-    result = otel_service_status_summary(earliest)
+    result, endpoints = otel_overview_summaries(earliest)
     # Pre-process rows into lists for template (avoids custom template filter for dict key lookup)
     status_columns = result.get("status_columns", [])
     if result.get("success"):
@@ -346,6 +362,8 @@ def otel_overview(request):
     }
     return render(request, "dashboard/otel.html", {
         "result": result,
+        # Level 2 drilldowns filter these rows instead of querying per service
+        "endpoint_rows": endpoints["data"] if endpoints["success"] else None,
         "earliest": earliest,
         "time_ranges": _OTEL_TIME_RANGES,
     })
@@ -1,16 +1,27 @@
 import json
 
 from django import forms
-from config.utils import get_config
+from config.utils import Setting
 from .models import PortfolioAccount, PortfolioSnapshot, ElectricityUsage, NetWorth, ForecastSettings, HeatingRecord, HEATING_MONTH_CHOICES
 
-SS_BENEFITS_62 = get_config("SS_BENEFITS_62",0)
-SS_BENEFITS_65 = get_config("SS_BENEFITS_65",0)
-SS_BENEFITS_67 = get_config("SS_BENEFITS_67",0)
-SS_BENEFITS_70 = get_config("SS_BENEFITS_70",0)
-RETIREMENT_AGE = get_config("RETIREMENT_AGE",65)
-PORTFOLIO_BALANCE = get_config("PORTFOLIO_BALANCE",1000000)
-SS_AGE = get_config("SS_AGE", 67)
+SS_BENEFITS_62 = Setting("SS_BENEFITS_62",0)
+SS_BENEFITS_65 = Setting("SS_BENEFITS_65",0)
+SS_BENEFITS_67 = Setting("SS_BENEFITS_67",0)
+SS_BENEFITS_70 = Setting("SS_BENEFITS_70",0)
+RETIREMENT_AGE = Setting("RETIREMENT_AGE",65)
+PORTFOLIO_BALANCE = Setting("PORTFOLIO_BALANCE",1000000)
+SS_AGE = Setting("SS_AGE", 67)
+
+
+def _ss_presets():
+    # Callable choices, so the configured benefits are read per form, not at import
+    return [
+        ("", "Custom"),
+        ("62", f"Age 62 - ${SS_BENEFITS_62.get()}"),
+        ("65", f"Age 65 - ${SS_BENEFITS_65.get()}"),
+        ("67", f"Age 67 - ${SS_BENEFITS_67.get()}"),
+        ("70", f"Age 70 - ${SS_BENEFITS_70.get()}"),
+    ]
 
 class RetirementForm(forms.Form):
     MODE_CHOICES = [
@@ -18,14 +29,6 @@ class RetirementForm(forms.Form):
         ("fixed", "Fixed Withdrawal → Evaluate Success"),
     ]
 
-    SS_PRESETS = [
-        ("", "Custom"),
-        ("62", f"Age 62 - ${SS_BENEFITS_62}"),
-        ("65", f"Age 65 - ${SS_BENEFITS_65}"),
-        ("67", f"Age 67 - ${SS_BENEFITS_67}"),
-        ("70", f"Age 70 - ${SS_BENEFITS_70}"),
-    ]
-
     mode = forms.ChoiceField(
         choices=MODE_CHOICES,
         initial="target",
@@ -35,7 +38,7 @@ class RetirementForm(forms.Form):
 
     current_age = forms.FloatField(
         label="Retirement Age",
-        initial=RETIREMENT_AGE,
+        initial=RETIREMENT_AGE.get,
         help_text="Enter your current age (decimals allowed, e.g., 66.5)."
     )
     end_age = forms.FloatField(
@@ -45,7 +48,7 @@ class RetirementForm(forms.Form):
     )
     balance = forms.FloatField(
         label="Portfolio Balance ($)",
-        initial=PORTFOLIO_BALANCE,
+        initial=PORTFOLIO_BALANCE.get,
         help_text="Your total investable assets at retirement."
     )
     annual_return = forms.FloatField(
@@ -85,7 +88,7 @@ class RetirementForm(forms.Form):
     )
 
     ss_preset = forms.ChoiceField(
-        choices=SS_PRESETS,
+        choices=_ss_presets,
         required=False,
         label="Social Security Preset",
         help_text="Choose a preset or leave blank for custom"
@@ -93,7 +96,7 @@ class RetirementForm(forms.Form):
 
     ss_age = forms.FloatField(
         label="Social Security Age",
-        initial=SS_AGE,
+        initial=SS_AGE.get,
         help_text="Age you plan to start receiving Social Security."
     )
 
@@ -8,12 +8,7 @@ from .forms import RetirementForm, PortfolioAccountForm, PortfolioSnapshotForm,
 from .models import PortfolioAccount, PortfolioSnapshot, ElectricityUsage, NetWorth, ForecastSettings, HeatingRecord, HEATING_SEASON_MONTH_ORDER
 from .calculator import monte_carlo_simulation, find_max_withdrawal
 from .tax import compute_annual_tax, get_marginal_rate, get_rmd_factor, get_aca_monthly_premium, RMD_START_AGE
-from config.utils import get_config
-
-SS_BENEFITS_62 = get_config("SS_BENEFITS_62",0)
-SS_BENEFITS_65 = get_config("SS_BENEFITS_65",0)
-SS_BENEFITS_67 = get_config("SS_BENEFITS_67",0)
-SS_BENEFITS_70 = get_config("SS_BENEFITS_70",0)
+from .forms import SS_BENEFITS_62, SS_BENEFITS_65, SS_BENEFITS_67, SS_BENEFITS_70
 
 def retirement(request):
     result = None
@@ -78,10 +73,10 @@ def retirement(request):
 
 
     presets = {
-        "ss_benefits_62": SS_BENEFITS_62,
-        "ss_benefits_65": SS_BENEFITS_65,
-        "ss_benefits_67": SS_BENEFITS_67,
-        "ss_benefits_70": SS_BENEFITS_70,
+        "ss_benefits_62": SS_BENEFITS_62.get(),
+        "ss_benefits_65": SS_BENEFITS_65.get(),
+        "ss_benefits_67": SS_BENEFITS_67.get(),
+        "ss_benefits_70": SS_BENEFITS_70.get(),
     }
     request.otel_page_summary = {
         "page": "retirement",
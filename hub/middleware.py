@@ -3,31 +3,76 @@ import uuid
 import logging
 from django.conf import settings
 from django.shortcuts import redirect
-from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware
 from hub.otel import _SKIP_PREFIXES
 
 _mw_logger = logging.getLogger(__name__)
 
 
 class LoginRequiredMiddleware:
+    async_capable = True
+    sync_capable = True
+
+    exempt_urls = [
+        settings.LOGIN_URL,
+        "/accounts/signup/",
+        "/accounts/logout/",
+        "/admin/",
+        "/accounts/google/login/",
+        "/accounts/google/login/callback/",
+    ]
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        exempt_urls = [
-            settings.LOGIN_URL,
-            "/accounts/signup/",
-            "/accounts/logout/",
-            "/admin/",
-            "/accounts/google/login/",
-            "/accounts/google/login/callback/",
-        ]
-
-        if not request.user.is_authenticated and not any(request.path.startswith(url) for url in exempt_urls):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not request.user.is_authenticated and not self._exempt(request.path):
             return redirect(settings.LOGIN_URL)
-
         return self.get_response(request)
 
+    def _exempt(self, path):
+        return any(path.startswith(url) for url in self.exempt_urls)
+
+    async def __acall__(self, request):
+        user = await request.auser()
+        if not user.is_authenticated and not self._exempt(request.path):
+            return redirect(settings.LOGIN_URL)
+        return await self.get_response(request)
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise's middleware is sync-only, which under ASGI would push every
+    request through a thread. The static-file lookup is an in-memory dict hit,
+    so do it on the event loop and only hand actual file serving to a thread.
+    """
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve, thread_sensitive=False)(static_file, request)
+        return await self.get_response(request)
+
 
 class PageLoggingMiddleware:
     async_capable = True
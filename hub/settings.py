@@ -1,3 +1,4 @@
+import logging
 import os
 from decouple import config
 from pathlib import Path
@@ -50,7 +51,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'hub.middleware.AsyncWhiteNoiseMiddleware',
     'hub.middleware.PageLoggingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -81,6 +82,8 @@ TEMPLATES = [
 ]
 
 
+# Production serves hub.asgi:application under uvicorn (see Dockerfile). The WSGI
+# entry point stays for `manage.py runserver`, which local development uses.
 WSGI_APPLICATION = 'hub.wsgi.application'
 
 
@@ -99,6 +102,20 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/#database-caching
+# Kept in Postgres so every uvicorn worker, pod and the run_collectors daemon
+# share collector results and Splunk query results. The table is created by
+# dashboard migration 0007 (or `manage.py createcachetable`).
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "hub_cache",
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -172,6 +189,10 @@ if _aws_bucket:
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Dashboard service logs: console output and OTel span events (see dashboard/services/log.py)
+DASHBOARD_LOG_LEVEL = (os.getenv("DASHBOARD_LOG_LEVEL") or "INFO").upper()
+DASHBOARD_SPAN_LOG_LEVEL = (os.getenv("DASHBOARD_SPAN_LOG_LEVEL") or "INFO").upper()
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -179,6 +200,9 @@ LOGGING = {
         "json": {
             "format": "%(message)s",
         },
+        "services": {
+            "format": "%(levelname)s %(name)s: %(message)s",
+        },
     },
     "handlers": {
         "console_json": {
@@ -186,6 +210,23 @@ LOGGING = {
             "formatter": "json",
             "stream": "ext://sys.stdout",
         },
+        "console_services": {
+            "class": "logging.StreamHandler",
+            "formatter": "services",
+            "stream": "ext://sys.stdout",
+            "level": DASHBOARD_LOG_LEVEL,
+        },
+        "span_events": {
+            "class": "dashboard.services.log.SpanEventHandler",
+            "level": DASHBOARD_SPAN_LOG_LEVEL,
+        },
+    },
+    "filters": {
+        # Network history paging logs once per page
+        "sample_paging": {
+            "()": "dashboard.services.log.SampleFilter",
+            "rate": 0.1,
+        },
     },
     "loggers": {
         "page": {
@@ -193,6 +234,15 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        # As low as the lower handler, so debug calls are free unless one wants them
+        "dashboard.services": {
+            "handlers": ["console_services", "span_events"],
+            "level": min(logging.getLevelName(DASHBOARD_LOG_LEVEL), logging.getLevelName(DASHBOARD_SPAN_LOG_LEVEL)),
+            "propagate": False,
+        },
+        "dashboard.services.network": {
+            "filters": ["sample_paging"],
+        },
     },
 }
 